@@ -3,6 +3,7 @@ import argparse
 import atexit
 import ctypes
 import msvcrt
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -89,8 +90,11 @@ def run_classic_ui():
     import tkinter as tk
     from tkinter import ttk
 
+    from services.metadata_store import flush_metadata_store
     from ui.main_view import MainView
 
+    atexit.register(flush_metadata_store)
+
     def init_style(root):
         root.configure(bg="#f6f7fb")
         style = ttk.Style()
@@ -226,4 +230,5 @@ def main(argv=None):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main(sys.argv[1:])
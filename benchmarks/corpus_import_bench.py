@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services import corpus_index_store
+from services import corpus_search
+
+
+_WORDS = (
+    "the student visit library museum research lecture campus accommodation tutor deadline "
+    "assignment survey result environment energy transport city council budget project"
+).split()
+
+
+def _token_offsets(lemmas):
+    offsets = []
+    start = 0
+    for lemma in lemmas:
+        offsets.append((start, start + len(lemma)))
+        start += len(lemma) + 1
+    return offsets
+
+
+def _build_chunks(chunk_count, sentences_per_chunk, words_per_sentence):
+    rng = random.Random(7)
+    chunks = []
+    for chunk_index in range(chunk_count):
+        sentences = []
+        for _ in range(sentences_per_chunk):
+            lemmas = [rng.choice(_WORDS) for _ in range(words_per_sentence)]
+            sentences.append((" ".join(lemmas).capitalize() + ".", lemmas, _token_offsets(lemmas)))
+        chunks.append(
+            {
+                "text": " ".join(text for text, _lemmas, _offsets in sentences),
+                "page_num": chunk_index // 20 + 1,
+                "test_label": "TEST 1",
+                "section_label": "SECTION 1",
+                "part_label": "",
+                "speaker_label": "",
+                "question_label": "",
+                "sentences": sentences,
+            }
+        )
+    return chunks
+
+
+def _legacy_write(conn, document_id, path, chunks):
+    sort_key = 0
+    for chunk in chunks:
+        cur_chunk = conn.execute(
+            """
+            INSERT INTO chunks(
+                document_id, chunk_text, page_num, test_label, section_label,
+                part_label, speaker_label, question_label, sort_key
+            ) VALUES(?,?,?,?,?,?,?,?,?)
+            """,
+            (document_id, chunk["text"], chunk["page_num"], "", "", "", "", "", sort_key),
+        )
+        chunk_id = int(cur_chunk.lastrowid)
+        for sentence_order, (sentence, lemmas, _offsets) in enumerate(chunk["sentences"]):
+            cur = conn.execute(
+                """
+                INSERT INTO sentences(
+                    document_id, chunk_id, sentence_text, lemma_text, source_file, page_num,
+                    test_label, section_label, part_label, speaker_label, question_label,
+                    sentence_order, sort_key
+                ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
+                """,
+                (
+                    document_id,
+                    chunk_id,
+                    sentence,
+                    " ".join(lemmas),
+                    os.path.basename(path),
+                    chunk["page_num"],
+                    "",
+                    "",
+                    "",
+                    "",
+                    "",
+                    sentence_order,
+                    sort_key,
+                ),
+            )
+            sentence_id = int(cur.lastrowid)
+            for lemma in sorted(set(lemmas)):
+                conn.execute("INSERT OR IGNORE INTO lemmas(text) VALUES(?)", (lemma,))
+                lemma_id = conn.execute("SELECT id FROM lemmas WHERE text = ?", (lemma,)).fetchone()["id"]
+                conn.execute(
+                    "INSERT OR IGNORE INTO sentence_lemmas(lemma_id, sentence_id) VALUES(?, ?)",
+                    (lemma_id, sentence_id),
+                )
+                conn.execute("UPDATE lemmas SET df = df + 1 WHERE id = ?", (lemma_id,))
+            sort_key += 1
+
+
+def _count_rows(chunks):
+    rows = 0
+    for chunk in chunks:
+        rows += 1
+        for _sentence, lemmas, _offsets in chunk["sentences"]:
+            rows += 1 + len(set(lemmas))
+    return rows
+
+
+def _run(label, db_path, documents, chunks, writer, pragmas):
+    corpus_index_store.DB_PATH = Path(db_path)
+    corpus_index_store.ensure_schema()
+    conn = corpus_index_store.get_connection()
+    if pragmas:
+        corpus_index_store.apply_import_pragmas(conn)
+    started = time.perf_counter()
+    try:
+        for index in range(documents):
+            path = f"/bench/document_{index}.txt"
+            document_id = corpus_index_store.replace_document(
+                conn,
+                path=path,
+                name=os.path.basename(path),
+                file_type="txt",
+                file_hash="",
+            )
+            writer(conn, document_id, path, chunks)
+            if pragmas:
+                conn.commit()
+        conn.commit()
+    finally:
+        conn.close()
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    rows = _count_rows(chunks) * documents
+    print(f"{label:>8}: {rows} rows in {elapsed:.3f}s ({rows / elapsed:,.0f} rows/s)")
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corpus import write throughput benchmark.")
+    parser.add_argument("--documents", type=int, default=5)
+    parser.add_argument("--chunks", type=int, default=400)
+    parser.add_argument("--sentences", type=int, default=4)
+    parser.add_argument("--words", type=int, default=14)
+    args = parser.parse_args()
+
+    chunks = _build_chunks(args.chunks, args.sentences, args.words)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        before = _run("before", os.path.join(tmp_dir, "legacy.db"), args.documents, chunks, _legacy_write, False)
+        after = _run(
+            "after",
+            os.path.join(tmp_dir, "batched.db"),
+            args.documents,
+            chunks,
+            corpus_search._write_document_rows,
+            True,
+        )
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
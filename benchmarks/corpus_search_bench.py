@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services import corpus_index_store
+from services import corpus_search
+
+
+_COMMON = (
+    "the a be have do say go get make know think take see come want look use find give tell "
+    "work call try ask need feel become leave put mean keep let begin seem help talk turn start"
+).split()
+_RARE = (
+    "accommodation questionnaire laboratory curriculum archaeology biodiversity itinerary "
+    "refurbishment sustainability photosynthesis volunteer enrolment orientation"
+).split()
+_QUERIES = (
+    ("common", ["make", "work"], "make work"),
+    ("rare", ["laboratory"], "laboratory"),
+    ("mixed", ["help", "volunteer"], "help volunteer"),
+    ("phrase", ["take", "look"], '"take look"'),
+    ("prefix", ["accommodation"], "accomm*"),
+)
+
+
+def _token_offsets(lemmas):
+    offsets = []
+    start = 0
+    for lemma in lemmas:
+        offsets.append((start, start + len(lemma)))
+        start += len(lemma) + 1
+    return offsets
+
+
+def _build_corpus(sentence_count, words_per_sentence, documents):
+    rng = random.Random(11)
+    per_document = max(1, sentence_count // documents)
+    corpus_index_store.ensure_schema()
+    conn = corpus_index_store.get_connection()
+    corpus_index_store.apply_import_pragmas(conn)
+    try:
+        for index in range(documents):
+            chunks = []
+            for chunk_index in range(0, per_document, 8):
+                sentences = []
+                for _ in range(min(8, per_document - chunk_index)):
+                    lemmas = [rng.choice(_COMMON) for _ in range(words_per_sentence)]
+                    if rng.random() < 0.02:
+                        lemmas[rng.randrange(len(lemmas))] = rng.choice(_RARE)
+                    sentences.append((" ".join(lemmas).capitalize() + ".", lemmas, _token_offsets(lemmas)))
+                chunks.append(
+                    {
+                        "text": " ".join(text for text, _lemmas, _offsets in sentences),
+                        "page_num": chunk_index // 40 + 1,
+                        "test_label": "",
+                        "section_label": "",
+                        "part_label": "",
+                        "speaker_label": "",
+                        "question_label": "",
+                        "sentences": sentences,
+                    }
+                )
+            path = f"/bench/document_{index}.txt"
+            document_id = corpus_index_store.replace_document(
+                conn,
+                path=path,
+                name=os.path.basename(path),
+                file_type="txt",
+                file_hash="",
+            )
+            corpus_search._write_document_rows(conn, document_id, path, chunks)
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def _time_query(fn, repeat):
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(fn()["rows"])
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Join-based lemma search vs FTS5 search benchmark.")
+    parser.add_argument("--sentences", type=int, default=1_000_000)
+    parser.add_argument("--words", type=int, default=12)
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_index_store.DB_PATH = Path(tmp_dir) / "search_bench.db"
+        started = time.perf_counter()
+        _build_corpus(args.sentences, args.words, args.documents)
+        print(f"built {args.sentences} sentences in {time.perf_counter() - started:.1f}s")
+        if not corpus_index_store.fts_available():
+            print("FTS5 is not available in this SQLite build.")
+            return
+        for label, lemmas, query in _QUERIES:
+            phrase, _highlight_query, _lemma_query, prefixes = corpus_search._parse_search_query(query)
+            join_ms, join_rows = _time_query(
+                lambda: corpus_index_store.search_sentence_rows(
+                    [] if prefixes else lemmas,
+                    limit=args.limit,
+                    prefixes=prefixes,
+                ),
+                args.repeat,
+            )
+            match = corpus_search._build_fts_match([] if prefixes else lemmas, prefixes, phrase)
+            fts_ms, fts_rows = _time_query(
+                lambda: corpus_index_store.search_sentence_fts_rows(match, limit=args.limit),
+                args.repeat,
+            )
+            print(
+                f"{label:>7}: join {join_ms:8.1f} ms ({join_rows} rows) | "
+                f"fts {fts_ms:8.1f} ms ({fts_rows} rows)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services import tts
+from services.voice_catalog import kokoro_ready
+
+
+SAMPLE_WORDS_PATH = Path(__file__).resolve().parent.parent / "sample_words.txt"
+
+
+def _load_words(limit):
+    words = []
+    seen = set()
+    with open(SAMPLE_WORDS_PATH, "r", encoding="utf-8") as fp:
+        for line in fp:
+            word = line.strip()
+            if not word or word.casefold() in seen:
+                continue
+            seen.add(word.casefold())
+            words.append(word)
+            if len(words) >= limit:
+                break
+    return words
+
+
+def _remove_all(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except Exception:
+            pass
+
+
+def _time_single(words, voice_id, lang):
+    paths = []
+    started = time.perf_counter()
+    for word in words:
+        wav_path, _label, _can_cache = tts._synthesize_with_kokoro_voice(
+            word,
+            volume=1.0,
+            rate_ratio=1.0,
+            voice_id=voice_id,
+            lang=lang,
+        )
+        paths.append(wav_path)
+    elapsed = time.perf_counter() - started
+    _remove_all(paths)
+    return elapsed
+
+
+def _time_batch(words, voice_id, lang):
+    started = time.perf_counter()
+    results = tts._synthesize_kokoro_batch(words, volume=1.0, rate_ratio=1.0, voice_id=voice_id, lang=lang)
+    elapsed = time.perf_counter() - started
+    _remove_all(wav_path for wav_path, _error in results if wav_path)
+    failures = sum(1 for _wav_path, error in results if error is not None)
+    return elapsed, failures
+
+
+def _check_phoneme_parity(words, lang):
+    kokoro = tts._ensure_kokoro()
+    spoken = [tts._normalize_tts_spoken_text(word) for word in words]
+    batched = tts._kokoro_phonemize_batch(kokoro, spoken, lang)
+    mismatches = [
+        (word, batch_phonemes, kokoro.tokenizer.phonemize(text, lang))
+        for word, text, batch_phonemes in zip(words, spoken, batched)
+        if batch_phonemes != kokoro.tokenizer.phonemize(text, lang)
+    ]
+    for word, batch_phonemes, single_phonemes in mismatches[:10]:
+        print(f"phoneme mismatch for {word!r}: batch={batch_phonemes!r} single={single_phonemes!r}")
+    return len(mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-item vs batched Kokoro synthesis benchmark.")
+    parser.add_argument("--words", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=tts.KOKORO_BATCH_SIZE)
+    parser.add_argument("--voice", default="bf_emma")
+    parser.add_argument("--lang", default="en-gb")
+    args = parser.parse_args()
+
+    if not kokoro_ready():
+        print("Kokoro model files are missing.")
+        return
+    words = _load_words(args.words)
+    tts.KOKORO_BATCH_SIZE = max(1, args.batch_size)
+    started = time.perf_counter()
+    tts._ensure_kokoro()
+    warmup = tts._synthesize_kokoro_batch(words[:2], volume=1.0, rate_ratio=1.0, voice_id=args.voice, lang=args.lang)
+    _remove_all(wav_path for wav_path, _error in warmup if wav_path)
+    print(f"loaded Kokoro and warmed up in {time.perf_counter() - started:.1f}s")
+
+    mismatches = _check_phoneme_parity(words, args.lang)
+    print(f"phonemes: {len(words) - mismatches}/{len(words)} batched match single-item")
+    if mismatches:
+        return
+
+    single_s = _time_single(words, args.voice, args.lang)
+    batch_s, failures = _time_batch(words, args.voice, args.lang)
+    print(f"single: {len(words) / single_s:7.1f} words/s ({single_s:.2f}s for {len(words)} words)")
+    print(
+        f" batch: {len(words) / batch_s:7.1f} words/s ({batch_s:.2f}s, batch size {tts.KOKORO_BATCH_SIZE}, "
+        f"{failures} failed)"
+    )
+
+
+if __name__ == "__main__":
+    main()
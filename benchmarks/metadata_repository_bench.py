@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services import phonetics, translation
+from services.metadata_repository import SqliteMetadataRepository
+from services.metadata_store import MetadataStore
+
+
+class JsonMetadataRepository:
+    def __init__(self, path, *, key_normalizer, value_normalizer):
+        self.path = Path(path)
+        self._key_normalizer = key_normalizer
+        self._value_normalizer = value_normalizer
+        self._lock = threading.RLock()
+        self._cache_data = None
+
+    def _load_locked(self):
+        if self._cache_data is not None:
+            return self._cache_data
+        if not self.path.exists():
+            self._cache_data = {}
+            return self._cache_data
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._cache_data = data if isinstance(data, dict) else {}
+        except Exception:
+            self._cache_data = {}
+        self._cleanup_locked()
+        return self._cache_data
+
+    def _cleanup_locked(self):
+        changed = False
+        cleaned = {}
+        for key, value in list((self._cache_data or {}).items()):
+            clean_key = self._key_normalizer(key)
+            clean_value = self._value_normalizer(value)
+            if not clean_key or not clean_value:
+                changed = True
+                continue
+            if cleaned.get(clean_key) == clean_value:
+                changed = True
+                continue
+            cleaned[clean_key] = clean_value
+            if key != clean_key or str(value or "") != clean_value:
+                changed = True
+        self._cache_data = cleaned
+        if changed:
+            self._save_locked()
+        return changed
+
+    def _save_locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._cache_data or {}, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def normalize_pairs(self, pairs):
+        normalized = {}
+        for word, value in dict(pairs or {}).items():
+            key = self._key_normalizer(word)
+            text = self._value_normalizer(value)
+            if key and text:
+                normalized[key] = text
+        return normalized
+
+    def cleanup(self):
+        with self._lock:
+            if self._cache_data is None:
+                self._load_locked()
+            else:
+                self._cleanup_locked()
+            return dict(self._cache_data)
+
+    def get_many(self, words):
+        result = {}
+        with self._lock:
+            cache = self._load_locked()
+            for word in words or []:
+                key = self._key_normalizer(word)
+                if key:
+                    value = cache.get(key)
+                    if value:
+                        result[word] = value
+        return result
+
+    def apply_many(self, pairs):
+        normalized = self.normalize_pairs(pairs)
+        if not normalized:
+            return 0
+        changed = False
+        with self._lock:
+            cache = self._load_locked()
+            for key, value in normalized.items():
+                if cache.get(key) == value:
+                    continue
+                cache[key] = value
+                changed = True
+            if changed:
+                self._save_locked()
+        return len(normalized)
+
+    def set_one(self, word, value):
+        key = self._key_normalizer(word)
+        if not key:
+            return False
+        text = self._value_normalizer(value)
+        changed = False
+        with self._lock:
+            cache = self._load_locked()
+            if text:
+                if cache.get(key) != text:
+                    cache[key] = text
+                    changed = True
+            elif key in cache:
+                cache.pop(key, None)
+                changed = True
+            if changed:
+                self._save_locked()
+        return True
+
+    def export_payload(self):
+        with self._lock:
+            return dict(self._load_locked())
+
+
+class _CleanupPerLookupRepository(JsonMetadataRepository):
+    def get_many(self, words):
+        result = {}
+        with self._lock:
+            cache = self.cleanup()
+            for word in words or []:
+                key = self._key_normalizer(word)
+                if key and key in cache:
+                    result[word] = self._value_normalizer(cache.get(key) or "")
+        return result
+
+
+def _write_cache(path, entry_count, value_for):
+    rng = random.Random(7)
+    payload = {}
+    for index in range(entry_count):
+        word = f"word{index}"
+        payload[word if rng.random() < 0.9 else f"  {word.upper()} "] = value_for(index)
+    Path(path).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _json_repository(repository_class):
+    def _build(tmp_dir, kind, path, **normalizers):
+        return repository_class(path, **normalizers)
+
+    return _build
+
+
+def _sqlite_repository(tmp_dir, kind, path, **normalizers):
+    store = MetadataStore(Path(tmp_dir) / "metadata.db")
+    return SqliteMetadataRepository(kind, legacy_path=path, store=store, **normalizers)
+
+
+def _build_repositories(tmp_dir, entry_count, build_repository):
+    specs = (
+        ("translation", "translation_cache.json", translation._normalize_cache_key, translation._normalize_translation_text, lambda i: f"释义{i}"),
+        ("pos", "pos_cache.json", translation._normalize_cache_key, lambda value: str(value or "").strip(), lambda i: "n."),
+        ("phonetics", "phonetic_cache.json", phonetics._normalize_key, phonetics._normalize_phonetic, lambda i: f"[wɜːd{i}]"),
+    )
+    repositories = []
+    for kind, name, key_normalizer, value_normalizer, value_for in specs:
+        path = Path(tmp_dir) / name
+        if not path.exists():
+            _write_cache(path, entry_count, value_for)
+        repositories.append(
+            build_repository(tmp_dir, kind, path, key_normalizer=key_normalizer, value_normalizer=value_normalizer)
+        )
+    return repositories
+
+
+def _time_first_lookup(repositories, words):
+    started = time.perf_counter()
+    for repository in repositories:
+        repository.get_many(words[:1])
+    return (time.perf_counter() - started) * 1000
+
+
+def _time_renders(repositories, words, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for repository in repositories:
+            repository.get_many(words)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metadata lookup latency for one word-list render.")
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    words = [f"word{index}" for index in random.Random(3).sample(range(args.entries), args.words)]
+    for label, build_repository in (
+        ("cleanup per lookup", _json_repository(_CleanupPerLookupRepository)),
+        ("normalized on write", _json_repository(JsonMetadataRepository)),
+        ("sqlite store", _sqlite_repository),
+    ):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repositories = _build_repositories(tmp_dir, args.entries, build_repository)
+            load_ms = _time_first_lookup(repositories, words)
+            render_ms = _time_renders(repositories, words, args.repeat)
+            repositories = _build_repositories(tmp_dir, args.entries, build_repository)
+            restart_ms = _time_first_lookup(repositories, words)
+        print(
+            f"{label:>20}: first load {load_ms:8.1f} ms | restart {restart_ms:8.1f} ms | "
+            f"render {render_ms:8.2f} ms ({args.words} words x 3 caches)"
+        )
+
+
+if __name__ == "__main__":
+    main()
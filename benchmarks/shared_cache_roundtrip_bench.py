@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import argparse
+import hashlib
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.tts_audio import compressed_audio_supported, decode_audio_to_wav, encode_wav_to_compressed
+from services.tts_persistence import AudioBlobStore
+from services.tts_shared_cache import export_shared_audio_cache_package, import_shared_audio_cache_package
+
+
+MANIFEST_NAME = "manifest.json"
+METADATA_NAME = "metadata.json"
+
+
+def _sha1_file(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def _safe_rel_path(path):
+    value = os.path.normpath(str(path or "").replace("\\", "/").strip().lstrip("/")).replace("\\", "/")
+    return "" if value in {"", "."} or value.startswith("..") else value
+
+
+def _zip_entry_path(*parts):
+    return "/".join(str(part).strip("/\\") for part in parts if str(part or "").strip("/\\"))
+
+
+def _write_tone(path, index, sample_rate=24000):
+    frames = b"".join(
+        struct.pack("<h", int(8000 * math.sin(i * (0.02 + index * 0.001))))
+        for i in range(sample_rate // 2)
+    )
+    with wave.open(path, "wb") as wav_fp:
+        wav_fp.setnchannels(1)
+        wav_fp.setsampwidth(2)
+        wav_fp.setframerate(sample_rate)
+        wav_fp.writeframes(frames)
+
+
+def _round_trip(word_count, audio_format, work_dir):
+    shared_dir = os.path.join(work_dir, "shared")
+    blobs = AudioBlobStore(
+        os.path.join(work_dir, "blobs"),
+        sha1_file=_sha1_file,
+        encode_audio=encode_wav_to_compressed,
+        decode_audio=decode_audio_to_wav,
+    )
+    metadata = {}
+
+    def _store(path, *, move=False):
+        return blobs.put_file(path, move=move, audio_format=audio_format)
+
+    for index in range(word_count):
+        wav_path = os.path.join(work_dir, f"word{index}.wav")
+        _write_tone(wav_path, index)
+        cache_path = os.path.join(shared_dir, f"word{index}.wav")
+        metadata[cache_path] = {"text": f"word{index}", "backend": "gemini", "blob_sha1": _store(wav_path, move=True)}
+
+    def _export_entries():
+        entries = []
+        for cache_path, payload in metadata.items():
+            payload = dict(payload)
+            blob_sha1 = payload.pop("blob_sha1")
+            relative_path = _safe_rel_path(os.path.relpath(cache_path, shared_dir))
+            entries.append(
+                {
+                    "cache_path": cache_path,
+                    "audio_path": blobs.blob_path(blob_sha1),
+                    "relative_path": relative_path,
+                    "meta_relative_path": f"{relative_path}.json",
+                    "metadata": payload,
+                    "audio_sha1": blob_sha1,
+                }
+            )
+        return entries
+
+    package_path = os.path.join(work_dir, "pack.zip")
+    started = time.perf_counter()
+    export_shared_audio_cache_package(
+        package_path,
+        get_export_entries=_export_entries,
+        zip_entry_path=_zip_entry_path,
+        shared_cache_metadata_file=METADATA_NAME,
+        shared_cache_package_manifest=MANIFEST_NAME,
+        shared_cache_package_version=1,
+        export_shared_metadata_payload=dict,
+        sha1_file=blobs.content_sha1,
+    )
+    export_s = time.perf_counter() - started
+
+    def _save(cache_path, payload):
+        metadata[cache_path] = dict(payload)
+
+    started = time.perf_counter()
+    summary = import_shared_audio_cache_package(
+        package_path,
+        shared_cache_package_manifest=MANIFEST_NAME,
+        shared_cache_metadata_file=METADATA_NAME,
+        safe_rel_path=_safe_rel_path,
+        zip_entry_path=_zip_entry_path,
+        shared_cache_target_path=lambda relative_path="", metadata=None: os.path.join(shared_dir, relative_path),
+        sha1_file=blobs.content_sha1,
+        load_cache_metadata=lambda cache_path: dict(metadata.get(cache_path) or {}),
+        save_cache_metadata=_save,
+        store_audio_blob=_store,
+        discard_physical_cache_file=lambda cache_path: None,
+        audio_format_supported=compressed_audio_supported,
+        import_shared_metadata_payload=lambda payload: {},
+        cleanup_duplicate_source_cache_entries=lambda: None,
+        collapse_existing_lightweight_source_caches=lambda: None,
+        collapse_all_source_cache_entities_to_aliases=lambda: None,
+    )
+    import_s = time.perf_counter() - started
+    return export_s, import_s, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and re-import a shared audio cache package.")
+    parser.add_argument("--words", type=int, default=50)
+    parser.add_argument("--format", default="flac", choices=("wav", "flac", "opus"))
+    args = parser.parse_args()
+
+    if args.format != "wav" and not compressed_audio_supported(args.format):
+        print(f"{args.format} encoding is not available (install soundfile).")
+        return
+    with tempfile.TemporaryDirectory() as work_dir:
+        export_s, import_s, summary = _round_trip(args.words, args.format, work_dir)
+    print(f"export: {export_s:.2f}s for {args.words} {args.format} entries")
+    print(
+        f"import: {import_s:.2f}s, {summary['skipped_same']} same, {summary['replaced']} replaced, "
+        f"{summary['imported']} imported, {len(summary['errors'])} errors"
+    )
+    if summary["skipped_same"] != args.words:
+        print("round trip re-stored unchanged audio: exported audio_sha1 does not match blob_sha1")
+
+
+if __name__ == "__main__":
+    main()
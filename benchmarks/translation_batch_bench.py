@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services import translation
+
+
+SAMPLE_WORDS_PATH = Path(__file__).resolve().parent.parent / "sample_words.txt"
+
+
+def _load_words(limit):
+    words = []
+    seen = set()
+    with open(SAMPLE_WORDS_PATH, "r", encoding="utf-8") as fp:
+        for line in fp:
+            word = line.strip()
+            if not word or word.casefold() in seen:
+                continue
+            seen.add(word.casefold())
+            words.append(word)
+            if len(words) >= limit:
+                break
+    return words
+
+
+def _time_single(words):
+    started = time.perf_counter()
+    failures = 0
+    for word in words:
+        try:
+            if not translation.translate_text(word):
+                failures += 1
+        except Exception:
+            failures += 1
+    return time.perf_counter() - started, failures
+
+
+def _time_batch(words, batch_size):
+    started = time.perf_counter()
+    failures = 0
+    for start in range(0, len(words), batch_size):
+        results = translation.translate_batch(words[start : start + batch_size])
+        failures += sum(1 for value in results if not value)
+    return time.perf_counter() - started, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-word vs batched Argos translation benchmark.")
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=translation.ARGOS_BATCH_SIZE)
+    args = parser.parse_args()
+
+    words = _load_words(args.words)
+    started = time.perf_counter()
+    try:
+        translation._ensure_translation()
+        translation.translate_batch(words[:2])
+    except Exception as exc:
+        print(f"Argos Translate is not ready: {exc}")
+        return
+    print(f"loaded Argos and warmed up in {time.perf_counter() - started:.1f}s")
+
+    single_s, single_failures = _time_single(words)
+    batch_s, batch_failures = _time_batch(words, max(1, args.batch_size))
+    print(f"single: {len(words) / single_s:7.1f} words/s ({single_s:.2f}s for {len(words)} words, {single_failures} empty)")
+    print(
+        f" batch: {len(words) / batch_s:7.1f} words/s ({batch_s:.2f}s, batch size {args.batch_size}, "
+        f"{batch_failures} empty)"
+    )
+
+
+if __name__ == "__main__":
+    main()
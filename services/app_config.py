@@ -15,6 +15,8 @@ _DEFAULT_CONFIG = {
     "ui_language": "",
     "update_manifest_url": "",
     "shared_cache_manifest_url": "",
+    "audio_cache_format": "wav",
+    "model_warmup_order": ["translation", "nlp", "kokoro", "piper", "wordnet"],
 }
 
 
@@ -57,6 +59,13 @@ def _normalize_tts_provider(provider):
     return "gemini"
 
 
+def _normalize_audio_cache_format(audio_format):
+    value = str(audio_format or "").strip().lower()
+    if value in {"flac", "opus"}:
+        return value
+    return "wav"
+
+
 def load_config():
     if not _CONFIG_PATH.exists():
         return dict(_DEFAULT_CONFIG)
@@ -185,3 +194,25 @@ def set_shared_cache_manifest_url(url):
     config = load_config()
     config["shared_cache_manifest_url"] = str(url or "").strip()
     save_config(config)
+
+
+def get_audio_cache_format():
+    return _normalize_audio_cache_format(load_config().get("audio_cache_format"))
+
+
+def set_audio_cache_format(audio_format):
+    config = load_config()
+    config["audio_cache_format"] = _normalize_audio_cache_format(audio_format)
+    save_config(config)
+
+
+def get_model_warmup_order():
+    value = load_config().get("model_warmup_order")
+    if not isinstance(value, list):
+        value = _DEFAULT_CONFIG["model_warmup_order"]
+    order = []
+    for item in value:
+        name = str(item or "").strip().lower()
+        if name and name not in order:
+            order.append(name)
+    return order
@@ -98,7 +98,7 @@ def ensure_bundled_corpus_imported():
         except Exception:
             pass
 
-    result = import_corpus_files(to_import)
+    result = import_corpus_files(to_import, incremental=True)
 
     with _LOCK:
         state = _load_state_locked()
@@ -107,6 +107,7 @@ def ensure_bundled_corpus_imported():
 
     return {
         "imported": int(result.get("files", 0) or 0),
+        "skipped": int(result.get("skipped", 0) or 0),
         "available": len(bundled_files),
         "errors": list(result.get("errors") or []),
     }
@@ -1,11 +1,20 @@
 # -*- coding: utf-8 -*-
 import os
 import sqlite3
+import threading
+from array import array
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
 
 DB_PATH = Path(__file__).resolve().parent.parent / "data" / "corpus_index.db"
+READ_POOL_SIZE = 4
+_FTS_AVAILABLE = None
+_SCHEMA_LOCK = threading.Lock()
+_SCHEMA_READY_PATH = ""
+_READ_POOL_LOCK = threading.Lock()
+_READ_POOL = []
 
 
 def get_connection():
@@ -16,14 +25,70 @@ def get_connection():
     return conn
 
 
+def apply_import_pragmas(conn):
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def _open_read_connection():
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA cache_size = -32768")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+@contextmanager
+def read_connection():
+    ensure_schema()
+    db_key = str(DB_PATH)
+    conn = None
+    with _READ_POOL_LOCK:
+        while _READ_POOL and conn is None:
+            pooled_path, pooled_conn = _READ_POOL.pop()
+            if pooled_path == db_key:
+                conn = pooled_conn
+            else:
+                pooled_conn.close()
+    if conn is None:
+        conn = _open_read_connection()
+    try:
+        yield conn
+    except Exception:
+        conn.close()
+        raise
+    with _READ_POOL_LOCK:
+        if len(_READ_POOL) < READ_POOL_SIZE:
+            _READ_POOL.append((db_key, conn))
+            return
+    conn.close()
+
+
 def _table_columns(conn, table_name):
     rows = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
     return {str(row["name"]) for row in rows}
 
 
 def ensure_schema():
+    global _SCHEMA_READY_PATH
+    db_key = str(DB_PATH)
+    if _SCHEMA_READY_PATH == db_key:
+        return
+    with _SCHEMA_LOCK:
+        if _SCHEMA_READY_PATH == db_key:
+            return
+        _create_schema()
+        _SCHEMA_READY_PATH = db_key
+
+
+def _create_schema():
     conn = get_connection()
     try:
+        conn.execute("PRAGMA journal_mode = WAL")
         conn.executescript(
             """
             CREATE TABLE IF NOT EXISTS documents (
@@ -33,6 +98,8 @@ def ensure_schema():
                 file_type TEXT NOT NULL,
                 source_type TEXT NOT NULL DEFAULT '',
                 file_hash TEXT,
+                file_size INTEGER,
+                file_mtime_ns INTEGER,
                 imported_at TEXT NOT NULL
             );
 
@@ -56,6 +123,7 @@ def ensure_schema():
                 chunk_id INTEGER,
                 sentence_text TEXT NOT NULL,
                 lemma_text TEXT NOT NULL,
+                token_offsets BLOB,
                 source_file TEXT NOT NULL,
                 page_num INTEGER,
                 test_label TEXT,
@@ -69,11 +137,18 @@ def ensure_schema():
                 FOREIGN KEY(chunk_id) REFERENCES chunks(id) ON DELETE CASCADE
             );
 
+            CREATE TABLE IF NOT EXISTS lemmas (
+                id INTEGER PRIMARY KEY,
+                text TEXT NOT NULL UNIQUE,
+                df INTEGER NOT NULL DEFAULT 0
+            );
+
             CREATE TABLE IF NOT EXISTS sentence_lemmas (
+                lemma_id INTEGER NOT NULL,
                 sentence_id INTEGER NOT NULL,
-                lemma TEXT NOT NULL,
+                PRIMARY KEY(lemma_id, sentence_id),
                 FOREIGN KEY(sentence_id) REFERENCES sentences(id) ON DELETE CASCADE
-            );
+            ) WITHOUT ROWID;
 
             CREATE TABLE IF NOT EXISTS imports (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -93,29 +168,118 @@ def ensure_schema():
         document_columns = _table_columns(conn, "documents")
         if "source_type" not in document_columns:
             conn.execute("ALTER TABLE documents ADD COLUMN source_type TEXT NOT NULL DEFAULT ''")
+        if "file_size" not in document_columns:
+            conn.execute("ALTER TABLE documents ADD COLUMN file_size INTEGER")
+        if "file_mtime_ns" not in document_columns:
+            conn.execute("ALTER TABLE documents ADD COLUMN file_mtime_ns INTEGER")
 
         sentence_columns = _table_columns(conn, "sentences")
         if "chunk_id" not in sentence_columns:
             conn.execute("ALTER TABLE sentences ADD COLUMN chunk_id INTEGER")
         if "sentence_order" not in sentence_columns:
             conn.execute("ALTER TABLE sentences ADD COLUMN sentence_order INTEGER NOT NULL DEFAULT 0")
+        if "token_offsets" not in sentence_columns:
+            conn.execute("ALTER TABLE sentences ADD COLUMN token_offsets BLOB")
+
+        if "lemma_id" not in _table_columns(conn, "sentence_lemmas"):
+            _migrate_sentence_lemmas(conn)
 
         conn.executescript(
             """
             CREATE INDEX IF NOT EXISTS idx_sentences_document_id ON sentences(document_id);
             CREATE INDEX IF NOT EXISTS idx_sentences_chunk_id ON sentences(chunk_id);
             CREATE INDEX IF NOT EXISTS idx_chunks_document_id ON chunks(document_id);
-            CREATE INDEX IF NOT EXISTS idx_sentence_lemmas_lemma ON sentence_lemmas(lemma);
-            CREATE UNIQUE INDEX IF NOT EXISTS idx_sentence_lemmas_unique ON sentence_lemmas(sentence_id, lemma);
+            CREATE INDEX IF NOT EXISTS idx_sentence_lemmas_sentence_id ON sentence_lemmas(sentence_id);
             CREATE INDEX IF NOT EXISTS idx_imports_document_id ON imports(document_id);
             """
         )
 
         conn.commit()
+        _ensure_fts(conn)
     finally:
         conn.close()
 
 
+def _migrate_sentence_lemmas(conn):
+    conn.executescript(
+        """
+        INSERT OR IGNORE INTO lemmas(text) SELECT DISTINCT lemma FROM sentence_lemmas;
+
+        CREATE TABLE sentence_lemmas_interned (
+            lemma_id INTEGER NOT NULL,
+            sentence_id INTEGER NOT NULL,
+            PRIMARY KEY(lemma_id, sentence_id),
+            FOREIGN KEY(sentence_id) REFERENCES sentences(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+
+        INSERT OR IGNORE INTO sentence_lemmas_interned(lemma_id, sentence_id)
+        SELECT l.id, sl.sentence_id
+        FROM sentence_lemmas sl
+        JOIN lemmas l ON l.text = sl.lemma;
+
+        DROP TABLE sentence_lemmas;
+        ALTER TABLE sentence_lemmas_interned RENAME TO sentence_lemmas;
+
+        UPDATE lemmas SET df = (SELECT COUNT(*) FROM sentence_lemmas sl WHERE sl.lemma_id = lemmas.id);
+        """
+    )
+
+
+def _ensure_fts(conn):
+    global _FTS_AVAILABLE
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sentences_fts'"
+        ).fetchone()
+        conn.executescript(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS sentences_fts USING fts5(
+                sentence_text,
+                lemma_text,
+                content='sentences',
+                content_rowid='id'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS sentences_fts_ai AFTER INSERT ON sentences BEGIN
+                INSERT INTO sentences_fts(rowid, sentence_text, lemma_text)
+                VALUES (new.id, new.sentence_text, new.lemma_text);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS sentences_fts_ad AFTER DELETE ON sentences BEGIN
+                INSERT INTO sentences_fts(sentences_fts, rowid, sentence_text, lemma_text)
+                VALUES ('delete', old.id, old.sentence_text, old.lemma_text);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS sentences_fts_au AFTER UPDATE ON sentences BEGIN
+                INSERT INTO sentences_fts(sentences_fts, rowid, sentence_text, lemma_text)
+                VALUES ('delete', old.id, old.sentence_text, old.lemma_text);
+                INSERT INTO sentences_fts(rowid, sentence_text, lemma_text)
+                VALUES (new.id, new.sentence_text, new.lemma_text);
+            END;
+            """
+        )
+        if not exists:
+            conn.execute("INSERT INTO sentences_fts(sentences_fts) VALUES ('rebuild')")
+        conn.commit()
+        _FTS_AVAILABLE = True
+    except sqlite3.OperationalError:
+        conn.rollback()
+        conn.executescript(
+            """
+            DROP TRIGGER IF EXISTS sentences_fts_ai;
+            DROP TRIGGER IF EXISTS sentences_fts_ad;
+            DROP TRIGGER IF EXISTS sentences_fts_au;
+            """
+        )
+        _FTS_AVAILABLE = False
+
+
+def fts_available():
+    if _FTS_AVAILABLE is None:
+        ensure_schema()
+    return bool(_FTS_AVAILABLE)
+
+
 def infer_source_type(name, file_type):
     label = f"{str(name or '').lower()} {str(file_type or '').lower()}"
     if "audio" in label or "transcript" in label or "script" in label:
@@ -125,23 +289,83 @@ def infer_source_type(name, file_type):
     return "generic"
 
 
-def replace_document(conn, path, name, file_type, file_hash):
+def _delete_document_rows(conn, document_id):
+    conn.execute(
+        """
+        WITH removed AS (
+            SELECT sl.lemma_id, COUNT(*) AS n
+            FROM sentence_lemmas sl
+            JOIN sentences s ON s.id = sl.sentence_id
+            WHERE s.document_id = ?
+            GROUP BY sl.lemma_id
+        )
+        UPDATE lemmas
+        SET df = MAX(0, df - (SELECT n FROM removed WHERE removed.lemma_id = lemmas.id))
+        WHERE id IN (SELECT lemma_id FROM removed)
+        """,
+        (document_id,),
+    )
+    conn.execute(
+        "DELETE FROM sentence_lemmas WHERE sentence_id IN (SELECT id FROM sentences WHERE document_id = ?)",
+        (document_id,),
+    )
+    conn.execute("DELETE FROM sentences WHERE document_id = ?", (document_id,))
+    conn.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+
+
+def intern_lemmas(conn, texts):
+    texts = sorted({str(text) for text in texts if text})
+    if not texts:
+        return {}
+    conn.executemany("INSERT OR IGNORE INTO lemmas(text) VALUES(?)", [(text,) for text in texts])
+    return {text: lemma_id for text, lemma_id, _df in _fetch_lemma_rows(conn, texts)}
+
+
+def _fetch_lemma_rows(conn, texts):
+    rows = []
+    for start in range(0, len(texts), 500):
+        batch = texts[start : start + 500]
+        placeholders = ",".join("?" for _ in batch)
+        rows.extend(
+            (str(row["text"]), int(row["id"]), int(row["df"] or 0))
+            for row in conn.execute(f"SELECT id, text, df FROM lemmas WHERE text IN ({placeholders})", tuple(batch))
+        )
+    return rows
+
+
+def fetch_document_stamp(conn, path):
+    row = conn.execute(
+        "SELECT id, file_hash, file_size, file_mtime_ns FROM documents WHERE path = ?",
+        (path,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def update_document_stamp(conn, document_id, file_hash, file_size=None, file_mtime_ns=None):
+    conn.execute(
+        "UPDATE documents SET file_hash = ?, file_size = ?, file_mtime_ns = ? WHERE id = ?",
+        (file_hash, file_size, file_mtime_ns, int(document_id)),
+    )
+
+
+def replace_document(conn, path, name, file_type, file_hash, file_size=None, file_mtime_ns=None):
     row = conn.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
     if row:
         document_id = int(row["id"])
+        _delete_document_rows(conn, document_id)
         conn.execute(
-            "DELETE FROM sentence_lemmas WHERE sentence_id IN (SELECT id FROM sentences WHERE document_id = ?)",
-            (document_id,),
-        )
-        conn.execute("DELETE FROM sentences WHERE document_id = ?", (document_id,))
-        conn.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
-        conn.execute(
-            "UPDATE documents SET name = ?, file_type = ?, source_type = ?, file_hash = ?, imported_at = ? WHERE id = ?",
+            """
+            UPDATE documents
+            SET name = ?, file_type = ?, source_type = ?, file_hash = ?, file_size = ?, file_mtime_ns = ?, imported_at = ?
+            WHERE id = ?
+            """,
             (
                 name,
                 file_type,
                 infer_source_type(name, file_type),
                 file_hash,
+                file_size,
+                file_mtime_ns,
                 datetime.now().isoformat(timespec="seconds"),
                 document_id,
             ),
@@ -149,13 +373,18 @@ def replace_document(conn, path, name, file_type, file_hash):
         return document_id
 
     cur = conn.execute(
-        "INSERT INTO documents(path, name, file_type, source_type, file_hash, imported_at) VALUES(?,?,?,?,?,?)",
+        """
+        INSERT INTO documents(path, name, file_type, source_type, file_hash, file_size, file_mtime_ns, imported_at)
+        VALUES(?,?,?,?,?,?,?,?)
+        """,
         (
             path,
             name,
             file_type,
             infer_source_type(name, file_type),
             file_hash,
+            file_size,
+            file_mtime_ns,
             datetime.now().isoformat(timespec="seconds"),
         ),
     )
@@ -196,10 +425,67 @@ def finish_import_record(conn, import_id, status, chunks_indexed=0, sentences_in
     )
 
 
+def encode_token_offsets(offsets):
+    flat = array("I")
+    for start, end in offsets:
+        flat.extend((int(start), int(end)))
+    return flat.tobytes()
+
+
+def decode_token_offsets(blob):
+    if blob is None:
+        return None
+    flat = array("I")
+    flat.frombytes(bytes(blob))
+    return list(zip(flat[0::2], flat[1::2]))
+
+
+def next_row_id(conn, table_name):
+    row = conn.execute(f"SELECT COALESCE(MAX(id), 0) AS max_id FROM {table_name}").fetchone()
+    max_id = int(row["max_id"] or 0)
+    seq_row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table_name,)).fetchone()
+    if seq_row:
+        max_id = max(max_id, int(seq_row["seq"] or 0))
+    return max_id + 1
+
+
+def insert_document_rows(conn, chunk_rows, sentence_rows, lemma_rows):
+    if chunk_rows:
+        conn.executemany(
+            """
+            INSERT INTO chunks(
+                id, document_id, chunk_text, page_num, test_label, section_label,
+                part_label, speaker_label, question_label, sort_key
+            ) VALUES(?,?,?,?,?,?,?,?,?,?)
+            """,
+            chunk_rows,
+        )
+    if sentence_rows:
+        conn.executemany(
+            """
+            INSERT INTO sentences(
+                id, document_id, chunk_id, sentence_text, lemma_text, token_offsets, source_file, page_num,
+                test_label, section_label, part_label, speaker_label, question_label,
+                sentence_order, sort_key
+            ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            sentence_rows,
+        )
+    if lemma_rows:
+        lemma_ids = intern_lemmas(conn, (lemma for _sentence_id, lemma in lemma_rows))
+        postings = {(lemma_ids[lemma], sentence_id) for sentence_id, lemma in lemma_rows}
+        conn.executemany("INSERT OR IGNORE INTO sentence_lemmas(lemma_id, sentence_id) VALUES(?, ?)", sorted(postings))
+        df_counts = {}
+        for lemma_id, _sentence_id in postings:
+            df_counts[lemma_id] = df_counts.get(lemma_id, 0) + 1
+        conn.executemany(
+            "UPDATE lemmas SET df = df + ? WHERE id = ?",
+            [(count, lemma_id) for lemma_id, count in df_counts.items()],
+        )
+
+
 def fetch_stats():
-    ensure_schema()
-    conn = get_connection()
-    try:
+    with read_connection() as conn:
         docs = conn.execute("SELECT COUNT(*) AS c FROM documents").fetchone()["c"]
         chunks = conn.execute("SELECT COUNT(*) AS c FROM chunks").fetchone()["c"]
         sentences = conn.execute("SELECT COUNT(*) AS c FROM sentences").fetchone()["c"]
@@ -208,14 +494,10 @@ def fetch_stats():
             "chunks": int(chunks or 0),
             "sentences": int(sentences or 0),
         }
-    finally:
-        conn.close()
 
 
 def fetch_documents(limit=200):
-    ensure_schema()
-    conn = get_connection()
-    try:
+    with read_connection() as conn:
         rows = conn.execute(
             """
             SELECT
@@ -236,8 +518,6 @@ def fetch_documents(limit=200):
             (int(limit),),
         ).fetchall()
         return [dict(row) for row in rows]
-    finally:
-        conn.close()
 
 
 def remove_document_by_path(document_path):
@@ -251,12 +531,7 @@ def remove_document_by_path(document_path):
         if not row:
             return 0
         document_id = int(row["id"])
-        conn.execute(
-            "DELETE FROM sentence_lemmas WHERE sentence_id IN (SELECT id FROM sentences WHERE document_id = ?)",
-            (document_id,),
-        )
-        conn.execute("DELETE FROM sentences WHERE document_id = ?", (document_id,))
-        conn.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+        _delete_document_rows(conn, document_id)
         conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
         conn.commit()
         return 1
@@ -264,71 +539,137 @@ def remove_document_by_path(document_path):
         conn.close()
 
 
-def search_sentence_rows(lemmas, limit=50, document_path=None):
-    ensure_schema()
-    conn = get_connection()
-    try:
+_RESULT_COLUMNS = """
+    s.*,
+    c.chunk_text,
+    d.source_type,
+    d.path AS document_path,
+    d.imported_at,
+    d.name AS document_name,
+    COALESCE(s.page_num, -1) AS page_key
+"""
+_RESULT_ORDER = (
+    ("d.imported_at", "DESC", "imported_at"),
+    ("d.name", "ASC", "document_name"),
+    ("COALESCE(s.page_num, -1)", "ASC", "page_key"),
+    ("s.sort_key", "ASC", "sort_key"),
+    ("s.sentence_order", "ASC", "sentence_order"),
+    ("s.id", "ASC", "id"),
+)
+
+
+def _keyset_clause(order, cursor):
+    clause = ""
+    params = []
+    for expr, direction, key in reversed(order):
+        op = "<" if direction == "DESC" else ">"
+        value = cursor[key]
+        if not clause:
+            clause = f"{expr} {op} ?"
+            params = [value]
+        else:
+            clause = f"{expr} {op} ? OR ({expr} = ? AND ({clause}))"
+            params = [value, value] + params
+    return f"({clause})", params
+
+
+def _page_rows(conn, sql, params, order, limit, after):
+    if after:
+        clause, keyset_params = _keyset_clause(order, after)
+        sql += f" AND {clause}"
+        params = list(params) + keyset_params
+    sql += " ORDER BY " + ", ".join(f"{expr} {direction}" for expr, direction, _key in order) + " LIMIT ?"
+    rows = [dict(row) for row in conn.execute(sql, tuple(params) + (int(limit),)).fetchall()]
+    next_cursor = None
+    if rows and len(rows) >= int(limit):
+        next_cursor = {key: rows[-1][key] for _expr, _direction, key in order}
+    return rows, next_cursor
+
+
+_PREFIX_SENTENCE_FILTER = """
+    s.id IN (
+        SELECT sp.sentence_id
+        FROM lemmas lp
+        JOIN sentence_lemmas sp ON sp.lemma_id = lp.id
+        WHERE lp.text >= ? AND lp.text < ?
+    )
+"""
+
+
+def search_sentence_rows(lemmas, limit=50, document_path=None, after=None, prefixes=()):
+    with read_connection() as conn:
         doc_path = os.path.abspath(str(document_path or "").strip()) if document_path else ""
-        if len(lemmas) == 1:
-            sql = """
-                SELECT
-                    s.*,
-                    c.chunk_text,
-                    d.source_type,
-                    d.path AS document_path,
-                    d.imported_at
-                FROM sentence_lemmas sl
-                JOIN sentences s ON s.id = sl.sentence_id
+        targets = sorted({str(lemma) for lemma in lemmas if lemma})
+        prefix_terms = sorted({str(prefix) for prefix in prefixes or () if prefix})
+        empty = {"rows": [], "document_path": doc_path, "next_cursor": None}
+        if not targets and not prefix_terms:
+            return empty
+
+        params = []
+        if targets:
+            postings = sorted(_fetch_lemma_rows(conn, targets), key=lambda row: row[2])
+            if len(postings) < len(targets) or postings[0][2] <= 0:
+                return empty
+            sql = f"SELECT {_RESULT_COLUMNS} FROM sentence_lemmas sl0"
+            for index, (_text, lemma_id, _df) in enumerate(postings[1:], start=1):
+                sql += (
+                    f" CROSS JOIN sentence_lemmas sl{index}"
+                    f" ON sl{index}.lemma_id = ? AND sl{index}.sentence_id = sl0.sentence_id"
+                )
+                params.append(lemma_id)
+            sql += """
+                JOIN sentences s ON s.id = sl0.sentence_id
                 LEFT JOIN chunks c ON c.id = s.chunk_id
                 LEFT JOIN documents d ON d.id = s.document_id
-                WHERE sl.lemma = ?
+                WHERE sl0.lemma_id = ?
             """
-            params = [lemmas[0]]
-            if doc_path:
-                sql += " AND d.path = ?"
-                params.append(doc_path)
-            sql += """
-                ORDER BY d.imported_at DESC, d.name ASC, s.page_num, s.sort_key, s.sentence_order
-                LIMIT ?
-            """
-            params.append(int(limit))
-            rows = conn.execute(sql, tuple(params)).fetchall()
+            params.append(postings[0][1])
         else:
-            placeholders = ",".join("?" for _ in lemmas)
             sql = f"""
-                WITH matched AS (
-                    SELECT s.id
-                    FROM sentences s
-                    JOIN sentence_lemmas sl ON sl.sentence_id = s.id
-                    LEFT JOIN documents d ON d.id = s.document_id
-                    WHERE sl.lemma IN ({placeholders})
-            """
-            params = list(lemmas)
-            if doc_path:
-                sql += " AND d.path = ?"
-                params.append(doc_path)
-            sql += """
-                    GROUP BY s.id
-                    HAVING COUNT(DISTINCT sl.lemma) >= ?
-                )
-                SELECT
-                    s.*,
-                    c.chunk_text,
-                    d.source_type,
-                    d.path AS document_path,
-                    d.imported_at
-                FROM matched m
-                JOIN sentences s ON s.id = m.id
+                SELECT {_RESULT_COLUMNS}
+                FROM sentences s
                 LEFT JOIN chunks c ON c.id = s.chunk_id
                 LEFT JOIN documents d ON d.id = s.document_id
-                ORDER BY d.imported_at DESC, d.name ASC, s.page_num, s.sort_key, s.sentence_order
-                LIMIT ?
+                WHERE 1 = 1
             """
-            params.extend([len(set(lemmas)), int(limit)])
-            rows = conn.execute(sql, tuple(params)).fetchall()
+        for prefix in prefix_terms:
+            sql += f" AND {_PREFIX_SENTENCE_FILTER}"
+            params.extend((prefix, prefix + "\U0010ffff"))
+        if doc_path:
+            sql += " AND d.path = ?"
+            params.append(doc_path)
+        rows, next_cursor = _page_rows(conn, sql, params, _RESULT_ORDER, limit, after)
         return {
-            "rows": [dict(row) for row in rows],
+            "rows": rows,
             "document_path": doc_path,
+            "next_cursor": next_cursor,
+        }
+
+
+def search_sentence_fts_rows(match_query, limit=50, document_path=None, after=None):
+    with read_connection() as conn:
+        doc_path = os.path.abspath(str(document_path or "").strip()) if document_path else ""
+        sql = f"""
+            WITH hits AS (
+                SELECT rowid AS sentence_id, bm25(sentences_fts) AS score
+                FROM sentences_fts
+                WHERE sentences_fts MATCH ?
+            )
+            SELECT {_RESULT_COLUMNS}, h.score
+            FROM hits h
+            JOIN sentences s ON s.id = h.sentence_id
+            LEFT JOIN chunks c ON c.id = s.chunk_id
+            LEFT JOIN documents d ON d.id = s.document_id
+            WHERE 1 = 1
+        """
+        params = [match_query]
+        if doc_path:
+            sql += " AND d.path = ?"
+            params.append(doc_path)
+        order = (("h.score", "ASC", "score"),) + _RESULT_ORDER
+        rows, next_cursor = _page_rows(conn, sql, params, order, limit, after)
+        return {
+            "rows": rows,
+            "document_path": doc_path,
+            "next_cursor": next_cursor,
         }
-    finally:
-        conn.close()
@@ -1,36 +1,43 @@
 # -*- coding: utf-8 -*-
 import re
+import threading
 
 
 _NLP = None
 _NLP_MODE = "en_core_web_sm"
+_NLP_LOCK = threading.Lock()
+PIPE_BATCH_SIZE = 64
+_INGEST_UNUSED_PIPES = ("ner",)
 
 
 def get_nlp():
     global _NLP, _NLP_MODE
     if _NLP is not None:
         return _NLP, _NLP_MODE
+    with _NLP_LOCK:
+        if _NLP is not None:
+            return _NLP, _NLP_MODE
 
-    try:
-        import spacy
-    except Exception as e:
-        raise RuntimeError(
-            "spaCy is not installed. Run: pip install spacy spacy-lookups-data"
-        ) from e
-
-    try:
-        _NLP = spacy.load("en_core_web_sm")
-        return _NLP, _NLP_MODE
-    except Exception as load_error:
         try:
-            import en_core_web_sm
+            import spacy
+        except Exception as e:
+            raise RuntimeError(
+                "spaCy is not installed. Run: pip install spacy spacy-lookups-data"
+            ) from e
 
-            _NLP = en_core_web_sm.load()
+        try:
+            _NLP = spacy.load("en_core_web_sm")
             return _NLP, _NLP_MODE
-        except Exception as import_error:
-            raise RuntimeError(
-                "spaCy model 'en_core_web_sm' is missing. Run: python -m spacy download en_core_web_sm"
-            ) from import_error if import_error else load_error
+        except Exception as load_error:
+            try:
+                import en_core_web_sm
+
+                _NLP = en_core_web_sm.load()
+                return _NLP, _NLP_MODE
+            except Exception as import_error:
+                raise RuntimeError(
+                    "spaCy model 'en_core_web_sm' is missing. Run: python -m spacy download en_core_web_sm"
+                ) from import_error if import_error else load_error
 
 
 def get_nlp_status():
@@ -289,59 +296,86 @@ def parse_structured_blocks(blocks):
     return parsed
 
 
+def _merge_sentence_parts(parts):
+    merged = []
+    for text, lemmas, offsets in parts:
+        if merged:
+            prev_text, prev_lemmas, prev_offsets = merged[-1]
+            if text[:1].islower() or prev_text[-1:] not in ".!?":
+                shift = len(prev_text) + 1
+                merged[-1] = (
+                    clean_line(f"{prev_text} {text}"),
+                    prev_lemmas + lemmas,
+                    prev_offsets + [(start + shift, end + shift) for start, end in offsets],
+                )
+                continue
+        merged.append((text, list(lemmas), list(offsets)))
+    return merged
+
+
 def doc_sentences(text):
     nlp, _mode = get_nlp()
     doc = nlp(text)
     raw_sents = [sent.text.strip() for sent in doc.sents if sent.text and sent.text.strip()]
     if raw_sents:
-        merged = []
-        for sent in raw_sents:
-            if merged:
-                prev = merged[-1]
-                if sent[:1].islower() or prev[-1:] not in ".!?":
-                    merged[-1] = clean_line(f"{prev} {sent}")
-                    continue
-            merged.append(sent)
-        return merged
+        return [sent for sent, _lemmas, _offsets in _merge_sentence_parts((sent, [], []) for sent in raw_sents)]
     return [text.strip()] if str(text or "").strip() else []
 
 
-def lemma_doc(text):
-    nlp, _mode = get_nlp()
-    doc = nlp(text)
+def token_lemma(token):
+    lemma = str(getattr(token, "lemma_", "") or "").strip().lower()
+    if lemma in ("-pron-", ""):
+        lemma = str(token.text or "").strip().lower()
+    return lemma
+
+
+def _span_lemmas(span):
+    return [token_lemma(token) for token in span if not (token.is_space or token.is_punct)]
+
+
+def _span_tokens(span, text):
+    base = int(span[0].idx) if len(span) else 0
+    base += len(text) - len(text.lstrip())
     lemmas = []
-    for token in doc:
+    offsets = []
+    for token in span:
         if token.is_space or token.is_punct:
             continue
-        lemma = str(getattr(token, "lemma_", "") or "").strip().lower()
-        if lemma in ("-pron-", ""):
-            lemma = str(token.text or "").strip().lower()
-        lemmas.append(lemma)
-    return lemmas
+        lemmas.append(token_lemma(token))
+        start = int(token.idx) - base
+        offsets.append((start, start + len(token.text)))
+    return lemmas, offsets
 
 
-def highlight_ranges(text, query, lemmas):
-    clean_text = str(text or "")
-    clean_query = clean_line(query)
-    target_lemmas = {str(lemma or "").strip().lower() for lemma in (lemmas or []) if str(lemma or "").strip()}
-    ranges = []
+def lemma_doc(text):
+    nlp, _mode = get_nlp()
+    return _span_lemmas(nlp(text))
 
-    if clean_query:
-        for match in re.finditer(re.escape(clean_query), clean_text, flags=re.IGNORECASE):
-            ranges.append((match.start(), match.end()))
 
-    if target_lemmas:
-        nlp, _mode = get_nlp()
-        doc = nlp(clean_text)
-        for token in doc:
-            if token.is_space or token.is_punct:
-                continue
-            lemma = str(getattr(token, "lemma_", "") or "").strip().lower()
-            if lemma in ("-pron-", ""):
-                lemma = str(token.text or "").strip().lower()
-            if lemma in target_lemmas:
-                ranges.append((int(token.idx), int(token.idx) + len(token.text)))
+def analyze_texts(texts, batch_size=PIPE_BATCH_SIZE, n_process=1):
+    nlp, _mode = get_nlp()
+    texts = [str(text or "") for text in texts]
+    disabled = [name for name in _INGEST_UNUSED_PIPES if name in nlp.pipe_names]
+    results = []
+    for text, doc in zip(
+        texts,
+        nlp.pipe(texts, batch_size=max(1, int(batch_size)), n_process=max(1, int(n_process)), disable=disabled),
+    ):
+        parts = []
+        for sent in doc.sents:
+            sent_text = sent.text.strip()
+            if sent_text:
+                parts.append((sent_text, *_span_tokens(sent, sent.text)))
+        if parts:
+            results.append(_merge_sentence_parts(parts))
+        elif text.strip():
+            results.append([(text.strip(), *_span_tokens(doc, text))])
+        else:
+            results.append([])
+    return results
+
 
+def _merge_ranges(ranges):
     if not ranges:
         return []
 
@@ -354,3 +388,49 @@ def highlight_ranges(text, query, lemmas):
         else:
             merged.append([start, end])
     return [(start, end) for start, end in merged]
+
+
+def _query_ranges(text, query):
+    clean_query = clean_line(query)
+    if not clean_query:
+        return []
+    return [(match.start(), match.end()) for match in re.finditer(re.escape(clean_query), text, flags=re.IGNORECASE)]
+
+
+def _highlight_targets(lemmas, prefixes):
+    target_lemmas = {str(lemma or "").strip().lower() for lemma in (lemmas or []) if str(lemma or "").strip()}
+    target_prefixes = tuple(str(prefix or "").strip().lower() for prefix in (prefixes or []) if str(prefix or "").strip())
+    return target_lemmas, target_prefixes
+
+
+def _is_highlight_hit(lemma, token_text, target_lemmas, target_prefixes):
+    if lemma in target_lemmas:
+        return True
+    return bool(target_prefixes) and (lemma.startswith(target_prefixes) or token_text.lower().startswith(target_prefixes))
+
+
+def highlight_ranges(text, query, lemmas, prefixes=()):
+    clean_text = str(text or "")
+    target_lemmas, target_prefixes = _highlight_targets(lemmas, prefixes)
+    ranges = _query_ranges(clean_text, query)
+
+    if target_lemmas or target_prefixes:
+        nlp, _mode = get_nlp()
+        doc = nlp(clean_text)
+        for token in doc:
+            if token.is_space or token.is_punct:
+                continue
+            if _is_highlight_hit(token_lemma(token), token.text, target_lemmas, target_prefixes):
+                ranges.append((int(token.idx), int(token.idx) + len(token.text)))
+
+    return _merge_ranges(ranges)
+
+
+def highlight_ranges_from_tokens(text, query, token_lemmas, token_offsets, lemmas, prefixes=()):
+    clean_text = str(text or "")
+    target_lemmas, target_prefixes = _highlight_targets(lemmas, prefixes)
+    ranges = _query_ranges(clean_text, query)
+    for lemma, (start, end) in zip(token_lemmas, token_offsets):
+        if _is_highlight_hit(lemma, clean_text[start:end], target_lemmas, target_prefixes):
+            ranges.append((int(start), int(end)))
+    return _merge_ranges(ranges)
@@ -1,31 +1,108 @@
 # -*- coding: utf-8 -*-
 import hashlib
 import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 from services.corpus_ingest import (
+    PIPE_BATCH_SIZE,
+    analyze_texts as _analyze_texts,
     clean_line as _clean_line,
-    doc_sentences as _doc_sentences,
     get_nlp,
     get_nlp_status,
     highlight_ranges as _highlight_ranges,
+    highlight_ranges_from_tokens as _highlight_ranges_from_tokens,
     iter_file_blocks as _iter_file_blocks,
     lemma_doc as _lemma_doc,
     parse_structured_blocks as _parse_structured_blocks,
 )
 from services.corpus_index_store import (
+    apply_import_pragmas as _apply_import_pragmas,
     create_import_record as _create_import_record,
+    decode_token_offsets as _decode_token_offsets,
+    encode_token_offsets as _encode_token_offsets,
     ensure_schema,
+    fetch_document_stamp as _fetch_document_stamp,
     fetch_documents as _fetch_documents,
     fetch_stats as _fetch_stats,
     finish_import_record as _finish_import_record,
+    fts_available as _fts_available,
     get_connection as _get_connection,
+    insert_document_rows as _insert_document_rows,
+    next_row_id as _next_row_id,
     replace_document as _replace_document,
     remove_document_by_path as _remove_document_by_path,
+    search_sentence_fts_rows as _search_sentence_fts_rows,
     search_sentence_rows as _search_sentence_rows,
+    update_document_stamp as _update_document_stamp,
 )
 
 
+MAX_IMPORT_WORKERS = 4
+SEARCH_CACHE_SIZE = 128
+_SEARCH_CACHE_LOCK = threading.Lock()
+_SEARCH_CACHE = OrderedDict()
+_SEARCH_CACHE_STATE = {"generation": 0, "hits": 0, "misses": 0}
+
+
+def bump_search_generation():
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE_STATE["generation"] += 1
+        _SEARCH_CACHE.clear()
+
+
+def search_cache_stats():
+    with _SEARCH_CACHE_LOCK:
+        return {
+            "cache_hits": _SEARCH_CACHE_STATE["hits"],
+            "cache_misses": _SEARCH_CACHE_STATE["misses"],
+            "cache_entries": len(_SEARCH_CACHE),
+        }
+
+
+def _cache_key(*, phrase, lemmas, prefixes, document_path, limit, after):
+    after_key = tuple(sorted((after or {}).items()))
+    return (
+        _SEARCH_CACHE_STATE["generation"],
+        bool(phrase),
+        tuple(lemmas),
+        tuple(prefixes),
+        document_path,
+        int(limit),
+        after_key,
+    )
+
+
+def _copy_search_payload(payload):
+    copied = dict(payload)
+    copied["results"] = [dict(item) for item in payload.get("results") or []]
+    return copied
+
+
+def _get_cached_search(key):
+    with _SEARCH_CACHE_LOCK:
+        payload = _SEARCH_CACHE.get(key)
+        if payload is None:
+            _SEARCH_CACHE_STATE["misses"] += 1
+            return None
+        _SEARCH_CACHE.move_to_end(key)
+        _SEARCH_CACHE_STATE["hits"] += 1
+        return _copy_search_payload(payload)
+
+
+def _store_cached_search(key, payload):
+    with _SEARCH_CACHE_LOCK:
+        if key[0] != _SEARCH_CACHE_STATE["generation"]:
+            return
+        _SEARCH_CACHE[key] = _copy_search_payload(payload)
+        _SEARCH_CACHE.move_to_end(key)
+        while len(_SEARCH_CACHE) > SEARCH_CACHE_SIZE:
+            _SEARCH_CACHE.popitem(last=False)
+
+
 def _file_hash(path):
     sha1 = hashlib.sha1()
     with open(path, "rb") as fp:
@@ -36,107 +113,221 @@ def _file_hash(path):
             sha1.update(chunk)
     return sha1.hexdigest()
 
-def import_corpus_files(paths):
+def _analyze_document(path, batch_size=PIPE_BATCH_SIZE, n_process=1):
+    raw_blocks = _iter_file_blocks(path)
+    structured_blocks = _parse_structured_blocks(raw_blocks)
+    blocks = []
+    for block in structured_blocks:
+        chunk_text = _clean_line(block.get("text"))
+        if len(chunk_text) < 2:
+            continue
+        blocks.append((chunk_text, block))
+    analyzed = _analyze_texts([text for text, _block in blocks], batch_size=batch_size, n_process=n_process)
+    chunks = []
+    for (chunk_text, block), sentence_parts in zip(blocks, analyzed):
+        sentences = []
+        for sentence, lemmas, offsets in sentence_parts:
+            clean_sentence = _clean_line(sentence)
+            if len(clean_sentence) < 2:
+                continue
+            tokens = [(lemma, offset) for lemma, offset in zip(lemmas, offsets) if lemma]
+            sentences.append(
+                (
+                    clean_sentence,
+                    [lemma for lemma, _offset in tokens],
+                    [offset for _lemma, offset in tokens] if clean_sentence == sentence else None,
+                )
+            )
+        chunks.append(
+            {
+                "text": chunk_text,
+                "page_num": block.get("page_num"),
+                "test_label": block.get("test_label") or "",
+                "section_label": block.get("section_label") or "",
+                "part_label": block.get("part_label") or "",
+                "speaker_label": block.get("speaker_label") or "",
+                "question_label": block.get("question_label") or "",
+                "sentences": sentences,
+            }
+        )
+    return chunks
+
+
+def _write_document_rows(conn, document_id, path, chunks):
+    source_file = os.path.basename(path)
+    chunk_id = _next_row_id(conn, "chunks")
+    sentence_id = _next_row_id(conn, "sentences")
+    chunk_rows = []
+    sentence_rows = []
+    lemma_rows = []
+    sort_key = 0
+    for chunk in chunks:
+        labels = (
+            chunk["test_label"],
+            chunk["section_label"],
+            chunk["part_label"],
+            chunk["speaker_label"],
+            chunk["question_label"],
+        )
+        chunk_rows.append((chunk_id, document_id, chunk["text"], chunk["page_num"], *labels, sort_key))
+        for sentence_order, (sentence, lemmas, offsets) in enumerate(chunk["sentences"]):
+            sentence_rows.append(
+                (
+                    sentence_id,
+                    document_id,
+                    chunk_id,
+                    sentence,
+                    " ".join(lemmas),
+                    _encode_token_offsets(offsets) if offsets is not None and len(offsets) == len(lemmas) else None,
+                    source_file,
+                    chunk["page_num"],
+                    *labels,
+                    sentence_order,
+                    sort_key,
+                )
+            )
+            for lemma in sorted(set(lemmas)):
+                if lemma:
+                    lemma_rows.append((sentence_id, lemma))
+            sentence_id += 1
+            sort_key += 1
+        chunk_id += 1
+    _insert_document_rows(conn, chunk_rows, sentence_rows, lemma_rows)
+    return len(chunk_rows), len(sentence_rows)
+
+
+def _analyze_document_task(path, file_hash=None, batch_size=PIPE_BATCH_SIZE):
+    return file_hash or _file_hash(path), _analyze_document(path, batch_size=batch_size)
+
+
+def default_import_workers(path_count):
+    return max(1, min(int(path_count or 0), MAX_IMPORT_WORKERS, (os.cpu_count() or 2) - 1))
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return int(stat.st_size or 0), int(getattr(stat, "st_mtime_ns", int(stat.st_mtime * 1_000_000_000)))
+
+
+def _iter_analyzed_documents(jobs, batch_size, n_process, workers):
+    if workers <= 1 or len(jobs) <= 1:
+        for path, file_hash in jobs:
+            try:
+                file_hash = file_hash or _file_hash(path)
+                yield path, file_hash, _analyze_document(path, batch_size=batch_size, n_process=n_process), None
+            except Exception as e:
+                yield path, None, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_analyze_document_task, path, file_hash, batch_size): path for path, file_hash in jobs
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                file_hash, chunks = future.result()
+            except Exception as e:
+                yield path, None, None, e
+                continue
+            yield path, file_hash, chunks, None
+
+
+def _record_failed_import(conn, path, error):
+    try:
+        conn.rollback()
+        import_id = _create_import_record(conn, path, None)
+        _finish_import_record(conn, import_id, "failed", error_message=str(error))
+        conn.commit()
+    except Exception:
+        pass
+
+
+def import_corpus_files(
+    paths,
+    batch_size=PIPE_BATCH_SIZE,
+    n_process=1,
+    workers=1,
+    on_progress=None,
+    incremental=False,
+):
     ensure_schema()
-    conn = _get_connection()
     summary = {
         "files": 0,
+        "new": 0,
+        "updated": 0,
+        "skipped": 0,
         "chunks": 0,
         "sentences": 0,
         "errors": [],
         "nlp_mode": get_nlp_status(),
     }
+    valid_paths = []
+    for input_path in paths:
+        path = os.path.abspath(str(input_path or "").strip())
+        if path and os.path.exists(path) and path not in valid_paths:
+            valid_paths.append(path)
+    total = len(valid_paths)
+    done = 0
+
+    def _report(path):
+        if on_progress:
+            on_progress({"done": done, "total": total, "path": path})
+
+    conn = _get_connection()
+    _apply_import_pragmas(conn)
     try:
-        for input_path in paths:
-            path = os.path.abspath(str(input_path or "").strip())
-            if not path or not os.path.exists(path):
+        jobs = []
+        stamps = {}
+        existing_paths = set()
+        for path in valid_paths:
+            try:
+                stamps[path] = _file_stamp(path)
+                stored = _fetch_document_stamp(conn, path)
+                file_hash = None
+                if stored:
+                    existing_paths.add(path)
+                if stored and incremental:
+                    if (stored.get("file_size"), stored.get("file_mtime_ns")) == stamps[path]:
+                        summary["skipped"] += 1
+                        done += 1
+                        _report(path)
+                        continue
+                    file_hash = _file_hash(path)
+                    if file_hash == stored.get("file_hash"):
+                        _update_document_stamp(conn, stored["id"], file_hash, *stamps[path])
+                        conn.commit()
+                        summary["skipped"] += 1
+                        done += 1
+                        _report(path)
+                        continue
+                jobs.append((path, file_hash))
+            except Exception as e:
+                summary["errors"].append(f"{os.path.basename(path)}: {e}")
+                done += 1
+                _report(path)
+
+        analyzed = _iter_analyzed_documents(jobs, batch_size, n_process, max(1, int(workers or 1)))
+        for path, file_hash, chunks, error in analyzed:
+            done += 1
+            if error is not None:
+                summary["errors"].append(f"{os.path.basename(path)}: {error}")
+                _record_failed_import(conn, path, error)
+                _report(path)
                 continue
-            import_id = None
             try:
-                file_hash = _file_hash(path)
+                file_size, file_mtime_ns = stamps[path]
                 document_id = _replace_document(
                     conn,
                     path=path,
                     name=os.path.basename(path),
                     file_type=Path(path).suffix.lower().lstrip("."),
                     file_hash=file_hash,
+                    file_size=file_size,
+                    file_mtime_ns=file_mtime_ns,
                 )
                 import_id = _create_import_record(conn, path, document_id)
-                raw_blocks = _iter_file_blocks(path)
-                structured_blocks = _parse_structured_blocks(raw_blocks)
-                sort_key = 0
-                document_chunks = 0
-                document_sentences = 0
-                for block in structured_blocks:
-                    chunk_text = _clean_line(block.get("text"))
-                    if len(chunk_text) < 2:
-                        continue
-                    cur_chunk = conn.execute(
-                        """
-                        INSERT INTO chunks(
-                            document_id, chunk_text, page_num, test_label, section_label,
-                            part_label, speaker_label, question_label, sort_key
-                        ) VALUES(?,?,?,?,?,?,?,?,?)
-                        """,
-                        (
-                            document_id,
-                            chunk_text,
-                            block.get("page_num"),
-                            block.get("test_label") or "",
-                            block.get("section_label") or "",
-                            block.get("part_label") or "",
-                            block.get("speaker_label") or "",
-                            block.get("question_label") or "",
-                            sort_key,
-                        ),
-                    )
-                    chunk_id = int(cur_chunk.lastrowid)
-                    document_chunks += 1
-                    sentence_order = 0
-                    for sentence in _doc_sentences(chunk_text):
-                        clean_sentence = _clean_line(sentence)
-                        if len(clean_sentence) < 2:
-                            continue
-                        lemmas = _lemma_doc(clean_sentence)
-                        lemma_text = " ".join(lemmas)
-                        cur = conn.execute(
-                            """
-                            INSERT INTO sentences(
-                                document_id, chunk_id, sentence_text, lemma_text, source_file, page_num,
-                                test_label, section_label, part_label, speaker_label, question_label,
-                                sentence_order, sort_key
-                            ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
-                            """,
-                            (
-                                document_id,
-                                chunk_id,
-                                clean_sentence,
-                                lemma_text,
-                                os.path.basename(path),
-                                block.get("page_num"),
-                                block.get("test_label") or "",
-                                block.get("section_label") or "",
-                                block.get("part_label") or "",
-                                block.get("speaker_label") or "",
-                                block.get("question_label") or "",
-                                sentence_order,
-                                sort_key,
-                            ),
-                        )
-                        sentence_id = int(cur.lastrowid)
-                        for lemma in sorted(set(lemmas)):
-                            if not lemma:
-                                continue
-                            conn.execute(
-                                "INSERT OR IGNORE INTO sentence_lemmas(sentence_id, lemma) VALUES(?, ?)",
-                                (sentence_id, lemma),
-                            )
-                        sentence_order += 1
-                        sort_key += 1
-                        document_sentences += 1
-                        summary["sentences"] += 1
-                    summary["chunks"] += 1
-                summary["files"] += 1
+                document_chunks, document_sentences = _write_document_rows(conn, document_id, path, chunks)
                 _finish_import_record(
                     conn,
                     import_id,
@@ -144,21 +335,25 @@ def import_corpus_files(paths):
                     chunks_indexed=document_chunks,
                     sentences_indexed=document_sentences,
                 )
+                conn.commit()
+                summary["files"] += 1
+                summary["updated" if path in existing_paths else "new"] += 1
+                summary["chunks"] += document_chunks
+                summary["sentences"] += document_sentences
             except Exception as e:
                 summary["errors"].append(f"{os.path.basename(path)}: {e}")
-                try:
-                    if import_id:
-                        _finish_import_record(conn, import_id, "failed", error_message=str(e))
-                except Exception:
-                    pass
-        conn.commit()
+                _record_failed_import(conn, path, e)
+            _report(path)
         return summary
     finally:
         conn.close()
+        if summary["files"]:
+            bump_search_generation()
 
 
 def corpus_stats():
     stats = _fetch_stats()
+    stats.update(search_cache_stats())
     stats["nlp_mode"] = get_nlp_status()
     return stats
 
@@ -168,29 +363,117 @@ def list_documents(limit=200):
 
 
 def remove_document(document_path):
-    return _remove_document_by_path(document_path)
+    removed = _remove_document_by_path(document_path)
+    if removed:
+        bump_search_generation()
+    return removed
+
+
+def _fts_quote(term):
+    return '"' + str(term).replace('"', '""') + '"'
 
 
-def search_corpus(query, limit=50, document_path=None):
+def _parse_search_query(query):
+    phrase = len(query) >= 2 and query.startswith('"') and query.endswith('"')
+    body = _clean_line(query.strip('"')) if phrase else query
+    words = []
+    prefixes = []
+    for raw in body.split():
+        if not phrase and raw.endswith("*"):
+            prefix = re.sub(r"[^\w'-]", "", raw).lower()
+            if prefix:
+                prefixes.append(prefix)
+            continue
+        words.append(raw)
+    return phrase, body.replace("*", ""), _clean_line(" ".join(words)), prefixes
+
+
+def _build_fts_match(lemmas, prefixes, phrase):
+    if phrase:
+        return f"lemma_text : {_fts_quote(' '.join(lemmas))}"
+    terms = [f"lemma_text : {_fts_quote(lemma)}" for lemma in dict.fromkeys(lemmas)]
+    terms.extend(f"{{sentence_text lemma_text}} : {_fts_quote(prefix)} *" for prefix in dict.fromkeys(prefixes))
+    return " AND ".join(terms)
+
+
+def search_corpus(query, limit=50, document_path=None, after=None):
     ensure_schema()
     q = _clean_line(query)
     if not q:
-        return {"query": "", "lemmas": [], "results": [], "nlp_mode": get_nlp_status()}
+        return {"query": "", "lemmas": [], "results": [], "nlp_mode": get_nlp_status(), "next_cursor": None}
 
-    lemmas = [lemma for lemma in _lemma_doc(q) if lemma]
-    if not lemmas:
-        return {"query": q, "lemmas": [], "results": [], "nlp_mode": get_nlp_status()}
+    phrase, highlight_query, lemma_query, prefixes = _parse_search_query(q)
+    lemmas = [lemma for lemma in _lemma_doc(lemma_query) if lemma] if lemma_query else []
+    if not lemmas and not prefixes:
+        return {"query": q, "lemmas": [], "results": [], "nlp_mode": get_nlp_status(), "next_cursor": None}
 
-    search_result = _search_sentence_rows(lemmas, limit=limit, document_path=_clean_line(document_path))
+    doc_path = _clean_line(document_path)
+    cache_key = _cache_key(
+        phrase=phrase,
+        lemmas=lemmas,
+        prefixes=prefixes,
+        document_path=doc_path,
+        limit=limit,
+        after=after,
+    )
+    cached = _get_cached_search(cache_key)
+    if cached is not None:
+        cached["query"] = q
+        return cached
+
+    if (phrase or prefixes) and _fts_available():
+        search_mode = "phrase" if phrase else "prefix"
+        search_result = _search_sentence_fts_rows(
+            _build_fts_match(lemmas, prefixes, phrase),
+            limit=limit,
+            document_path=doc_path,
+            after=after,
+        )
+    else:
+        search_mode = "prefix" if prefixes else "lemma"
+        search_result = _search_sentence_rows(
+            lemmas,
+            limit=limit,
+            document_path=doc_path,
+            after=after,
+            prefixes=prefixes,
+        )
     results = []
     for item in search_result["rows"]:
-        item["match_type"] = "lemma"
-        item["highlight_ranges"] = _highlight_ranges(item.get("sentence_text") or "", q, lemmas)
+        item["match_type"] = search_mode
+        sentence_text = item.get("sentence_text") or ""
+        lemma_text = str(item.get("lemma_text") or "")
+        token_lemmas = lemma_text.split(" ") if lemma_text else []
+        token_offsets = _decode_token_offsets(item.pop("token_offsets", None))
+        if token_offsets is not None and len(token_offsets) == len(token_lemmas):
+            item["highlight_ranges"] = _highlight_ranges_from_tokens(
+                sentence_text,
+                highlight_query,
+                token_lemmas,
+                token_offsets,
+                lemmas,
+                prefixes=prefixes,
+            )
+        else:
+            item["highlight_ranges"] = _highlight_ranges(sentence_text, highlight_query, lemmas, prefixes=prefixes)
         results.append(item)
-    return {
+    payload = {
         "query": q,
-        "lemmas": lemmas,
+        "lemmas": lemmas + [f"{prefix}*" for prefix in prefixes],
         "results": results,
         "nlp_mode": get_nlp_status(),
+        "search_mode": search_mode,
         "document_path": search_result["document_path"],
+        "next_cursor": search_result["next_cursor"],
     }
+    _store_cached_search(cache_key, payload)
+    return payload
+
+
+def iter_search_pages(query, page_size=50, document_path=None, after=None):
+    while True:
+        page = search_corpus(query, limit=page_size, document_path=document_path, after=after)
+        yield page
+        after = page.get("next_cursor")
+        if not after:
+            return
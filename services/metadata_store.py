@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+
+METADATA_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "metadata.db"
+METADATA_KINDS = ("translation", "pos", "phonetics", "synonyms", "user_dictionary")
+_READ_CHUNK_SIZE = 500
+WRITE_BEHIND_DELAY_SECONDS = 2.0
+WRITE_BEHIND_MAX_PENDING = 256
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _table_name(kind):
+    if kind not in METADATA_KINDS:
+        raise ValueError(f"Unknown metadata kind: {kind}")
+    return f"meta_{kind}"
+
+
+def _read_json_dict(path):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class MetadataStore:
+    def __init__(
+        self,
+        db_path,
+        *,
+        flush_delay_seconds=WRITE_BEHIND_DELAY_SECONDS,
+        max_pending=WRITE_BEHIND_MAX_PENDING,
+    ):
+        self._db_path = str(db_path or "").strip()
+        self._lock = threading.RLock()
+        self._conn = None
+        self._flush_delay_seconds = max(0.0, float(flush_delay_seconds))
+        self._max_pending = max(1, int(max_pending))
+        self._pending = {}
+        self._pending_count = 0
+        self._pending_lock = threading.Lock()
+        self._flush_wakeup = threading.Event()
+        self._flush_scheduled = False
+
+    def _connection(self):
+        if self._conn is not None:
+            return self._conn
+        os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for kind in METADATA_KINDS:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {_table_name(kind)} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+            )
+        conn.execute("CREATE TABLE IF NOT EXISTS metadata_state (key TEXT PRIMARY KEY, value TEXT)")
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    def get_many(self, kind, keys):
+        table = _table_name(kind)
+        wanted = list(dict.fromkeys(key for key in keys or [] if key))
+        result = {}
+        if not wanted:
+            return result
+        with self._pending_lock:
+            staged = self._pending.get(kind) or {}
+            overlay = {key: staged[key] for key in wanted if key in staged}
+        wanted = [key for key in wanted if key not in overlay]
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(wanted), _READ_CHUNK_SIZE):
+                chunk = wanted[start : start + _READ_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f"SELECT key, value FROM {table} WHERE key IN ({placeholders})", chunk)
+                result.update(rows)
+        result.update((key, value) for key, value in overlay.items() if value is not None)
+        return result
+
+    def get(self, kind, key):
+        return self.get_many(kind, [key]).get(key)
+
+    def items(self, kind):
+        table = _table_name(kind)
+        with self._lock:
+            result = dict(self._connection().execute(f"SELECT key, value FROM {table}"))
+            with self._pending_lock:
+                staged = dict(self._pending.get(kind) or {})
+        for key, value in staged.items():
+            if value is None:
+                result.pop(key, None)
+            else:
+                result[key] = value
+        return result
+
+    def upsert_many(self, kind, pairs):
+        table = _table_name(kind)
+        rows = [(key, value) for key, value in dict(pairs or {}).items() if key]
+        if not rows:
+            return 0
+        with self._lock:
+            self._discard_pending(kind, [key for key, _value in rows])
+            conn = self._connection()
+            with conn:
+                cursor = conn.executemany(
+                    f"INSERT INTO {table}(key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value=excluded.value WHERE value != excluded.value",
+                    rows,
+                )
+        return max(0, int(cursor.rowcount or 0))
+
+    def delete_many(self, kind, keys):
+        table = _table_name(kind)
+        rows = [(key,) for key in dict.fromkeys(keys or []) if key]
+        if not rows:
+            return 0
+        with self._lock:
+            self._discard_pending(kind, [row[0] for row in rows])
+            conn = self._connection()
+            with conn:
+                cursor = conn.executemany(f"DELETE FROM {table} WHERE key = ?", rows)
+        return max(0, int(cursor.rowcount or 0))
+
+    def replace_all(self, kind, pairs):
+        table = _table_name(kind)
+        with self._lock:
+            self._discard_pending(kind, None)
+            conn = self._connection()
+            with conn:
+                conn.execute(f"DELETE FROM {table}")
+                conn.executemany(
+                    f"INSERT INTO {table}(key, value) VALUES (?, ?)",
+                    [(key, value) for key, value in dict(pairs or {}).items() if key],
+                )
+
+    def _discard_pending(self, kind, keys):
+        with self._pending_lock:
+            staged = self._pending.get(kind)
+            if not staged:
+                return
+            if keys is None:
+                self._pending_count -= len(staged)
+                self._pending.pop(kind, None)
+                return
+            for key in keys:
+                if key in staged:
+                    staged.pop(key)
+                    self._pending_count -= 1
+
+    def stage_many(self, kind, upserts=None, deletes=None):
+        _table_name(kind)
+        changes = {key: value for key, value in dict(upserts or {}).items() if key}
+        changes.update((key, None) for key in deletes or [] if key)
+        if not changes:
+            return 0
+        with self._pending_lock:
+            staged = self._pending.setdefault(kind, {})
+            before = len(staged)
+            staged.update(changes)
+            self._pending_count += len(staged) - before
+            if self._pending_count >= self._max_pending:
+                self._flush_wakeup.set()
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                threading.Thread(target=self._flush_later, daemon=True).start()
+        return len(changes)
+
+    def _flush_later(self):
+        self._flush_wakeup.wait(self._flush_delay_seconds)
+        with self._pending_lock:
+            self._flush_wakeup.clear()
+            self._flush_scheduled = False
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def pending_count(self):
+        with self._pending_lock:
+            return self._pending_count
+
+    def flush(self):
+        with self._lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                self._pending_count = 0
+            if not pending:
+                return 0
+            try:
+                conn = self._connection()
+                with conn:
+                    for kind, staged in pending.items():
+                        table = _table_name(kind)
+                        conn.executemany(
+                            f"INSERT INTO {table}(key, value) VALUES (?, ?) "
+                            "ON CONFLICT(key) DO UPDATE SET value=excluded.value WHERE value != excluded.value",
+                            [(key, value) for key, value in staged.items() if value is not None],
+                        )
+                        conn.executemany(
+                            f"DELETE FROM {table} WHERE key = ?",
+                            [(key,) for key, value in staged.items() if value is None],
+                        )
+            except Exception:
+                with self._pending_lock:
+                    for kind, staged in pending.items():
+                        current = self._pending.setdefault(kind, {})
+                        for key, value in staged.items():
+                            if key not in current:
+                                current[key] = value
+                                self._pending_count += 1
+                raise
+        return sum(len(staged) for staged in pending.values())
+
+    def import_json_once(self, kind, legacy_path, normalize_payload):
+        state_key = f"imported:{kind}"
+        with self._lock:
+            conn = self._connection()
+            if conn.execute("SELECT 1 FROM metadata_state WHERE key = ?", (state_key,)).fetchone():
+                return 0
+            pairs = normalize_payload(_read_json_dict(legacy_path)) if legacy_path else {}
+            table = _table_name(kind)
+            with conn:
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {table}(key, value) VALUES (?, ?)",
+                    [(key, value) for key, value in dict(pairs or {}).items() if key],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO metadata_state(key, value) VALUES (?, ?)",
+                    (state_key, str(legacy_path or "")),
+                )
+        return len(pairs or {})
+
+
+def get_metadata_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MetadataStore(METADATA_DB_PATH)
+        return _store
+
+
+def flush_metadata_store():
+    with _store_lock:
+        store = _store
+    if store is None:
+        return 0
+    return store.flush()
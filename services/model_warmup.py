@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.app_config import get_model_warmup_order
+from services.runtime_log import log_info, log_warning
+
+
+MODEL_WARMUP_MAX_WORKERS = 1
+STATE_PENDING = "pending"
+STATE_LOADING = "loading"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+STATE_SKIPPED = "skipped"
+
+_lock = threading.Lock()
+_readiness = {}
+_started = False
+
+
+def _warm_nlp():
+    from services.corpus_ingest import get_nlp
+
+    get_nlp()
+    return True
+
+
+def _warm_translation():
+    from services.translation import _ensure_translation
+
+    _ensure_translation()
+    return True
+
+
+def _warm_wordnet():
+    from services.synonyms import _ensure_wordnet_ready
+
+    _ensure_wordnet_ready()
+    return True
+
+
+def _warm_kokoro():
+    from services.tts import warm_up_local_model
+
+    return warm_up_local_model("kokoro")
+
+
+def _warm_piper():
+    from services.tts import warm_up_local_model
+
+    return warm_up_local_model("piper")
+
+
+_LOADERS = {
+    "nlp": _warm_nlp,
+    "translation": _warm_translation,
+    "wordnet": _warm_wordnet,
+    "kokoro": _warm_kokoro,
+    "piper": _warm_piper,
+}
+
+
+_LOADED_PROBES = {
+    "nlp": ("services.corpus_ingest", lambda module: module._NLP is not None),
+    "translation": ("services.translation", lambda module: module._translation is not None),
+    "wordnet": ("services.synonyms", lambda module: bool(module._wordnet_ready)),
+    "kokoro": ("services.tts", lambda module: module._runtime_state.kokoro is not None),
+    "piper": ("services.tts", lambda module: bool(module._piper_voices)),
+}
+
+
+def _is_loaded(name):
+    module_name, probe = _LOADED_PROBES.get(name) or ("", None)
+    module = sys.modules.get(module_name) if module_name else None
+    if module is None:
+        return False
+    try:
+        return bool(probe(module))
+    except Exception:
+        return False
+
+
+def _lower_thread_priority():
+    if sys.platform != "win32":
+        return
+    try:
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), -1)
+    except Exception:
+        pass
+
+
+def _set_state(name, state, **details):
+    with _lock:
+        entry = dict(_readiness.get(name) or {})
+        entry.update(details)
+        entry["state"] = state
+        _readiness[name] = entry
+
+
+def _warm_one(name):
+    _lower_thread_priority()
+    _set_state(name, STATE_LOADING)
+    started = time.perf_counter()
+    try:
+        loaded = _LOADERS[name]()
+    except Exception as exc:
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        _set_state(name, STATE_FAILED, elapsed_ms=elapsed_ms, error=str(exc))
+        log_warning("model_warmup_failed", model=name, elapsed_ms=elapsed_ms, error=exc)
+        return
+    elapsed_ms = int((time.perf_counter() - started) * 1000)
+    if not loaded:
+        _set_state(name, STATE_SKIPPED, elapsed_ms=elapsed_ms)
+        log_info("model_warmup_skipped", model=name)
+        return
+    _set_state(name, STATE_READY, elapsed_ms=elapsed_ms, error="")
+    log_info("model_warmup_ready", model=name, elapsed_ms=elapsed_ms)
+
+
+def get_model_readiness(name=None):
+    with _lock:
+        snapshot = {key: dict(value) for key, value in _readiness.items()}
+    names = [name] if name is not None else list(dict.fromkeys([*snapshot, *_LOADERS]))
+    result = {}
+    for key in names:
+        entry = snapshot.get(key) or {"state": STATE_PENDING}
+        if entry.get("state") != STATE_READY and _is_loaded(key):
+            entry.update(state=STATE_READY, error="")
+        result[key] = entry
+    return result[name] if name is not None else result
+
+
+def is_model_ready(name):
+    return get_model_readiness(name).get("state") == STATE_READY
+
+
+def start_model_warmup(order=None, *, max_workers=MODEL_WARMUP_MAX_WORKERS):
+    global _started
+    names = [name for name in (order if order is not None else get_model_warmup_order()) if name in _LOADERS]
+    with _lock:
+        if _started:
+            return False
+        _started = True
+        for name in names:
+            _readiness.setdefault(name, {"state": STATE_PENDING})
+
+    if "translation" not in names:
+        from services.translation import prepare_async as translation_prepare_async
+
+        translation_prepare_async()
+
+    def _run():
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="model-warmup") as pool:
+            for name in names:
+                pool.submit(_warm_one, name)
+        log_info(
+            "model_warmup_done",
+            models=",".join(names),
+            total_ms=int((time.perf_counter() - started) * 1000),
+        )
+
+    threading.Thread(target=_run, daemon=True).start()
+    return True
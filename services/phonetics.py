@@ -7,7 +7,7 @@ import urllib.request
 from pathlib import Path
 
 from services.app_config import get_generation_model, get_llm_api_key
-from services.metadata_repository import JsonMetadataRepository
+from services.metadata_repository import SqliteMetadataRepository
 
 
 _CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "phonetics_cache.json"
@@ -78,8 +78,9 @@ def _save_cache_locked():
 def _get_repo():
     global _repo
     if _repo is None:
-        _repo = JsonMetadataRepository(
-            _CACHE_PATH,
+        _repo = SqliteMetadataRepository(
+            "phonetics",
+            legacy_path=_CACHE_PATH,
             key_normalizer=_normalize_key,
             value_normalizer=_normalize_phonetic,
         )
@@ -107,6 +108,10 @@ def apply_cached_phonetics(pairs):
     return _get_repo().apply_many(pairs)
 
 
+def export_cached_phonetics():
+    return _get_repo().export_payload()
+
+
 def _request_gemini_phonetic_map(words, timeout=35):
     api_key = str(get_llm_api_key() or "").strip()
     if not api_key:
@@ -8,12 +8,14 @@ import nltk
 from services.app_config import get_generation_model, get_llm_api_key
 from services.corpus_search import get_nlp
 from services.gemini_writer import DEFAULT_GEMINI_MODEL, _request_gemini
+from services.metadata_store import get_metadata_store
 
 
 _CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "synonyms_cache.json"
 _NLTK_DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "nltk_data"
+_KIND = "synonyms"
 _lock = threading.Lock()
-_cache_data = None
+_store = None
 _wordnet_ready = False
 
 
@@ -21,26 +23,32 @@ def _normalize_key(text):
     return str(text or "").strip().casefold()
 
 
-def _load_cache_locked():
-    global _cache_data
-    if _cache_data is not None:
-        return _cache_data
-    if not _CACHE_PATH.exists():
-        _cache_data = {}
-        return _cache_data
-    try:
-        with open(_CACHE_PATH, "r", encoding="utf-8") as fp:
-            data = json.load(fp)
-        _cache_data = data if isinstance(data, dict) else {}
-    except Exception:
-        _cache_data = {}
-    return _cache_data
+def _normalize_legacy_cache(data):
+    rows = {}
+    for raw_key, value in dict(data or {}).items():
+        key = _normalize_key(raw_key)
+        if key and isinstance(value, (dict, list)):
+            rows[key] = json.dumps(value, ensure_ascii=False)
+    return rows
+
+
+def _get_store_locked():
+    global _store
+    if _store is None:
+        store = get_metadata_store()
+        store.import_json_once(_KIND, _CACHE_PATH, _normalize_legacy_cache)
+        _store = store
+    return _store
 
 
-def _save_cache_locked():
-    _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(_CACHE_PATH, "w", encoding="utf-8") as fp:
-        json.dump(_cache_data or {}, fp, ensure_ascii=False, indent=2)
+def _load_cached_value_locked(key):
+    raw = _get_store_locked().get(_KIND, key)
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except Exception:
+        return None
 
 
 def _ensure_wordnet_ready():
@@ -78,8 +86,7 @@ def get_cached_synonym_result(word):
     if not key:
         return None
     with _lock:
-        cache = _load_cache_locked()
-        values = cache.get(key)
+        values = _load_cached_value_locked(key)
         if isinstance(values, dict):
             payload = dict(values)
             payload["synonyms"] = list(payload.get("synonyms") or [])
@@ -117,9 +124,7 @@ def _set_cached_synonym_result(word, result):
         if str(item or "").strip()
     ]
     with _lock:
-        cache = _load_cache_locked()
-        cache[key] = payload
-        _save_cache_locked()
+        _get_store_locked().stage_many(_KIND, upserts={key: json.dumps(payload, ensure_ascii=False)})
 
 
 def _pick_focus_token(doc):
@@ -6,9 +6,10 @@ import threading
 import urllib.error
 import urllib.request
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from services.metadata_repository import JsonMetadataRepository
+from services.metadata_repository import SqliteMetadataRepository
 from services.app_config import get_generation_model, get_llm_api_key
 from services.user_dictionary import get_entries as get_user_dictionary_entries, set_entry as set_user_dictionary_entry
 
@@ -20,6 +21,9 @@ _CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "translation_cac
 _cache_data = None
 _RUNTIME_PATHS_READY = False
 _GEMINI_TRANSLATION_URL = "https://generativelanguage.googleapis.com/v1beta/openai/chat/completions"
+ARGOS_BATCH_SIZE = 32
+GEMINI_FALLBACK_BATCH_SIZE = 60
+GEMINI_FALLBACK_MAX_WORKERS = 2
 
 _DUPLICATE_BRACKET_PATTERNS = [
     ("(", ")"),
@@ -182,8 +186,9 @@ def _normalize_translation_text(text):
 def _get_repo():
     global _repo
     if _repo is None:
-        _repo = JsonMetadataRepository(
-            _CACHE_PATH,
+        _repo = SqliteMetadataRepository(
+            "translation",
+            legacy_path=_CACHE_PATH,
             key_normalizer=_normalize_cache_key,
             value_normalizer=_normalize_translation_text,
         )
@@ -327,6 +332,10 @@ def apply_cached_translations(pairs):
     return _get_repo().apply_many(pairs)
 
 
+def export_cached_translations():
+    return _get_repo().export_payload()
+
+
 def set_cached_translation(word, zh_text):
     key = _normalize_cache_key(word)
     if not key:
@@ -360,6 +369,59 @@ def translate_text(text):
     return _normalize_translation_text(translation.translate(str(text)))
 
 
+def _translate_each(translation, texts):
+    result = []
+    for text in texts:
+        try:
+            result.append(translation.translate(str(text)))
+        except Exception:
+            result.append("")
+    return result
+
+
+def _decode_argos_tokens(pkg, tokens):
+    value = pkg.tokenizer.decode(tokens)
+    prefix = str(getattr(pkg, "target_prefix", "") or "")
+    if prefix and value.startswith(prefix):
+        value = value[len(prefix) :]
+    return value[1:] if value.startswith(" ") else value
+
+
+def translate_batch(texts):
+    items = [str(text) for text in texts or []]
+    if not items:
+        return []
+    translation = _ensure_translation()
+    package_translation = getattr(translation, "underlying", translation)
+    pkg = getattr(package_translation, "pkg", None)
+    if pkg is None or getattr(pkg, "tokenizer", None) is None or not hasattr(package_translation, "translator"):
+        return [_normalize_translation_text(value) for value in _translate_each(translation, items)]
+    translated = []
+    if package_translation.translator is None:
+        translated.extend(_translate_each(translation, items[:1]))
+    remaining = items[len(translated) :]
+    translator = package_translation.translator
+    if remaining and translator is not None:
+        try:
+            prefix = str(getattr(pkg, "target_prefix", "") or "")
+            tokenized = [pkg.tokenizer.encode(text) for text in remaining]
+            batches = translator.translate_batch(
+                tokenized,
+                target_prefix=[[prefix]] * len(tokenized) if prefix else None,
+                replace_unknowns=True,
+                max_batch_size=ARGOS_BATCH_SIZE,
+                beam_size=4,
+                num_hypotheses=1,
+                length_penalty=0.2,
+            )
+            translated.extend(_decode_argos_tokens(pkg, batch.hypotheses[0]) for batch in batches)
+        except Exception:
+            translated.extend(_translate_each(translation, remaining))
+    elif remaining:
+        translated.extend(_translate_each(translation, remaining))
+    return [_normalize_translation_text(value) for value in translated]
+
+
 def translate_words(words):
     result = get_cached_translations(words)
     missing = []
@@ -375,29 +437,41 @@ def translate_words(words):
 
     new_pairs = {}
     still_missing = []
-    for w in missing:
-        try:
-            translated = translate_text(w)
-        except Exception:
-            translated = ""
-        translated = _normalize_translation_text(translated)
-        result[w] = translated
-        if translated:
-            new_pairs[w] = translated
-        else:
-            still_missing.append(w)
-
-    if still_missing:
-        try:
-            gemini_pairs = _request_gemini_translation_map(still_missing)
-        except Exception:
-            gemini_pairs = {}
-        for w in still_missing:
-            translated = _normalize_translation_text(gemini_pairs.get(w) or "")
-            if not translated:
-                continue
-            result[w] = translated
-            new_pairs[w] = translated
+    fallback_jobs = []
+    with ThreadPoolExecutor(max_workers=GEMINI_FALLBACK_MAX_WORKERS, thread_name_prefix="translation-fallback") as pool:
+
+        def _submit_fallback(flush=False):
+            while len(still_missing) >= GEMINI_FALLBACK_BATCH_SIZE or (flush and still_missing):
+                batch = still_missing[:GEMINI_FALLBACK_BATCH_SIZE]
+                del still_missing[:GEMINI_FALLBACK_BATCH_SIZE]
+                fallback_jobs.append((batch, pool.submit(_request_gemini_translation_map, batch)))
+
+        for start in range(0, len(missing), ARGOS_BATCH_SIZE):
+            chunk = missing[start : start + ARGOS_BATCH_SIZE]
+            try:
+                translated_chunk = translate_batch(chunk)
+            except Exception:
+                translated_chunk = [""] * len(chunk)
+            for w, translated in zip(chunk, translated_chunk):
+                result[w] = translated
+                if translated:
+                    new_pairs[w] = translated
+                else:
+                    still_missing.append(w)
+            _submit_fallback()
+        _submit_fallback(flush=True)
+
+        for batch, future in fallback_jobs:
+            try:
+                gemini_pairs = future.result()
+            except Exception:
+                gemini_pairs = {}
+            for w in batch:
+                translated = _normalize_translation_text(gemini_pairs.get(w) or "")
+                if not translated:
+                    continue
+                result[w] = translated
+                new_pairs[w] = translated
     if new_pairs:
         _update_translation_cache(new_pairs)
     return result
@@ -2,6 +2,7 @@
 import hashlib
 import json
 import os
+import queue
 import re
 import shutil
 import tempfile
@@ -12,7 +13,7 @@ import winsound
 
 import numpy as np
 
-from services.app_config import get_llm_api_key, get_tts_api_key, get_tts_api_provider
+from services.app_config import get_audio_cache_format, get_llm_api_key, get_tts_api_key, get_tts_api_provider
 from services.runtime_log import log_error as _log_error, log_info as _log_info, log_warning as _log_warning
 from services.shared_metadata import export_shared_metadata_payload, import_shared_metadata_payload
 from services.tts_backend_strategy import (
@@ -33,21 +34,28 @@ from services.tts_backend_strategy import (
 )
 from services.text_normalization import normalize_ielts_tts_text
 from services.tts_audio import (
+    DecodedAudioLru,
     cleanup_temp_wavs as _cleanup_temp_wavs,
-    prepend_silence_to_wav as _prepend_silence_to_wav,
+    clip_to_wav_bytes as _clip_to_wav_bytes,
+    compressed_audio_supported as _compressed_audio_supported,
+    decode_audio_to_wav as _decode_audio_to_wav,
+    encode_wav_to_compressed as _encode_wav_to_compressed,
+    is_compressed_audio as _is_compressed_audio,
+    read_audio_clip as _read_audio_clip,
     wav_duration_seconds as _wav_duration_seconds,
 )
 from services.tts_persistence import (
+    PendingQueueJournal,
+    AudioBlobStore,
     CacheMetadataStore,
     cache_meta_path as _cache_meta_path_for_file,
     load_json_file as _load_json_file,
-    load_pending_queue_disk_payload as _load_pending_queue_disk_payload_from_disk,
     load_word_audio_overrides as _load_word_audio_overrides_from_disk,
     migrate_pending_queue_path as _migrate_pending_queue_path_on_disk,
     save_word_audio_overrides as _save_word_audio_overrides_to_disk,
     write_json_file as _write_json_file_to_disk,
 )
-from services.tts_queue import OnlineTtsQueueManager
+from services.tts_queue import OnlineTtsQueueManager, PendingOnlineQueue
 from services.tts_shared_cache import (
     export_shared_audio_cache_package as _export_shared_audio_cache_package_impl,
     import_shared_audio_cache_package as _import_shared_audio_cache_package_impl,
@@ -70,6 +78,11 @@ from services.tts_cache_maintenance import (
     normalize_cache_metadata_texts as _normalize_cache_metadata_texts_impl,
 )
 from services.tts_pending_worker import run_pending_online_worker as _run_pending_online_worker
+from services.tts_precache import (
+    LOCAL_PRECACHE_BACKENDS,
+    local_precache_worker_count as _local_precache_worker_count,
+    run_local_precache as _run_local_precache,
+)
 from services.tts_runtime import TtsRuntimeConfig, TtsRuntimeState
 from services.tts_synth_cache import resolve_short_text_cache as _resolve_short_text_cache
 from services.tts_synth_execute import (
@@ -93,20 +106,30 @@ GLOBAL_WORD_CACHE_DIR = AUDIO_CACHE_ROOT_DIR
 SHARED_WORD_CACHE_DIR = os.path.join(AUDIO_CACHE_ROOT_DIR, "global")
 SOURCE_WORD_CACHE_ROOT_DIR = os.path.join(AUDIO_CACHE_ROOT_DIR, "sources")
 PENDING_ONLINE_TTS_QUEUE_PATH = os.path.join(BASE_DIR, "data", "audio_cache", "pending_online_tts_replacements.json")
+PENDING_ONLINE_TTS_JOURNAL_PATH = os.path.join(BASE_DIR, "data", "audio_cache", "pending_online_tts_replacements.journal")
 LEGACY_PENDING_GEMINI_QUEUE_PATH = os.path.join(BASE_DIR, "data", "audio_cache", "pending_gemini_replacements.json")
 WORD_AUDIO_OVERRIDE_PATH = os.path.join(BASE_DIR, "data", "word_audio_overrides.json")
+CACHE_METADATA_DB_PATH = os.path.join(AUDIO_CACHE_ROOT_DIR, "cache_metadata.db")
+AUDIO_BLOB_DIR = os.path.join(AUDIO_CACHE_ROOT_DIR, "blobs")
+AUDIO_BLOB_MIGRATION_KEY = "audio_blobs_migrated"
 RECENT_WRONG_SOURCE_KEY = "__recent_wrong_words__"
 MANUAL_SESSION_SOURCE_KEY = "__manual_session__"
 KOKORO_SAMPLE_RATE = 24000
-SHARED_CACHE_PACKAGE_VERSION = 2
+SHARED_CACHE_PACKAGE_VERSION = 3
 SHARED_CACHE_PACKAGE_MANIFEST = "manifest.json"
 SHARED_CACHE_METADATA_FILE = "global/metadata.json"
 
 _runtime_config = TtsRuntimeConfig()
 _runtime_state = TtsRuntimeState()
+_runtime_state.pending_gemini_replacements = PendingOnlineQueue(
+    entry_key=lambda item: _pending_entry_key(item),
+    source_key=lambda item: _normalize_source_path((item or {}).get("source_path")),
+    provider_key=lambda item: _pending_item_provider(item),
+)
 _lock = _runtime_state.lock
 _shown_errors = _runtime_state.shown_errors
 _kokoro_lock = _runtime_state.kokoro_lock
+_kokoro_phonemize_lock = threading.Lock()
 _piper_voices = _runtime_state.piper_voices
 _piper_lock = _runtime_state.piper_lock
 _backend_lock = _runtime_state.backend_lock
@@ -136,6 +159,10 @@ GEMINI_MANUAL_REQUEST_COOLDOWN_SECONDS = _runtime_config.gemini_manual_request_c
 ELEVENLABS_QUEUE_REQUEST_INTERVAL_SECONDS = _runtime_config.elevenlabs_queue_request_interval_seconds
 ELEVENLABS_RATE_LIMIT_COOLDOWN_SECONDS = _runtime_config.elevenlabs_rate_limit_cooldown_seconds
 ELEVENLABS_MANUAL_REQUEST_COOLDOWN_SECONDS = _runtime_config.elevenlabs_manual_request_cooldown_seconds
+DECODED_AUDIO_CACHE_MAX_BYTES = _runtime_config.decoded_audio_cache_max_bytes
+LOCAL_PRECACHE_MAX_WORKERS = _runtime_config.local_precache_max_workers
+KOKORO_BATCH_SIZE = _runtime_config.kokoro_batch_size
+STREAM_LOOKAHEAD_CHUNKS = _runtime_config.stream_lookahead_chunks
 _QUEUE_THROTTLE_CONFIG = {
     "gemini": {
         "base_interval": GEMINI_QUEUE_REQUEST_INTERVAL_SECONDS,
@@ -145,6 +172,9 @@ _QUEUE_THROTTLE_CONFIG = {
         "success_streak": 2,
         "soft_fail_step": 8.0,
         "rate_limit_step": 12.0,
+        "burst": 1,
+        "base_concurrency": 1,
+        "max_concurrency": 2,
     },
     "elevenlabs": {
         "base_interval": ELEVENLABS_QUEUE_REQUEST_INTERVAL_SECONDS,
@@ -154,6 +184,9 @@ _QUEUE_THROTTLE_CONFIG = {
         "success_streak": 3,
         "soft_fail_step": 0.75,
         "rate_limit_step": 1.25,
+        "burst": 3,
+        "base_concurrency": 2,
+        "max_concurrency": 4,
     },
 }
 _runtime_state.online_queue_manager = OnlineTtsQueueManager(throttle_config=_QUEUE_THROTTLE_CONFIG)
@@ -199,12 +232,6 @@ def _refresh_gemini_queue_status_counts():
     with _pending_gemini_lock:
         queue_count = len(_pending_gemini_replacements)
         worker_running = bool(_runtime_state.pending_gemini_worker_running)
-    try:
-        disk_payload = _load_pending_queue_disk_payload()
-        if isinstance(disk_payload, list):
-            queue_count = len(disk_payload)
-    except Exception as exc:
-        _log_warning("tts_queue_status_disk_payload_failed", error=exc)
     _runtime_state.online_queue_manager.refresh_counts(queue_count=queue_count, worker_running=worker_running)
 
 
@@ -221,8 +248,12 @@ def _defer_gemini_queue(wait_seconds, *, state=None, provider=None):
     _runtime_state.online_queue_manager.defer(wait_seconds, state=state, provider=provider)
 
 
-def _wait_for_gemini_queue_slot(provider=None):
-    _runtime_state.online_queue_manager.wait_for_slot(provider=provider)
+def _try_acquire_gemini_queue_slot(provider=None):
+    return _runtime_state.online_queue_manager.try_acquire_slot(provider=provider)
+
+
+def _release_gemini_queue_slot(provider=None):
+    _runtime_state.online_queue_manager.release_slot(provider=provider)
 
 
 def _synthesize_with_user_online(text, volume, *, short_text, timeout_seconds=ONLINE_TTS_REQUEST_TIMEOUT_SECONDS):
@@ -553,7 +584,7 @@ def clear_word_backend_override(text, source_path=None):
     if backend in {"piper", "kokoro"}:
         playable_path = _resolve_cache_audio_path(cache_path)
         for path in {str(cache_path or "").strip(), str(playable_path or "").strip(), _cache_meta_path(cache_path)}:
-            if not path:
+            if not path or _get_audio_blob_store().owns(path):
                 continue
             try:
                 if os.path.exists(path):
@@ -651,37 +682,32 @@ def _sha1_file(path):
 def _shared_cache_export_entries():
     entries = []
     seen_targets = set()
-    if not os.path.isdir(SHARED_WORD_CACHE_DIR):
-        return entries
-    for root, _, names in os.walk(SHARED_WORD_CACHE_DIR):
-        for name in sorted(names):
-            if not name.lower().endswith(".wav"):
-                continue
-            cache_path = os.path.join(root, name)
-            rel_path = _safe_rel_path(os.path.relpath(cache_path, SHARED_WORD_CACHE_DIR))
-            if not rel_path:
-                continue
-            metadata = _load_cache_metadata(cache_path)
-            playable_path = _resolve_cache_audio_path(cache_path)
-            if not playable_path or not os.path.exists(playable_path):
-                continue
-            payload = dict(metadata or {})
-            payload["source_path"] = "shared"
-            target_path = _shared_cache_target_path(relative_path=rel_path, metadata=payload) or cache_path
-            target_key = os.path.abspath(target_path)
-            if target_key in seen_targets:
-                continue
-            seen_targets.add(target_key)
-            relative_path = _safe_rel_path(os.path.relpath(target_path, SHARED_WORD_CACHE_DIR)) or rel_path
-            entries.append(
-                {
-                    "cache_path": target_path,
-                    "audio_path": playable_path,
-                    "relative_path": relative_path,
-                    "meta_relative_path": f"{relative_path}.json",
-                    "metadata": payload,
-                }
-            )
+    for cache_path, metadata in _iter_cache_metadata("shared"):
+        rel_path = _safe_rel_path(os.path.relpath(cache_path, SHARED_WORD_CACHE_DIR))
+        if not rel_path:
+            continue
+        playable_path = _resolve_cache_audio_path(cache_path)
+        if not playable_path or not os.path.exists(playable_path):
+            continue
+        payload = dict(metadata or {})
+        payload["source_path"] = "shared"
+        blob_sha1 = str(payload.pop("blob_sha1", None) or "").strip().lower()
+        target_path = _shared_cache_target_path(relative_path=rel_path, metadata=payload) or cache_path
+        target_key = os.path.abspath(target_path)
+        if target_key in seen_targets:
+            continue
+        seen_targets.add(target_key)
+        relative_path = _safe_rel_path(os.path.relpath(target_path, SHARED_WORD_CACHE_DIR)) or rel_path
+        entries.append(
+            {
+                "cache_path": target_path,
+                "audio_path": playable_path,
+                "relative_path": relative_path,
+                "meta_relative_path": f"{relative_path}.json",
+                "metadata": payload,
+                "audio_sha1": blob_sha1,
+            }
+        )
     return entries
 
 
@@ -730,8 +756,7 @@ def _migrate_legacy_word_wrapper_layout():
 
 def _collapse_existing_lightweight_source_caches():
     _collapse_existing_lightweight_source_caches_impl(
-        source_word_cache_root_dir=SOURCE_WORD_CACHE_ROOT_DIR,
-        load_json_file=_load_json_file,
+        iter_cache_metadata=_iter_cache_metadata,
         normalize_source_path=_normalize_source_path,
         infer_text_from_cache_filename=_infer_text_from_cache_filename,
         current_online_provider=_current_online_provider,
@@ -742,8 +767,7 @@ def _collapse_existing_lightweight_source_caches():
 
 def _collapse_all_source_cache_entities_to_aliases():
     return _collapse_all_source_cache_entities_to_aliases_impl(
-        source_word_cache_root_dir=SOURCE_WORD_CACHE_ROOT_DIR,
-        load_cache_metadata=_load_cache_metadata,
+        iter_cache_metadata=_iter_cache_metadata,
         normalize_source_path=_normalize_source_path,
         infer_text_from_cache_filename=_infer_text_from_cache_filename,
         current_online_provider=_current_online_provider,
@@ -764,8 +788,8 @@ def _infer_text_from_cache_filename(cache_path, metadata=None):
 def _cleanup_duplicate_source_cache_entries():
     return _cleanup_duplicate_source_cache_entries_impl(
         source_word_cache_root_dir=SOURCE_WORD_CACHE_ROOT_DIR,
-        shared_word_cache_dir=SHARED_WORD_CACHE_DIR,
-        load_cache_metadata=_load_cache_metadata,
+        iter_cache_metadata=_iter_cache_metadata,
+        find_linked_cache_metadata=_find_linked_cache_metadata,
         normalize_text=_normalize_text,
         normalize_source_path=_normalize_source_path,
         is_pending_gemini=_is_pending_gemini,
@@ -782,9 +806,7 @@ def _cleanup_duplicate_source_cache_entries():
 
 def _normalize_cache_metadata_texts():
     return _normalize_cache_metadata_texts_impl(
-        shared_word_cache_dir=SHARED_WORD_CACHE_DIR,
-        source_word_cache_root_dir=SOURCE_WORD_CACHE_ROOT_DIR,
-        load_cache_metadata=_load_cache_metadata,
+        iter_cache_metadata=_iter_cache_metadata,
         save_cache_metadata=_save_cache_metadata,
         normalize_text=_normalize_text,
     )
@@ -794,11 +816,14 @@ def _write_json_file(path, payload):
     _write_json_file_to_disk(path, payload)
 
 
-def _load_pending_queue_disk_payload():
-    return _load_pending_queue_disk_payload_from_disk(
-        PENDING_ONLINE_TTS_QUEUE_PATH,
-        LEGACY_PENDING_GEMINI_QUEUE_PATH,
-    )
+def _get_pending_queue_journal():
+    if _runtime_state.pending_queue_journal is None:
+        _runtime_state.pending_queue_journal = PendingQueueJournal(
+            PENDING_ONLINE_TTS_QUEUE_PATH,
+            PENDING_ONLINE_TTS_JOURNAL_PATH,
+            legacy_path=LEGACY_PENDING_GEMINI_QUEUE_PATH,
+        )
+    return _runtime_state.pending_queue_journal
 
 
 def _migrate_pending_queue_path():
@@ -813,10 +838,98 @@ def _get_cache_metadata_store():
         _runtime_state.cache_metadata_store = CacheMetadataStore(
             canonicalize=_canonicalize_cache_path,
             normalize_source_path=_normalize_source_path,
+            db_path=CACHE_METADATA_DB_PATH,
+            shared_root_dir=SHARED_WORD_CACHE_DIR,
+            source_root_dir=SOURCE_WORD_CACHE_ROOT_DIR,
         )
     return _runtime_state.cache_metadata_store
 
 
+def _import_cache_metadata_sidecars():
+    try:
+        imported = _get_cache_metadata_store().import_sidecars((SHARED_WORD_CACHE_DIR, SOURCE_WORD_CACHE_ROOT_DIR))
+    except Exception as exc:
+        _log_warning("tts_cache_metadata_import_failed", error=exc)
+        return 0
+    if imported:
+        _log_info("tts_cache_metadata_imported", entries=imported)
+    return imported
+
+
+def _get_audio_blob_store():
+    if _runtime_state.audio_blob_store is None:
+        _runtime_state.audio_blob_store = AudioBlobStore(
+            AUDIO_BLOB_DIR,
+            sha1_file=_sha1_file,
+            encode_audio=_encode_wav_to_compressed,
+            decode_audio=_decode_audio_to_wav,
+            register_blob=_get_cache_metadata_store().register_blob,
+        )
+    return _runtime_state.audio_blob_store
+
+
+def _store_audio_blob(path, *, move=False):
+    return _get_audio_blob_store().put_file(path, move=move, audio_format=get_audio_cache_format())
+
+
+def _metadata_blob_path(metadata):
+    sha1 = str((metadata or {}).get("blob_sha1") or "").strip()
+    if not sha1:
+        return ""
+    blob_path = _get_audio_blob_store().blob_path(sha1)
+    return blob_path if os.path.exists(blob_path) else ""
+
+
+def _discard_physical_cache_file(cache_path):
+    try:
+        if cache_path and os.path.exists(cache_path) and not _get_audio_blob_store().owns(cache_path):
+            os.remove(cache_path)
+    except Exception as exc:
+        _log_warning("tts_cache_physical_file_remove_failed", cache_path=cache_path, error=exc)
+
+
+def _migrate_cache_audio_to_blobs():
+    store = _get_cache_metadata_store()
+    if store.get_state(AUDIO_BLOB_MIGRATION_KEY):
+        return 0
+    migrated = 0
+    for root_kind in ("shared", "source"):
+        for cache_path, metadata in store.entries(root_kind):
+            if not isinstance(metadata, dict) or metadata.get("blob_sha1") or not os.path.exists(cache_path):
+                continue
+            try:
+                payload = dict(metadata)
+                payload["blob_sha1"] = _store_audio_blob(cache_path, move=True)
+                _save_cache_metadata(cache_path, payload)
+                migrated += 1
+            except Exception as exc:
+                _log_warning("tts_cache_blob_migrate_failed", cache_path=cache_path, error=exc)
+    store.set_state(AUDIO_BLOB_MIGRATION_KEY, migrated)
+    if migrated:
+        _log_info("tts_cache_blobs_migrated", entries=migrated)
+    return migrated
+
+
+def _collect_unreferenced_audio_blobs():
+    blob_store = _get_audio_blob_store()
+    removed = 0
+    try:
+        for sha1 in _get_cache_metadata_store().take_unreferenced_blobs():
+            if blob_store.delete(sha1):
+                removed += 1
+    except Exception as exc:
+        _log_warning("tts_cache_blob_collect_failed", error=exc)
+    return removed
+
+
+def _iter_cache_metadata(root_kind, source_bucket=None):
+    return _get_cache_metadata_store().entries(root_kind, source_bucket)
+
+
+def _find_linked_cache_metadata(linked_shared_path):
+    return _get_cache_metadata_store().entries_linked_to(linked_shared_path)
+
+
 def _load_cache_metadata(cache_path):
     return _get_cache_metadata_store().load(cache_path)
 
@@ -830,14 +943,14 @@ def _remove_cache_metadata(cache_path):
 
 
 def _copy_cache_file(src_path, dst_path, metadata=None):
-    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-    shutil.copyfile(src_path, dst_path)
     payload = dict(metadata or {})
     if not payload:
         payload = _load_cache_metadata(src_path)
-    if payload:
-        payload["updated_at"] = int(os.path.getmtime(dst_path)) if os.path.exists(dst_path) else None
-        _save_cache_metadata(dst_path, payload)
+    payload.pop("linked_shared_path", None)
+    payload["blob_sha1"] = _store_audio_blob(src_path)
+    payload["updated_at"] = int(time.time())
+    _discard_physical_cache_file(dst_path)
+    _save_cache_metadata(dst_path, payload)
 
 
 def _resolve_cache_audio_path(cache_path):
@@ -845,9 +958,14 @@ def _resolve_cache_audio_path(cache_path):
     if os.path.exists(cache_path):
         return cache_path
     metadata = _load_cache_metadata(cache_path)
+    blob_path = _metadata_blob_path(metadata)
+    if blob_path:
+        return blob_path
     linked = str(metadata.get("linked_shared_path") or "").strip()
     if linked and os.path.exists(linked):
         return linked
+    if linked:
+        return _metadata_blob_path(_load_cache_metadata(linked))
     return ""
 
 
@@ -878,13 +996,9 @@ def _write_source_alias_metadata(text, source_path, shared_path, *, backend=None
         "desired_backend": wanted_backend,
         "source_path": str(_normalize_source_path(source_path) or "").strip() or None,
         "linked_shared_path": shared_path,
-        "updated_at": int(os.path.getmtime(shared_path)) if shared_path and os.path.exists(shared_path) else None,
+        "updated_at": int((_load_cache_metadata(shared_path) or {}).get("updated_at") or time.time()) if shared_path else None,
     }
-    if os.path.exists(source_cache_path):
-        try:
-            os.remove(source_cache_path)
-        except Exception:
-            pass
+    _discard_physical_cache_file(source_cache_path)
     _save_cache_metadata(source_cache_path, metadata)
     return source_cache_path
 
@@ -928,10 +1042,10 @@ def _ensure_shared_cache_from_playable(
         fallback_backend=desired_backend or shared_payload.get("desired_backend") or shared_payload["backend"]
     )
     shared_payload["source_path"] = "shared"
-    os.makedirs(os.path.dirname(shared_cache_path), exist_ok=True)
-    if os.path.abspath(playable_path) != os.path.abspath(shared_cache_path):
-        shutil.copyfile(playable_path, shared_cache_path)
-    shared_payload["updated_at"] = int(os.path.getmtime(shared_cache_path)) if os.path.exists(shared_cache_path) else None
+    shared_payload.pop("linked_shared_path", None)
+    shared_payload["blob_sha1"] = _store_audio_blob(playable_path)
+    shared_payload["updated_at"] = int(time.time())
+    _discard_physical_cache_file(shared_cache_path)
     _save_cache_metadata(shared_cache_path, shared_payload)
     return shared_cache_path
 
@@ -1094,7 +1208,7 @@ def _collapse_source_cache_to_alias(text, source_path=None):
 
 def _migrate_legacy_cache_if_needed(text, source_path=None):
     cache_path = _word_cache_path(text, source_path=source_path)
-    if os.path.exists(cache_path):
+    if _resolve_cache_audio_path(cache_path):
         return cache_path
 
     legacy_candidates = [
@@ -1149,38 +1263,59 @@ def _hydrate_source_cache_from_shared(text, source_path=None):
         return False
 
 
-def _save_pending_gemini_queue_locked():
-    payload = []
+def _pending_entry_key(item):
+    item = item if isinstance(item, dict) else {}
+    source_key = _normalize_source_path(item.get("source_path")) or str(item.get("source_path") or "").strip()
+    return (source_key, _normalize_text(item.get("text"), ensure_sentence_end=False))
+
+
+def _pending_entry_payload(cache_path, item):
+    if not isinstance(item, dict):
+        return None
+    text = _normalize_text(item.get("text"), ensure_sentence_end=False)
+    if not text:
+        return None
+    return {
+        "cache_path": cache_path,
+        "text": text,
+        "source_path": str(item.get("source_path") or "").strip() or None,
+        "created_at": item.get("created_at"),
+        "desired_backend": _pending_gemini_replacements.provider_of(cache_path) or _pending_item_provider(item),
+    }
+
+
+def _pending_snapshot_entries_locked():
+    entries = []
     for cache_path, item in _pending_gemini_replacements.items():
-        if not isinstance(item, dict):
-            continue
-        text = _normalize_text(item.get("text"), ensure_sentence_end=False)
-        if not text:
-            continue
-        payload.append(
-            {
-                "cache_path": cache_path,
-                "text": text,
-                "source_path": str(item.get("source_path") or "").strip() or None,
-                "created_at": item.get("created_at"),
-                "desired_backend": str(item.get("desired_backend") or _current_online_provider()).strip().lower(),
-            }
-        )
-    _write_json_file(PENDING_ONLINE_TTS_QUEUE_PATH, payload)
-    try:
-        if os.path.exists(LEGACY_PENDING_GEMINI_QUEUE_PATH):
-            os.remove(LEGACY_PENDING_GEMINI_QUEUE_PATH)
-    except Exception:
-        pass
+        payload = _pending_entry_payload(cache_path, item)
+        if payload is not None:
+            entries.append(payload)
+    return entries
+
+
+def _save_pending_gemini_queue_locked():
+    records = []
+    for op in _pending_gemini_replacements.drain_ops():
+        if op[0] == "put":
+            payload = _pending_entry_payload(op[1], op[2])
+            records.append({"op": "put", **payload} if payload else {"op": "del", "cache_path": op[1]})
+        elif op[0] == "del":
+            records.append({"op": "del", "cache_path": op[1]})
+        else:
+            records.append({"op": "clear"})
+    _get_pending_queue_journal().append(
+        records,
+        live_count=len(_pending_gemini_replacements),
+        snapshot_entries=_pending_snapshot_entries_locked,
+    )
 
 
 def _load_pending_gemini_queue():
-    items = _load_pending_queue_disk_payload()
-    if not isinstance(items, list):
-        return
-    changed = False
+    journal = _get_pending_queue_journal()
+    items = journal.load()
     with _pending_gemini_lock:
         _pending_gemini_replacements.clear()
+        prefer = _pending_entry_preference(_current_online_provider())
         for item in items:
             if not isinstance(item, dict):
                 continue
@@ -1193,32 +1328,27 @@ def _load_pending_gemini_queue():
             text = _normalize_text(item.get("text"), ensure_sentence_end=False)
             if not cache_path or not text:
                 continue
-            if cache_path != str(item.get("cache_path") or "").strip():
-                item["cache_path"] = cache_path
-                changed = True
-            _pending_gemini_replacements[cache_path] = {
-                "text": text,
-                "source_path": str(item.get("source_path") or "").strip() or None,
-                "created_at": item.get("created_at"),
-                "desired_backend": str(item.get("desired_backend") or _current_online_provider()).strip().lower(),
-            }
-        if _dedupe_pending_gemini_locked(preferred_provider=_current_online_provider()):
-            changed = True
-        if changed:
-            _save_pending_gemini_queue_locked()
+            _pending_gemini_replacements.put(
+                cache_path,
+                {
+                    "text": text,
+                    "source_path": str(item.get("source_path") or "").strip() or None,
+                    "created_at": item.get("created_at"),
+                    "desired_backend": str(item.get("desired_backend") or _current_online_provider()).strip().lower(),
+                },
+                prefer=prefer,
+            )
+        _pending_gemini_replacements.drain_ops()
+        try:
+            journal.compact(_pending_snapshot_entries_locked())
+        except Exception as exc:
+            _log_warning("tts_pending_queue_compact_failed", path=PENDING_ONLINE_TTS_QUEUE_PATH, error=exc)
     _refresh_gemini_queue_status_counts()
 
 
-def _dedupe_pending_gemini_locked(preferred_provider=None):
+def _pending_entry_preference(preferred_provider=None):
     preferred_provider = str(preferred_provider or _current_online_provider() or "").strip().lower()
     preferred_provider = preferred_provider if preferred_provider in {"gemini", "elevenlabs"} else ""
-    changed = False
-    deduped = {}
-
-    def _entry_key(item):
-        source_key = _normalize_source_path((item or {}).get("source_path")) or str((item or {}).get("source_path") or "").strip()
-        text_key = _normalize_text((item or {}).get("text"), ensure_sentence_end=False)
-        return (source_key, text_key)
 
     def _score(item):
         item = item if isinstance(item, dict) else {}
@@ -1230,29 +1360,11 @@ def _dedupe_pending_gemini_locked(preferred_provider=None):
             created,
         )
 
-    for cache_path, item in list(_pending_gemini_replacements.items()):
-        if not isinstance(item, dict):
-            continue
-        key = _entry_key(item)
-        if not key[1]:
-            continue
-        existing = deduped.get(key)
-        if existing is None:
-            deduped[key] = (cache_path, item)
-            continue
-        existing_path, existing_item = existing
-        if _score(item) >= _score(existing_item):
-            deduped[key] = (cache_path, item)
-            if existing_path != cache_path:
-                changed = True
-        else:
-            changed = True
+    return lambda item, existing: _score(item) >= _score(existing)
 
-    if changed:
-        _pending_gemini_replacements.clear()
-        for cache_path, item in deduped.values():
-            _pending_gemini_replacements[cache_path] = item
-    return changed
+
+def _dedupe_pending_gemini_locked(preferred_provider=None):
+    return _pending_gemini_replacements.dedupe(prefer=_pending_entry_preference(preferred_provider))
 
 
 def dedupe_pending_online_queue(preferred_provider=None):
@@ -1283,22 +1395,23 @@ def set_preferred_pending_source(source_path=None):
     _runtime_state.preferred_pending_source = _normalize_source_path(source_path)
 
 
-def _next_pending_gemini_item():
-    preferred_source = _runtime_state.preferred_pending_source
+def _pending_item_provider(item):
+    provider = str((item or {}).get("desired_backend") or _current_online_provider()).strip().lower()
+    return provider if provider in {"gemini", "elevenlabs"} else _current_online_provider()
+
+
+def _queued_item_provider(cache_path, item):
     with _pending_gemini_lock:
-        pending_items = list(_pending_gemini_replacements.items())
-    if not pending_items:
-        return None
+        return _pending_gemini_replacements.provider_of(cache_path) or _pending_item_provider(item)
 
-    def _sort_key(entry):
-        cache_path, item = entry
-        item = item if isinstance(item, dict) else {}
-        source_value = _normalize_source_path(item.get("source_path"))
-        created_at = int(item.get("created_at") or 0)
-        preferred_rank = 0 if preferred_source and source_value == preferred_source else 1
-        return (preferred_rank, created_at, str(cache_path or ""))
 
-    return min(pending_items, key=_sort_key)
+def _next_pending_gemini_item(exclude=(), exclude_providers=()):
+    with _pending_gemini_lock:
+        return _pending_gemini_replacements.next_item(
+            preferred_source=_runtime_state.preferred_pending_source,
+            exclude=exclude,
+            exclude_providers=exclude_providers,
+        )
 
 
 def _move_pending_gemini_entry(old_cache_path, new_cache_path, *, text=None, source_path=None):
@@ -1326,13 +1439,16 @@ def _enqueue_existing_cache_for_gemini_replacement(text, cache_path, source_path
         with _manual_session_cache_lock:
             _manual_session_cache_paths.add(cache_path)
     with _pending_gemini_lock:
-        _pending_gemini_replacements[cache_path] = {
-            "text": normalized,
-            "source_path": str(source_path or "").strip() or None,
-            "created_at": int(time.time()),
-            "desired_backend": _current_online_provider(),
-        }
-        _dedupe_pending_gemini_locked(preferred_provider=_current_online_provider())
+        _pending_gemini_replacements.put(
+            cache_path,
+            {
+                "text": normalized,
+                "source_path": str(source_path or "").strip() or None,
+                "created_at": int(time.time()),
+                "desired_backend": _current_online_provider(),
+            },
+            prefer=_pending_entry_preference(_current_online_provider()),
+        )
         _save_pending_gemini_queue_locked()
     _refresh_gemini_queue_status_counts()
     _start_pending_gemini_worker()
@@ -1394,9 +1510,9 @@ def _save_word_cache_file(cache_path, wav_path, *, text=None, source_path=None,
                 _manual_session_cache_paths.add(cache_path)
         return
 
-    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-    shutil.copyfile(wav_path, cache_path)
-    payload["updated_at"] = int(os.path.getmtime(cache_path)) if os.path.exists(cache_path) else None
+    payload["blob_sha1"] = _store_audio_blob(wav_path)
+    payload["updated_at"] = int(time.time())
+    _discard_physical_cache_file(cache_path)
     _save_cache_metadata(cache_path, payload)
     if not str(source_path or "").strip():
         with _manual_session_cache_lock:
@@ -1562,25 +1678,21 @@ def cleanup_cache_for_source_path(source_path):
     if not target:
         return 0
     removed = 0
+    try:
+        removed += _get_cache_metadata_store().remove_source_bucket(_source_bucket_name(target))
+    except Exception as exc:
+        _log_warning("tts_cleanup_source_cache_metadata_failed", source_path=target, error=exc)
     source_dir = _source_word_cache_dir(source_path=target)
     if not os.path.isdir(source_dir):
         with _pending_gemini_lock:
-            pending_paths = [
-                cache_path
-                for cache_path, item in _pending_gemini_replacements.items()
-                if _normalize_source_path((item or {}).get("source_path")) == target
-            ]
+            pending_paths = _pending_gemini_replacements.paths_for_source(target)
         for cache_path in pending_paths:
             _remove_pending_gemini(cache_path)
-        return 0
+        return removed
     for root, _, names in os.walk(source_dir, topdown=False):
         for name in names:
             full_path = os.path.join(root, name)
-            if name.lower().endswith(".wav"):
-                cache_path = full_path
-            elif name.lower().endswith(".wav.json"):
-                cache_path = full_path[:-5]
-            else:
+            if not name.lower().endswith((".wav", ".wav.json")):
                 continue
             try:
                 if os.path.exists(full_path):
@@ -1588,21 +1700,13 @@ def cleanup_cache_for_source_path(source_path):
                     removed += 1
             except Exception as exc:
                 _log_warning("tts_cleanup_source_cache_remove_failed", path=full_path, error=exc)
-            if name.lower().endswith(".wav"):
-                _remove_cache_metadata(cache_path)
-            elif name.lower().endswith(".wav.json"):
-                _remove_pending_gemini(cache_path)
         try:
             if os.path.isdir(root) and not os.listdir(root):
                 os.rmdir(root)
         except Exception as exc:
             _log_warning("tts_cleanup_source_cache_rmdir_failed", path=root, error=exc)
     with _pending_gemini_lock:
-        pending_paths = [
-            cache_path
-            for cache_path, item in _pending_gemini_replacements.items()
-            if _normalize_source_path((item or {}).get("source_path")) == target
-        ]
+        pending_paths = _pending_gemini_replacements.paths_for_source(target)
     for cache_path in pending_paths:
         _remove_pending_gemini(cache_path)
     try:
@@ -1651,16 +1755,17 @@ def rename_cache_source_path(old_source_path, new_source_path):
     queued_count = 0
     migrated_pending = {}
 
+    cache_paths = {
+        cache_path
+        for cache_path, _metadata in _iter_cache_metadata("source", _source_bucket_name(old_source))
+    }
     if os.path.isdir(old_dir):
-        cache_paths = set()
         for root, _, names in os.walk(old_dir):
             for name in names:
-                lower_name = name.lower()
-                if lower_name.endswith(".wav"):
+                if name.lower().endswith(".wav"):
                     cache_paths.add(os.path.join(root, name))
-                elif lower_name.endswith(".wav.json"):
-                    cache_paths.add(os.path.join(root, name[:-5]))
 
+    if cache_paths:
         for old_cache_path in sorted(cache_paths):
             old_metadata = _load_cache_metadata(old_cache_path)
             text_value = _normalize_text((old_metadata or {}).get("text"), ensure_sentence_end=False)
@@ -1722,11 +1827,10 @@ def rename_cache_source_path(old_source_path, new_source_path):
 
     with _pending_gemini_lock:
         updated = False
-        for cache_path, item in list(_pending_gemini_replacements.items()):
+        for cache_path in _pending_gemini_replacements.paths_for_source(old_source):
+            item = _pending_gemini_replacements.get(cache_path)
             if not isinstance(item, dict):
                 continue
-            if _normalize_source_path(item.get("source_path")) != old_source:
-                continue
             text_value = _normalize_text(item.get("text"), ensure_sentence_end=False)
             if text_value:
                 new_cache_path = _word_cache_path(text_value, source_path=new_source)
@@ -1766,6 +1870,8 @@ def _is_gemini_rate_limited_error(error):
 
 def _clone_to_temp(path, *, volume=1.0):
     gain = _clamp(volume, 0.0, 6.0)
+    if _is_compressed_audio(path):
+        return _decode_audio_to_wav(path, gain=gain)
     if abs(gain - 1.0) <= 1e-6:
         fd, temp_path = tempfile.mkstemp(prefix="wordspeaker_", suffix=".wav")
         os.close(fd)
@@ -1784,6 +1890,31 @@ def _clone_to_temp(path, *, volume=1.0):
         return temp_path
 
 
+def _get_decoded_audio_cache():
+    if _runtime_state.decoded_audio_cache is None:
+        _runtime_state.decoded_audio_cache = DecodedAudioLru(DECODED_AUDIO_CACHE_MAX_BYTES)
+    return _runtime_state.decoded_audio_cache
+
+
+def _load_decoded_clip(path, *, volume=1.0):
+    gain = _clamp(volume, 0.0, 6.0)
+    try:
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns, round(gain, 3))
+        cache = _get_decoded_audio_cache()
+        clip = cache.get(key)
+        if clip is None:
+            clip = _read_audio_clip(path, gain=gain)
+            cache.put(key, clip)
+        return clip
+    except Exception as exc:
+        _log_warning("tts_decoded_clip_load_failed", path=path, volume=gain, error=exc)
+        return None
+
+
+def decoded_audio_cache_stats():
+    return _get_decoded_audio_cache().stats()
+
+
 def _ensure_source_gemini_cache(text, source_path=None):
     source_cache_path = _migrate_legacy_cache_if_needed(text, source_path=source_path)
     if _has_valid_gemini_cache(source_cache_path):
@@ -1909,14 +2040,15 @@ def get_word_audio_cache_info(text, source_path=None):
             text,
             preferred_provider=desired_backend or _current_online_provider(),
         )
+    shared_playable = _resolve_cache_audio_path(shared_path) if shared_path else ""
     return {
         "exists": exists,
         "cache_path": cache_path,
         "playable_cache_path": playable_cache or cache_path,
-        "meta_path": _cache_meta_path(cache_path),
+        "meta_path": CACHE_METADATA_DB_PATH,
         "shared_cache_path": shared_path,
-        "shared_exists": bool(shared_path and os.path.exists(shared_path)),
-        "uses_shared_cache": bool(shared_path and playable_cache and os.path.abspath(playable_cache) == os.path.abspath(shared_path) and os.path.abspath(cache_path) != os.path.abspath(shared_path)),
+        "shared_exists": bool(shared_playable),
+        "uses_shared_cache": bool(shared_playable and playable_cache and os.path.abspath(playable_cache) == os.path.abspath(shared_playable) and os.path.abspath(cache_path) != os.path.abspath(shared_path)),
         "backend": backend or None,
         "backend_label": _backend_label_from_key(backend) if backend else "",
         "desired_backend": (desired_backend or (_current_online_provider() if pending else None)),
@@ -1936,7 +2068,7 @@ def export_shared_audio_cache_package(package_path):
         shared_cache_package_manifest=SHARED_CACHE_PACKAGE_MANIFEST,
         shared_cache_package_version=SHARED_CACHE_PACKAGE_VERSION,
         export_shared_metadata_payload=export_shared_metadata_payload,
-        sha1_file=_sha1_file,
+        sha1_file=_get_audio_blob_store().content_sha1,
     )
 
 
@@ -1949,9 +2081,12 @@ def import_shared_audio_cache_package(package_path):
         safe_rel_path=_safe_rel_path,
         zip_entry_path=_zip_entry_path,
         shared_cache_target_path=_shared_cache_target_path,
-        sha1_file=_sha1_file,
+        sha1_file=_get_audio_blob_store().content_sha1,
         load_cache_metadata=_load_cache_metadata,
         save_cache_metadata=_save_cache_metadata,
+        store_audio_blob=_store_audio_blob,
+        discard_physical_cache_file=_discard_physical_cache_file,
+        audio_format_supported=_compressed_audio_supported,
         import_shared_metadata_payload=import_shared_metadata_payload,
         cleanup_duplicate_source_cache_entries=_cleanup_duplicate_source_cache_entries,
         collapse_existing_lightweight_source_caches=_collapse_existing_lightweight_source_caches,
@@ -2057,7 +2192,7 @@ def get_backend_status(token):
 
 def _stop_locked():
     try:
-        winsound.PlaySound(None, winsound.SND_PURGE)
+        winsound.PlaySound(None, 0)
     except Exception as exc:
         _log_warning("tts_stop_purge_failed", error=exc)
     if _runtime_state.current_wav:
@@ -2094,6 +2229,28 @@ def _play_wav_async(path):
         raise last_error
 
 
+def _play_wav_bytes(data):
+    try:
+        winsound.PlaySound(data, winsound.SND_MEMORY | winsound.SND_NODEFAULT)
+    except Exception as exc:
+        _log_error("tts_play_memory_failed", bytes=len(data), error=exc)
+
+
+def _play_wav_bytes_async(data, *, on_finished=None):
+    def _play():
+        try:
+            _play_wav_bytes(data)
+        finally:
+            if callable(on_finished):
+                on_finished()
+
+    threading.Thread(target=_play, daemon=True).start()
+
+
+def _play_clip_async(clip, *, silence_ms=0):
+    _play_wav_bytes_async(_clip_to_wav_bytes(clip, silence_ms=silence_ms))
+
+
 def _show_error_once(message):
     if not message:
         return
@@ -2121,6 +2278,9 @@ def _initialize_runtime_once():
             return
         _migrate_legacy_word_wrapper_layout()
         _migrate_flat_root_cache_layout()
+        _import_cache_metadata_sidecars()
+        _migrate_cache_audio_to_blobs()
+        _collect_unreferenced_audio_blobs()
         _migrate_pending_queue_path()
         _load_pending_gemini_queue()
         _cleanup_duplicate_source_cache_entries()
@@ -2343,12 +2503,16 @@ def _synthesize_with_online(text, volume, *, short_text, timeout_seconds=ONLINE_
 
 
 def _synthesize_with_kokoro(text, volume, rate_ratio):
+    voice_id, lang = _kokoro_voice_settings()
+    return _synthesize_with_kokoro_voice(text, volume, rate_ratio, voice_id, lang=lang)
+
+
+def _synthesize_with_kokoro_voice(text, volume, rate_ratio, voice_id, lang="en-gb"):
     kokoro = _ensure_kokoro()
-    voice_id = get_voice_id()
-    profile = get_voice_profile(get_voice_source(), voice_id)
-    lang = str((profile.get("languages") or ["en-GB"])[0]).strip().lower().replace("_", "-")
     speed = _clamp(rate_ratio, 0.7, 1.4)
-    audio, sample_rate = kokoro.create(_normalize_tts_spoken_text(text), voice=voice_id, speed=speed, lang=lang)
+    spoken = _normalize_tts_spoken_text(text)
+    phonemes = _kokoro_phonemize_batch(kokoro, [spoken], lang)[0]
+    audio, sample_rate = _kokoro_create(kokoro, spoken, phonemes, voice_id=voice_id, speed=speed, lang=lang)
     return (
         _write_float_audio_to_wav_path(audio, sample_rate=sample_rate or KOKORO_SAMPLE_RATE, volume=volume),
         "Kokoro (Offline)",
@@ -2356,15 +2520,80 @@ def _synthesize_with_kokoro(text, volume, rate_ratio):
     )
 
 
-def _synthesize_with_kokoro_voice(text, volume, rate_ratio, voice_id, lang="en-gb"):
+def _kokoro_voice_settings(voice_id=None, lang=None):
+    if voice_id:
+        return voice_id, str(lang or "en-gb").strip().lower()
+    voice_id = get_voice_id()
+    profile = get_voice_profile(get_voice_source(), voice_id)
+    return voice_id, str((profile.get("languages") or ["en-GB"])[0]).strip().lower().replace("_", "-")
+
+
+def _kokoro_phonemize_batch(kokoro, texts, lang):
+    texts = [str(text or "").strip() for text in texts or []]
+    vocab = getattr(getattr(kokoro, "tokenizer", None), "vocab", None)
+    if not texts or not vocab:
+        return [""] * len(texts)
+    try:
+        import phonemizer
+    except Exception:
+        return [""] * len(texts)
+    batched = [index for index, text in enumerate(texts) if text and "\n" not in text]
+    single = [index for index, text in enumerate(texts) if text and "\n" in text]
+    raw = [""] * len(texts)
+    try:
+        with _kokoro_phonemize_lock:
+            if batched:
+                lines = phonemizer.phonemize(
+                    [texts[index] for index in batched],
+                    lang,
+                    preserve_punctuation=True,
+                    with_stress=True,
+                )
+                if isinstance(lines, str) or len(lines) != len(batched):
+                    return [""] * len(texts)
+                for index, line in zip(batched, lines):
+                    raw[index] = line
+            for index in single:
+                raw[index] = phonemizer.phonemize(texts[index], lang, preserve_punctuation=True, with_stress=True)
+    except Exception as exc:
+        _log_warning("tts_kokoro_batch_phonemize_failed", count=len(texts), error=exc)
+        return [""] * len(texts)
+    return ["".join(ch for ch in line if ch in vocab).strip() for line in raw]
+
+
+def _kokoro_create(kokoro, spoken, phonemes, *, voice_id, speed, lang):
+    if phonemes:
+        try:
+            return kokoro.create(phonemes, voice=voice_id, speed=speed, lang=lang, is_phonemes=True)
+        except TypeError:
+            pass
+    with _kokoro_phonemize_lock:
+        return kokoro.create(spoken, voice=voice_id, speed=speed, lang=lang)
+
+
+def _synthesize_kokoro_batch(texts, volume, rate_ratio, *, voice_id=None, lang=None):
     kokoro = _ensure_kokoro()
+    voice_id, lang = _kokoro_voice_settings(voice_id, lang)
     speed = _clamp(rate_ratio, 0.7, 1.4)
-    audio, sample_rate = kokoro.create(_normalize_tts_spoken_text(text), voice=voice_id, speed=speed, lang=lang)
-    return (
-        _write_float_audio_to_wav_path(audio, sample_rate=sample_rate or KOKORO_SAMPLE_RATE, volume=volume),
-        "Kokoro (Offline)",
-        False,
-    )
+    spoken_texts = [_normalize_tts_spoken_text(text) for text in texts or []]
+    results = []
+    for start in range(0, len(spoken_texts), max(1, KOKORO_BATCH_SIZE)):
+        batch = spoken_texts[start : start + max(1, KOKORO_BATCH_SIZE)]
+        phoneme_batch = _kokoro_phonemize_batch(kokoro, batch, lang)
+        for spoken, phonemes in zip(batch, phoneme_batch):
+            try:
+                audio, sample_rate = _kokoro_create(
+                    kokoro, spoken, phonemes, voice_id=voice_id, speed=speed, lang=lang
+                )
+                wav_path = _write_float_audio_to_wav_path(
+                    audio,
+                    sample_rate=sample_rate or KOKORO_SAMPLE_RATE,
+                    volume=volume,
+                )
+                results.append((wav_path, None))
+            except Exception as exc:
+                results.append(("", exc))
+    return results
 
 
 def _synthesize_with_piper(text, volume, rate_ratio):
@@ -2419,7 +2648,16 @@ def _synthesize_with_selected_source(text, volume, rate_ratio, *, short_text, ti
     )
 
 
-def _synthesize_to_wav(text, volume, rate_ratio, *, short_text=False, source_path=None, request_token=None):
+def _synthesize_to_wav(
+    text,
+    volume,
+    rate_ratio,
+    *,
+    short_text=False,
+    source_path=None,
+    request_token=None,
+    cache_hit_loader=None,
+):
     normalized = _normalize_text(text, ensure_sentence_end=short_text)
     if not normalized:
         raise RuntimeError("Text is empty.")
@@ -2449,7 +2687,7 @@ def _synthesize_to_wav(text, volume, rate_ratio, *, short_text=False, source_pat
             set_backend_status=_set_backend_status,
             backend_label_from_key=_backend_label_from_key,
             wav_duration_seconds=_wav_duration_seconds,
-            clone_to_temp=_clone_to_temp,
+            clone_to_temp=cache_hit_loader or _clone_to_temp,
             ensure_source_online_cache=_ensure_source_gemini_cache,
             is_online_backend=_is_online_backend,
             has_valid_online_cache=_has_valid_gemini_cache,
@@ -2533,8 +2771,10 @@ def _start_pending_gemini_worker():
             next_pending_item=_next_pending_gemini_item,
             remove_pending_item=_remove_pending_gemini,
             normalize_text=_normalize_text,
-            current_online_provider=_current_online_provider,
-            wait_for_queue_slot=_wait_for_gemini_queue_slot,
+            pending_item_provider=_queued_item_provider,
+            try_acquire_queue_slot=_try_acquire_gemini_queue_slot,
+            release_queue_slot=_release_gemini_queue_slot,
+            max_workers=_runtime_state.online_queue_manager.max_workers(),
             log_info=_log_info,
             log_warning=_log_warning,
             log_error=_log_error,
@@ -2545,6 +2785,7 @@ def _start_pending_gemini_worker():
             record_queue_soft_failure=_record_queue_soft_failure,
             set_queue_status=_set_gemini_queue_status,
             save_word_cache_file=_save_word_cache_file,
+            resolve_cache_audio_path=_resolve_cache_audio_path,
             secondary_online_provider=_secondary_online_provider,
             get_fallback_key=lambda provider: get_llm_api_key() if provider == "gemini" else get_tts_api_key(),
             synthesize_with_online_provider=_synthesize_with_online_provider,
@@ -2572,6 +2813,30 @@ def stop():
         _stop_locked()
 
 
+def _synthesize_for_playback(text, volume, rate_ratio, *, source_path=None, request_token=None):
+    decoded = []
+
+    def _decode_cache_hit(path, *, volume=1.0):
+        clip = _load_decoded_clip(path, volume=volume)
+        if clip is None:
+            return _clone_to_temp(path, volume=volume)
+        decoded.append(clip)
+        return ""
+
+    wav_path = _synthesize_to_wav(
+        text=text,
+        volume=volume,
+        rate_ratio=rate_ratio,
+        short_text=True,
+        source_path=source_path,
+        request_token=request_token,
+        cache_hit_loader=_decode_cache_hit,
+    )
+    if decoded:
+        return decoded[0], ""
+    return None, wav_path
+
+
 def speak_async(text, volume=1.0, rate_ratio=1.0, cancel_before=False, source_path=None, pre_silence_ms=0):
     _ensure_runtime_initialized()
     if cancel_before:
@@ -2594,21 +2859,26 @@ def speak_async(text, volume=1.0, rate_ratio=1.0, cancel_before=False, source_pa
             with _lock:
                 if my_token != _runtime_state.token:
                     return
-            wav_path = _synthesize_to_wav(
-                text=text,
-                volume=volume,
-                rate_ratio=rate_ratio,
-                short_text=True,
+            clip, wav_path = _synthesize_for_playback(
+                text,
+                volume,
+                rate_ratio,
                 source_path=source_path,
                 request_token=my_token,
             )
-            wav_path = _prepend_silence_to_wav(
-                wav_path,
-                silence_ms=pre_silence_ms,
-                default_channels=TTS_CHANNELS,
-                default_sample_width=TTS_SAMPLE_WIDTH,
-                default_sample_rate=TTS_SAMPLE_RATE,
-            )
+            if clip is not None:
+                with _lock:
+                    if my_token != _runtime_state.token:
+                        _log_warning("tts_speak_async_cancelled", token=my_token)
+                        return
+                    _stop_locked()
+                _play_clip_async(clip, silence_ms=pre_silence_ms)
+                _log_info("tts_speak_async_playing_cached", token=my_token)
+                return
+            if int(pre_silence_ms or 0) > 0:
+                clip = _read_audio_clip(wav_path)
+                with open(wav_path, "wb") as wav_fp:
+                    wav_fp.write(_clip_to_wav_bytes(clip, silence_ms=pre_silence_ms))
             with _lock:
                 if my_token != _runtime_state.token:
                     try:
@@ -2670,137 +2940,171 @@ def speak_stream_async(text, volume=1.0, rate_ratio=1.0, cancel_before=False, ch
         text=str(text or "")[:160],
     )
 
-    def _run():
-        try:
-            with _lock:
-                if my_token != _runtime_state.token:
-                    return
-            chunks = _split_long_text(text, chunk_chars=max(400, int(chunk_chars)))
-            if not chunks:
+    def _cancelled():
+        return my_token != _runtime_state.token
+
+    def _synthesized_batches(chunks):
+        online_timeout_seconds = _interactive_online_timeout(False)
+        lookahead = max(1, STREAM_LOOKAHEAD_CHUNKS)
+        fallback = False
+        index = 0
+        selected_source = get_voice_source()
+        if selected_source == SOURCE_KOKORO:
+            synth_mode = "kokoro"
+            backend_label = "Kokoro (Offline)"
+        elif selected_source == SOURCE_PIPER:
+            synth_mode = "piper"
+            backend_label = "Piper (Local)"
+        else:
+            first_result, fallback = _synthesize_with_selected_source(
+                chunks[0],
+                volume=volume,
+                rate_ratio=rate_ratio,
+                short_text=False,
+                timeout_seconds=online_timeout_seconds,
+            )
+            first_path, backend_label, _can_cache = first_result
+            backend_key = _backend_key_from_label(backend_label)
+            synth_mode = backend_key if backend_key in {"kokoro", "piper"} else "online"
+            yield [(first_path, None)], backend_label, fallback
+            index = 1
+
+        while index < len(chunks):
+            if _cancelled():
                 return
-            _log_info("tts_stream_chunks_ready", token=my_token, chunk_count=len(chunks))
-            wav_paths = []
-            fallback = False
-            online_timeout_seconds = _interactive_online_timeout(False)
-
-            def _synthesize_locally(chunk_text):
-                (local_path, local_label, _can_cache), local_backend = _synthesize_with_local_placeholder(
-                    chunk_text,
-                    volume=volume,
-                    rate_ratio=rate_ratio,
-                )
-                return local_path, local_label, local_backend
-
-            selected_source = get_voice_source()
-            if selected_source == SOURCE_KOKORO:
-                synth_mode = "kokoro"
-                backend_label = "Kokoro (Offline)"
-            elif selected_source == SOURCE_PIPER:
-                synth_mode = "piper"
-                backend_label = "Piper (Local)"
-            else:
-                first_result, fallback = _synthesize_with_selected_source(
-                    chunks[0],
-                    volume=volume,
-                    rate_ratio=rate_ratio,
-                    short_text=False,
-                    timeout_seconds=online_timeout_seconds,
+            if synth_mode == "kokoro":
+                group = chunks[index : index + (1 if index == 0 else min(lookahead, max(1, KOKORO_BATCH_SIZE)))]
+                yield (
+                    _synthesize_kokoro_batch(
+                        group,
+                        volume=volume,
+                        rate_ratio=rate_ratio,
+                        voice_id="bf_emma",
+                        lang="en-gb",
+                    ),
+                    backend_label,
+                    fallback,
                 )
-                first_path, backend_label, _can_cache = first_result
-                wav_paths.append(first_path)
-                backend_key = _backend_key_from_label(backend_label)
-                synth_mode = backend_key if backend_key in {"kokoro", "piper"} else "online"
-
+                index += len(group)
+                continue
+            chunk = chunks[index]
             try:
-                start_index = 0 if selected_source in {SOURCE_KOKORO, SOURCE_PIPER} else 1
-                for chunk in chunks[start_index:]:
-                    with _lock:
-                        if my_token != _runtime_state.token:
-                            _cleanup_temp_wavs(wav_paths)
-                            _log_warning("tts_stream_cancelled", token=my_token)
-                            return
-                    if synth_mode == "kokoro":
-                        wav_path, _label, _can_cache = _synthesize_with_kokoro_voice(
-                            chunk,
-                            volume=volume,
-                            rate_ratio=rate_ratio,
-                            voice_id="bf_emma",
-                            lang="en-gb",
-                        )
-                    elif synth_mode == "piper":
-                        wav_path, _label, _can_cache = _synthesize_with_piper(
-                            chunk,
-                            volume=volume,
-                            rate_ratio=rate_ratio,
-                        )
-                    else:
-                        wav_path, _label, _can_cache = _synthesize_with_user_online(
-                            chunk,
-                            volume=volume,
-                            short_text=False,
-                            timeout_seconds=online_timeout_seconds,
-                        )
-                    wav_paths.append(wav_path)
+                if synth_mode == "piper":
+                    wav_path, _label, _can_cache = _synthesize_with_piper(
+                        chunk,
+                        volume=volume,
+                        rate_ratio=rate_ratio,
+                    )
+                elif synth_mode == "online":
+                    wav_path, _label, _can_cache = _synthesize_with_user_online(
+                        chunk,
+                        volume=volume,
+                        short_text=False,
+                        timeout_seconds=online_timeout_seconds,
+                    )
+                else:
+                    (wav_path, backend_label, _can_cache), _local_backend = _synthesize_with_local_placeholder(
+                        chunk,
+                        volume=volume,
+                        rate_ratio=rate_ratio,
+                    )
             except Exception:
                 if synth_mode == "online" and _local_fallback_ready():
-                    _cleanup_temp_wavs(wav_paths)
-                    wav_paths = []
+                    _log_warning("tts_stream_local_fallback", token=my_token, chunk_index=index)
+                    synth_mode = "local_fallback"
                     fallback = True
-                    _log_warning("tts_stream_local_fallback", token=my_token)
-                    local_backend = ""
-                    backend_label = ""
-                    try:
-                        for chunk in chunks:
-                            with _lock:
-                                if my_token != _runtime_state.token:
-                                    _cleanup_temp_wavs(wav_paths)
-                                    _log_warning("tts_stream_cancelled", token=my_token)
-                                    return
-                            wav_path, backend_label, local_backend = _synthesize_locally(chunk)
-                            wav_paths.append(wav_path)
-                    except Exception:
-                        _cleanup_temp_wavs(wav_paths)
-                        raise
-                    synth_mode = local_backend or "kokoro"
-                else:
-                    _cleanup_temp_wavs(wav_paths)
-                    raise
-
-            fd, merged_path = tempfile.mkstemp(prefix="wordspeaker_", suffix=".wav")
-            os.close(fd)
-            with wave.open(merged_path, "wb") as out_fp:
-                out_fp.setnchannels(TTS_CHANNELS)
-                out_fp.setsampwidth(TTS_SAMPLE_WIDTH)
-                out_fp.setframerate(TTS_SAMPLE_RATE)
-                for wav_path in wav_paths:
-                    with wave.open(wav_path, "rb") as in_fp:
-                        out_fp.writeframes(in_fp.readframes(in_fp.getnframes()))
-            _cleanup_temp_wavs(wav_paths)
-
-            if my_token is not None:
+                    continue
+                raise
+            yield [(wav_path, None)], backend_label, fallback
+            index += 1
+
+    def _offer(lookahead_queue, consumer_done, item):
+        while not _cancelled() and not consumer_done.is_set():
+            try:
+                lookahead_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(chunks, lookahead_queue, consumer_done):
+        try:
+            for results, backend_label, fallback in _synthesized_batches(chunks):
+                clips = []
+                first_error = None
+                for wav_path, error in results:
+                    if error is None and first_error is None and wav_path:
+                        try:
+                            clips.append(_read_audio_clip(wav_path))
+                        except Exception as exc:
+                            first_error = exc
+                    elif first_error is None:
+                        first_error = error or RuntimeError("No audio was returned.")
+                    _cleanup_temp_wavs([wav_path])
+                for clip in clips:
+                    if not _offer(lookahead_queue, consumer_done, ("clip", clip, backend_label, fallback)):
+                        return
+                if first_error is not None:
+                    raise first_error
+            _offer(lookahead_queue, consumer_done, ("done", None, "", False))
+        except Exception as exc:
+            _offer(lookahead_queue, consumer_done, ("error", exc, "", False))
+
+    def _run():
+        consumer_done = threading.Event()
+        try:
+            if _cancelled():
+                return
+            chunks = _split_long_text(text, chunk_chars=max(400, int(chunk_chars)))
+            if not chunks:
+                return
+            _log_info("tts_stream_chunks_ready", token=my_token, chunk_count=len(chunks))
+            started_at = time.perf_counter()
+            lookahead_queue = queue.Queue(maxsize=max(1, STREAM_LOOKAHEAD_CHUNKS))
+            threading.Thread(target=_produce, args=(chunks, lookahead_queue, consumer_done), daemon=True).start()
+            played_count = 0
+            played_seconds = 0.0
+            while True:
+                try:
+                    kind, payload, backend_label, fallback = lookahead_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if _cancelled():
+                        _log_warning("tts_stream_cancelled", token=my_token, played_chunks=played_count)
+                        return
+                    continue
+                if kind == "done":
+                    _log_info("tts_stream_finished", token=my_token, played_chunks=played_count)
+                    return
+                if kind == "error":
+                    raise payload
+                played_seconds += payload.duration_seconds
                 _set_backend_status(
                     my_token,
                     backend_label,
                     from_cache=False,
                     fallback=fallback,
-                    duration_seconds=_wav_duration_seconds(merged_path),
+                    duration_seconds=played_seconds,
                 )
-
-            with _lock:
-                if my_token != _runtime_state.token:
-                    try:
-                        os.remove(merged_path)
-                    except Exception:
-                        pass
-                    _log_warning("tts_stream_cancelled", token=my_token)
-                    return
-                _stop_locked()
-                _runtime_state.current_wav = merged_path
-            _play_wav_async(merged_path)
-            _log_info("tts_stream_playing", token=my_token, wav_path=merged_path, fallback=fallback)
+                with _lock:
+                    if _cancelled():
+                        _log_warning("tts_stream_cancelled", token=my_token, played_chunks=played_count)
+                        return
+                    if not played_count:
+                        _stop_locked()
+                if not played_count:
+                    _log_info(
+                        "tts_stream_playing",
+                        token=my_token,
+                        fallback=fallback,
+                        first_audio_ms=int((time.perf_counter() - started_at) * 1000),
+                    )
+                _play_wav_bytes(_clip_to_wav_bytes(payload))
+                played_count += 1
         except Exception as e:
             _log_error("tts_stream_failed", token=my_token, error=e, text=str(text or "")[:160])
             _show_error_once(str(e))
+        finally:
+            consumer_done.set()
 
     threading.Thread(target=_run, daemon=True).start()
     return my_token
@@ -2813,8 +3117,44 @@ def cancel_all():
         _stop_locked()
 
 
+def cancel_precache_word_audio():
+    with _lock:
+        _runtime_state.precache_token += 1
+
+
+def _has_local_word_cache(cache_path, backend):
+    if not _resolve_cache_audio_path(cache_path):
+        return False
+    metadata = _load_cache_metadata(cache_path)
+    return str(metadata.get("backend") or "").strip().lower() == backend
+
+
+def _synthesize_local_precache_batch(texts, backend, rate_ratio):
+    spoken_texts = [_normalize_text(text, ensure_sentence_end=True) for text in texts]
+    if backend == "kokoro":
+        return _synthesize_kokoro_batch(spoken_texts, volume=1.0, rate_ratio=rate_ratio)
+    results = []
+    for spoken in spoken_texts:
+        try:
+            wav_path, _label, _can_cache = _synthesize_with_piper(spoken, volume=1.0, rate_ratio=rate_ratio)
+            results.append((wav_path, None))
+        except Exception as exc:
+            results.append(("", exc))
+    return results
+
+
+def _discard_temp_wav(path):
+    try:
+        os.remove(path)
+    except Exception:
+        pass
+
+
 def precache_word_audio_async(words, source_path=None, rate_ratio=1.0, on_progress=None, on_done=None):
     _ensure_runtime_initialized()
+    with _lock:
+        _runtime_state.precache_token += 1
+        my_token = _runtime_state.precache_token
     items = []
     seen = set()
     for word in words or []:
@@ -2827,6 +3167,9 @@ def precache_word_audio_async(words, source_path=None, rate_ratio=1.0, on_progre
         seen.add(key)
         items.append(text)
 
+    def _is_cancelled():
+        return my_token != _runtime_state.precache_token
+
     def _emit_progress(done_count, total_count, current_text):
         if callable(on_progress):
             try:
@@ -2854,11 +3197,34 @@ def precache_word_audio_async(words, source_path=None, rate_ratio=1.0, on_progre
         pending_count = 0
         error_count = 0
         total_count = len(items)
-        for index, text in enumerate(items, start=1):
+        done_count = 0
+        progress_lock = threading.Lock()
+
+        def _advance(text):
+            nonlocal done_count
+            with progress_lock:
+                done_count += 1
+                current = done_count
+            _emit_progress(current, total_count, text)
+
+        local_items = {backend: [] for backend in LOCAL_PRECACHE_BACKENDS}
+        for text in items:
+            if _is_cancelled():
+                break
+            backend = _selected_word_backend_key(text, source_path=source_path, short_text=True)
+            if backend in local_items:
+                local_items[backend].append(
+                    {
+                        "text": text,
+                        "backend": backend,
+                        "cache_path": _word_cache_path(text, source_path=source_path),
+                    }
+                )
+                continue
             cache_path = _ensure_source_gemini_cache(text, source_path=source_path)
             if _has_valid_gemini_cache(cache_path):
                 skipped_count += 1
-                _emit_progress(index, total_count, text)
+                _advance(text)
                 continue
             try:
                 if not _is_pending_gemini(cache_path):
@@ -2873,10 +3239,55 @@ def precache_word_audio_async(words, source_path=None, rate_ratio=1.0, on_progre
                     text=text,
                     error=exc,
                 )
-            _emit_progress(index, total_count, text)
+            _advance(text)
+
+        for backend, backend_items in local_items.items():
+            if not backend_items or _is_cancelled():
+                continue
+            worker_count = _local_precache_worker_count(backend, max_workers=LOCAL_PRECACHE_MAX_WORKERS)
+            batch_size = 1
+            if backend == "kokoro":
+                batch_size = max(1, min(KOKORO_BATCH_SIZE, -(-len(backend_items) // worker_count)))
+            started_at = time.perf_counter()
+            counts = _run_local_precache(
+                backend_items,
+                worker_count=worker_count,
+                is_cancelled=_is_cancelled,
+                has_local_cache=_has_local_word_cache,
+                batch_size=batch_size,
+                synthesize_batch=lambda texts, item_backend: _synthesize_local_precache_batch(
+                    texts, item_backend, rate_ratio
+                ),
+                save_item=lambda cache_path, wav_path, *, text, backend: _save_word_cache_file(
+                    cache_path,
+                    wav_path,
+                    text=text,
+                    source_path=source_path,
+                    backend=backend,
+                    desired_backend=backend,
+                ),
+                discard_temp=_discard_temp_wav,
+                on_item_done=_advance,
+                log_warning=_log_warning,
+            )
+            success_count += counts["success"]
+            skipped_count += counts["skipped"]
+            error_count += counts["error"]
+            _log_info(
+                "tts_local_precache_done",
+                backend=backend,
+                workers=worker_count,
+                items=len(backend_items),
+                generated=counts["success"],
+                cached=counts["skipped"],
+                failed=counts["error"],
+                cancelled=_is_cancelled(),
+                elapsed_ms=int((time.perf_counter() - started_at) * 1000),
+            )
         _emit_done(success_count, skipped_count, pending_count, error_count)
 
     threading.Thread(target=_run, daemon=True).start()
+    return my_token
 
 
 def prepare_async():
@@ -2884,6 +3295,20 @@ def prepare_async():
     return None
 
 
+def warm_up_local_model(backend):
+    if backend == "kokoro":
+        if get_voice_source() != SOURCE_KOKORO or not kokoro_ready():
+            return False
+        _ensure_kokoro()
+        return True
+    if backend == "piper":
+        if get_voice_source() != SOURCE_PIPER or not piper_ready():
+            return False
+        _ensure_piper_voice()
+        return True
+    raise ValueError(f"Unknown local model: {backend}")
+
+
 def get_runtime_label():
     _ensure_runtime_initialized()
     source = get_voice_source()
@@ -1,7 +1,105 @@
 # -*- coding: utf-8 -*-
+import io
 import os
 import tempfile
+import threading
 import wave
+from collections import OrderedDict
+from dataclasses import dataclass
+
+AUDIO_CACHE_FORMAT_EXTENSIONS = {"wav": ".wav", "flac": ".flac", "opus": ".opus"}
+COMPRESSED_AUDIO_EXTENSIONS = (".flac", ".opus")
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+AUDIO_CODEC_BLOCK_FRAMES = 16384
+
+
+def _soundfile():
+    try:
+        import soundfile
+    except Exception:
+        return None
+    return soundfile
+
+
+def compressed_audio_supported(audio_format):
+    audio_format = str(audio_format or "").strip().lower()
+    soundfile = _soundfile()
+    if soundfile is None:
+        return False
+    try:
+        if audio_format == "flac":
+            return "FLAC" in soundfile.available_formats()
+        if audio_format == "opus":
+            return "OPUS" in soundfile.available_subtypes("OGG")
+    except Exception:
+        return False
+    return False
+
+
+def is_compressed_audio(path):
+    return str(path or "").strip().lower().endswith(COMPRESSED_AUDIO_EXTENSIONS)
+
+
+def encode_wav_to_compressed(wav_path, audio_format):
+    audio_format = str(audio_format or "").strip().lower()
+    if audio_format not in {"flac", "opus"} or not compressed_audio_supported(audio_format):
+        return ""
+    import numpy as np
+
+    soundfile = _soundfile()
+    fd, temp_path = tempfile.mkstemp(prefix="wordspeaker_", suffix=AUDIO_CACHE_FORMAT_EXTENSIONS[audio_format])
+    os.close(fd)
+    try:
+        with wave.open(wav_path, "rb") as wav_fp:
+            channels = int(wav_fp.getnchannels() or 1)
+            sample_rate = int(wav_fp.getframerate() or 0)
+            if int(wav_fp.getsampwidth() or 0) != 2:
+                raise ValueError("Only 16-bit PCM can be compressed.")
+            if audio_format == "opus" and sample_rate not in OPUS_SAMPLE_RATES:
+                raise ValueError(f"Opus does not support {sample_rate} Hz.")
+            if audio_format == "opus":
+                out_fp = soundfile.SoundFile(temp_path, "w", sample_rate, channels, subtype="OPUS", format="OGG")
+            else:
+                out_fp = soundfile.SoundFile(temp_path, "w", sample_rate, channels, subtype="PCM_16", format="FLAC")
+            with out_fp:
+                while True:
+                    frames = wav_fp.readframes(AUDIO_CODEC_BLOCK_FRAMES)
+                    if not frames:
+                        break
+                    out_fp.write(np.frombuffer(frames, dtype="<i2").reshape(-1, channels))
+        return temp_path
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except Exception:
+            pass
+        return ""
+
+
+def decode_audio_to_wav(path, *, gain=1.0):
+    import numpy as np
+
+    soundfile = _soundfile()
+    if soundfile is None:
+        raise RuntimeError("soundfile is required to play compressed audio cache entries.")
+    fd, temp_path = tempfile.mkstemp(prefix="wordspeaker_", suffix=".wav")
+    os.close(fd)
+    try:
+        with soundfile.SoundFile(path, "r") as in_fp, wave.open(temp_path, "wb") as wav_fp:
+            wav_fp.setnchannels(int(in_fp.channels))
+            wav_fp.setsampwidth(2)
+            wav_fp.setframerate(int(in_fp.samplerate))
+            for block in in_fp.blocks(blocksize=AUDIO_CODEC_BLOCK_FRAMES, dtype="int16", always_2d=True):
+                if abs(gain - 1.0) > 1e-6:
+                    block = np.clip(block.astype(np.float32) * gain, -32768, 32767).astype(np.int16)
+                wav_fp.writeframes(block.astype("<i2", copy=False).tobytes())
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except Exception:
+            pass
+        raise
+    return temp_path
 
 
 def prepend_silence_to_wav(
@@ -40,6 +138,12 @@ def prepend_silence_to_wav(
 
 
 def wav_duration_seconds(path):
+    if is_compressed_audio(path):
+        soundfile = _soundfile()
+        try:
+            return max(0.0, float(soundfile.info(path).duration)) if soundfile else 0.0
+        except Exception:
+            return 0.0
     try:
         with wave.open(path, "rb") as wav_fp:
             frame_rate = int(wav_fp.getframerate() or 0)
@@ -58,3 +162,108 @@ def cleanup_temp_wavs(paths):
                 os.remove(wav_path)
         except Exception:
             pass
+
+
+@dataclass(frozen=True)
+class DecodedAudioClip:
+    pcm: bytes
+    channels: int
+    sample_width: int
+    sample_rate: int
+
+    @property
+    def duration_seconds(self):
+        frame_bytes = max(1, self.channels * self.sample_width)
+        return len(self.pcm) / float(frame_bytes * max(1, self.sample_rate))
+
+
+def _apply_pcm_gain(pcm_bytes, gain):
+    if abs(gain - 1.0) <= 1e-6:
+        return bytes(pcm_bytes)
+    import numpy as np
+
+    samples = np.frombuffer(pcm_bytes, dtype="<i2").astype(np.float32) * gain
+    return np.clip(samples, -32768, 32767).astype("<i2").tobytes()
+
+
+def read_audio_clip(path, *, gain=1.0):
+    if is_compressed_audio(path):
+        soundfile = _soundfile()
+        if soundfile is None:
+            raise RuntimeError("soundfile is required to play compressed audio cache entries.")
+        with soundfile.SoundFile(path, "r") as in_fp:
+            channels = int(in_fp.channels)
+            sample_rate = int(in_fp.samplerate)
+            pcm_bytes = in_fp.read(dtype="int16", always_2d=True).astype("<i2", copy=False).tobytes()
+        sample_width = 2
+    else:
+        with wave.open(path, "rb") as wav_fp:
+            channels = int(wav_fp.getnchannels() or 1)
+            sample_width = int(wav_fp.getsampwidth() or 2)
+            sample_rate = int(wav_fp.getframerate() or 0)
+            pcm_bytes = wav_fp.readframes(wav_fp.getnframes())
+    if sample_width == 2:
+        pcm_bytes = _apply_pcm_gain(pcm_bytes, max(0.0, float(gain)))
+    return DecodedAudioClip(pcm_bytes, channels, sample_width, sample_rate)
+
+
+def clip_to_wav_bytes(clip, *, silence_ms=0):
+    silence_frames = int(clip.sample_rate * max(0, int(silence_ms or 0)) / 1000.0)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_fp:
+        wav_fp.setnchannels(clip.channels)
+        wav_fp.setsampwidth(clip.sample_width)
+        wav_fp.setframerate(clip.sample_rate)
+        if silence_frames > 0:
+            wav_fp.writeframes(b"\x00" * silence_frames * clip.channels * clip.sample_width)
+        wav_fp.writeframes(clip.pcm)
+    return buffer.getvalue()
+
+
+class DecodedAudioLru:
+    def __init__(self, max_bytes):
+        self.max_bytes = max(0, int(max_bytes or 0))
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            clip = self._entries.get(key)
+            if clip is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return clip
+
+    def put(self, key, clip):
+        size = len(clip.pcm)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.pcm)
+            self._entries[key] = clip
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _evicted_key, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.pcm)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -48,7 +48,7 @@ def _cache_sort_key(
     updated_at = int(metadata.get("updated_at") or 0)
     pending = 1 if is_pending_gemini(cache_path) else 0
     playable = 1 if resolve_cache_audio_path(cache_path) else 0
-    actual_wav = 1 if os.path.exists(cache_path) else 0
+    actual_wav = 1 if metadata.get("blob_sha1") or os.path.exists(cache_path) else 0
     try:
         latest_mtime = max(
             os.path.getmtime(path)
@@ -239,110 +239,97 @@ def migrate_legacy_word_wrapper_layout(
 
 def collapse_existing_lightweight_source_caches(
     *,
-    source_word_cache_root_dir,
-    load_json_file,
+    iter_cache_metadata,
     normalize_source_path,
     infer_text_from_cache_filename,
     current_online_provider,
     resolve_cache_audio_path,
     alias_source_cache_to_shared,
 ):
-    if not os.path.isdir(source_word_cache_root_dir):
-        return
-    for root, _, names in os.walk(source_word_cache_root_dir):
-        for name in names:
-            if not name.lower().endswith(".wav.json"):
-                continue
-            meta_path = os.path.join(root, name)
-            cache_path = meta_path[:-5]
-            metadata = load_json_file(meta_path, {})
-            if not isinstance(metadata, dict):
-                continue
-            source_path = normalize_source_path(metadata.get("source_path"))
-            if source_path == "shared":
-                continue
-            text_value = infer_text_from_cache_filename(cache_path, metadata)
-            if not text_value:
-                continue
-            linked_shared = str(metadata.get("linked_shared_path") or "").strip()
-            backend = str(metadata.get("backend") or "").strip().lower()
-            desired_backend = str(metadata.get("desired_backend") or "").strip().lower()
-            if linked_shared:
-                alias_source_cache_to_shared(
-                    text_value,
-                    source_path=source_path,
-                    shared_path=linked_shared,
-                    backend=backend or current_online_provider(),
-                    desired_backend=desired_backend or backend or current_online_provider(),
-                    metadata=metadata,
-                    cache_path=cache_path,
-                )
-                continue
-            playable_path = resolve_cache_audio_path(cache_path)
-            if not playable_path:
-                continue
-            try:
-                alias_source_cache_to_shared(
-                    text_value,
-                    source_path=source_path,
-                    backend=backend or current_online_provider(),
-                    desired_backend=desired_backend or backend or current_online_provider(),
-                    metadata=metadata,
-                    cache_path=cache_path,
-                )
-            except Exception:
-                continue
+    for cache_path, metadata in iter_cache_metadata("source"):
+        if not isinstance(metadata, dict):
+            continue
+        source_path = normalize_source_path(metadata.get("source_path"))
+        if source_path == "shared":
+            continue
+        text_value = infer_text_from_cache_filename(cache_path, metadata)
+        if not text_value:
+            continue
+        linked_shared = str(metadata.get("linked_shared_path") or "").strip()
+        backend = str(metadata.get("backend") or "").strip().lower()
+        desired_backend = str(metadata.get("desired_backend") or "").strip().lower()
+        if linked_shared:
+            alias_source_cache_to_shared(
+                text_value,
+                source_path=source_path,
+                shared_path=linked_shared,
+                backend=backend or current_online_provider(),
+                desired_backend=desired_backend or backend or current_online_provider(),
+                metadata=metadata,
+                cache_path=cache_path,
+            )
+            continue
+        playable_path = resolve_cache_audio_path(cache_path)
+        if not playable_path:
+            continue
+        try:
+            alias_source_cache_to_shared(
+                text_value,
+                source_path=source_path,
+                backend=backend or current_online_provider(),
+                desired_backend=desired_backend or backend or current_online_provider(),
+                metadata=metadata,
+                cache_path=cache_path,
+            )
+        except Exception:
+            continue
 
 
 def collapse_all_source_cache_entities_to_aliases(
     *,
-    source_word_cache_root_dir,
-    load_cache_metadata,
+    iter_cache_metadata,
     normalize_source_path,
     infer_text_from_cache_filename,
     current_online_provider,
     alias_source_cache_to_shared,
 ):
-    if not os.path.isdir(source_word_cache_root_dir):
-        return 0
     collapsed = 0
-    for root, _, names in os.walk(source_word_cache_root_dir):
-        for name in names:
-            if not name.lower().endswith(".wav"):
-                continue
-            cache_path = os.path.join(root, name)
-            metadata = load_cache_metadata(cache_path)
-            if not isinstance(metadata, dict):
-                continue
-            source_path = normalize_source_path(metadata.get("source_path"))
-            if source_path == "shared":
-                continue
-            text_value = infer_text_from_cache_filename(cache_path, metadata)
-            if not text_value:
-                continue
-            backend = str(metadata.get("backend") or "").strip().lower()
-            desired_backend = str(metadata.get("desired_backend") or backend or current_online_provider()).strip().lower()
-            try:
-                alias_path = alias_source_cache_to_shared(
-                    text_value,
-                    source_path=source_path,
-                    backend=backend or current_online_provider(),
-                    desired_backend=desired_backend or backend or current_online_provider(),
-                    metadata=metadata,
-                    cache_path=cache_path,
-                )
-                if alias_path:
-                    collapsed += 1
-            except Exception:
-                continue
+    for cache_path, metadata in iter_cache_metadata("source"):
+        if not isinstance(metadata, dict):
+            continue
+        if str(metadata.get("linked_shared_path") or "").strip():
+            continue
+        if not (metadata.get("blob_sha1") or os.path.exists(cache_path)):
+            continue
+        source_path = normalize_source_path(metadata.get("source_path"))
+        if source_path == "shared":
+            continue
+        text_value = infer_text_from_cache_filename(cache_path, metadata)
+        if not text_value:
+            continue
+        backend = str(metadata.get("backend") or "").strip().lower()
+        desired_backend = str(metadata.get("desired_backend") or backend or current_online_provider()).strip().lower()
+        try:
+            alias_path = alias_source_cache_to_shared(
+                text_value,
+                source_path=source_path,
+                backend=backend or current_online_provider(),
+                desired_backend=desired_backend or backend or current_online_provider(),
+                metadata=metadata,
+                cache_path=cache_path,
+            )
+            if alias_path:
+                collapsed += 1
+        except Exception:
+            continue
     return collapsed
 
 
 def cleanup_duplicate_source_cache_entries(
     *,
     source_word_cache_root_dir,
-    shared_word_cache_dir,
-    load_cache_metadata,
+    iter_cache_metadata,
+    find_linked_cache_metadata,
     normalize_text,
     normalize_source_path,
     is_pending_gemini,
@@ -355,25 +342,14 @@ def cleanup_duplicate_source_cache_entries(
     save_cache_metadata,
     enqueue_existing_cache_for_online_replacement,
 ):
-    def collect_grouped(root_dir, root_kind):
+    def collect_grouped(root_kind):
         grouped = {}
-        if not os.path.isdir(root_dir):
-            return grouped
-        for root, _, names in os.walk(root_dir):
-            for name in names:
-                lower_name = name.lower()
-                if lower_name.endswith(".wav"):
-                    cache_path = os.path.join(root, name)
-                elif lower_name.endswith(".wav.json"):
-                    cache_path = os.path.join(root, name[:-5])
-                else:
-                    continue
-                metadata = load_cache_metadata(cache_path)
-                bucket = _cache_group_source_bucket(cache_path, source_word_cache_root_dir=source_word_cache_root_dir) if root_kind == "source" else "shared"
-                key = _cache_group_key(cache_path, metadata, normalize_text=normalize_text)
-                if not (bucket and key):
-                    continue
-                grouped.setdefault((bucket, key), {})[cache_path] = metadata
+        for cache_path, metadata in iter_cache_metadata(root_kind):
+            bucket = _cache_group_source_bucket(cache_path, source_word_cache_root_dir=source_word_cache_root_dir) if root_kind == "source" else "shared"
+            key = _cache_group_key(cache_path, metadata, normalize_text=normalize_text)
+            if not (bucket and key):
+                continue
+            grouped.setdefault((bucket, key), {})[cache_path] = metadata
         return grouped
 
     def remove_cache_entry(cache_path):
@@ -395,12 +371,9 @@ def cleanup_duplicate_source_cache_entries(
         remove_pending_gemini(cache_path)
         return removed_local
 
-    if not os.path.isdir(source_word_cache_root_dir) and not os.path.isdir(shared_word_cache_dir):
-        return 0
-
     removed = 0
     shared_path_rewrites = {}
-    shared_grouped = collect_grouped(shared_word_cache_dir, "shared")
+    shared_grouped = collect_grouped("shared")
     for (_bucket, _key), item_map in shared_grouped.items():
         cache_paths = list(item_map.keys())
         if len(cache_paths) <= 1:
@@ -422,23 +395,14 @@ def cleanup_duplicate_source_cache_entries(
             shared_path_rewrites[cache_path] = keep_path
             removed += remove_cache_entry(cache_path)
 
-    if shared_path_rewrites and os.path.isdir(source_word_cache_root_dir):
-        for root, _, names in os.walk(source_word_cache_root_dir):
-            for name in names:
-                if not name.lower().endswith(".wav.json"):
-                    continue
-                cache_path = os.path.join(root, name[:-5])
-                metadata = load_cache_metadata(cache_path)
-                if not isinstance(metadata, dict):
-                    continue
-                linked_shared = str(metadata.get("linked_shared_path") or "").strip()
-                rewritten = shared_path_rewrites.get(linked_shared)
-                if not rewritten:
-                    continue
-                metadata["linked_shared_path"] = rewritten
-                save_cache_metadata(cache_path, metadata)
+    for old_shared_path, rewritten in shared_path_rewrites.items():
+        for cache_path, metadata in find_linked_cache_metadata(old_shared_path):
+            if not isinstance(metadata, dict):
+                continue
+            metadata["linked_shared_path"] = rewritten
+            save_cache_metadata(cache_path, metadata)
 
-    source_grouped = collect_grouped(source_word_cache_root_dir, "source")
+    source_grouped = collect_grouped("source")
     for (_bucket, _key), item_map in source_grouped.items():
         cache_paths = list(item_map.keys())
         if len(cache_paths) <= 1:
@@ -473,40 +437,25 @@ def cleanup_duplicate_source_cache_entries(
 
 def normalize_cache_metadata_texts(
     *,
-    shared_word_cache_dir,
-    source_word_cache_root_dir,
-    load_cache_metadata,
+    iter_cache_metadata,
     save_cache_metadata,
     normalize_text,
 ):
-    roots = []
-    if os.path.isdir(shared_word_cache_dir):
-        roots.append(("shared", shared_word_cache_dir))
-    if os.path.isdir(source_word_cache_root_dir):
-        roots.append(("source", source_word_cache_root_dir))
-    if not roots:
-        return 0
-
     updated = 0
-    for root_kind, root_dir in roots:
-        for root, _, names in os.walk(root_dir):
-            for name in names:
-                if not name.lower().endswith(".wav.json"):
-                    continue
-                cache_path = os.path.join(root, name[:-5])
-                metadata = load_cache_metadata(cache_path)
-                if not isinstance(metadata, dict):
-                    continue
-                normalized_guess = _infer_text_from_cache_filename(cache_path, {}, normalize_text=normalize_text)
-                if not normalized_guess:
-                    continue
-                payload = dict(metadata)
-                current_text = normalize_text(payload.get("text"), ensure_sentence_end=False)
-                if current_text == normalized_guess and payload.get("text") == normalized_guess:
-                    continue
-                payload["text"] = normalized_guess
-                if root_kind == "shared":
-                    payload["source_path"] = "shared"
-                save_cache_metadata(cache_path, payload)
-                updated += 1
+    for root_kind in ("shared", "source"):
+        for cache_path, metadata in iter_cache_metadata(root_kind):
+            if not isinstance(metadata, dict):
+                continue
+            normalized_guess = _infer_text_from_cache_filename(cache_path, {}, normalize_text=normalize_text)
+            if not normalized_guess:
+                continue
+            payload = dict(metadata)
+            current_text = normalize_text(payload.get("text"), ensure_sentence_end=False)
+            if current_text == normalized_guess and payload.get("text") == normalized_guess:
+                continue
+            payload["text"] = normalized_guess
+            if root_kind == "shared":
+                payload["source_path"] = "shared"
+            save_cache_metadata(cache_path, payload)
+            updated += 1
     return updated
@@ -1,6 +1,8 @@
+import math
 import os
 import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 
 def run_pending_online_worker(
@@ -9,8 +11,10 @@ def run_pending_online_worker(
     next_pending_item,
     remove_pending_item,
     normalize_text,
-    current_online_provider,
-    wait_for_queue_slot,
+    pending_item_provider,
+    try_acquire_queue_slot,
+    release_queue_slot,
+    max_workers,
     log_info,
     log_warning,
     log_error,
@@ -21,6 +25,7 @@ def run_pending_online_worker(
     record_queue_soft_failure,
     set_queue_status,
     save_word_cache_file,
+    resolve_cache_audio_path,
     secondary_online_provider,
     get_fallback_key,
     synthesize_with_online_provider,
@@ -32,82 +37,131 @@ def run_pending_online_worker(
     online_queue_manager,
     refresh_queue_status_counts,
 ):
-    try:
-        while True:
-            next_item = next_pending_item()
-            if not next_item:
-                return
-            cache_path_local, item = next_item
-            if not isinstance(item, dict):
-                remove_pending_item(cache_path_local)
-                continue
-            normalized_text = normalize_text(item.get("text"), ensure_sentence_end=False)
-            source_path = str(item.get("source_path") or "").strip() or None
-            if not normalized_text:
-                remove_pending_item(cache_path_local)
-                continue
-            desired_backend = str(item.get("desired_backend") or current_online_provider()).strip().lower()
-            if desired_backend not in {"gemini", "elevenlabs"}:
-                desired_backend = current_online_provider()
+    claimed = set()
+    claimed_lock = threading.Lock()
+
+    def _process_item(cache_path_local, normalized_text, source_path, desired_backend):
+        try:
+            log_info(
+                "tts_queue_item_start",
+                provider=desired_backend,
+                cache_path=cache_path_local,
+                source_path=source_path or "",
+                text=normalized_text[:120],
+            )
+            wav_path, _label, _can_cache = (
+                synthesize_elevenlabs(normalized_text, volume=1.0, short_text=True)
+                if desired_backend == "elevenlabs"
+                else synthesize_gemini(normalized_text, volume=1.0, short_text=True)
+            )
+            record_queue_success(desired_backend)
+            set_queue_status(
+                state="ok",
+                next_retry_at=0.0,
+                last_success_at=time.time(),
+                last_error="",
+            )
             try:
-                wait_for_queue_slot(provider=desired_backend)
-                log_info(
-                    "tts_queue_item_start",
-                    provider=desired_backend,
-                    cache_path=cache_path_local,
-                    source_path=source_path or "",
-                    text=normalized_text[:120],
-                )
-                wav_path, _label, _can_cache = (
-                    synthesize_elevenlabs(normalized_text, volume=1.0, short_text=True)
-                    if desired_backend == "elevenlabs"
-                    else synthesize_gemini(normalized_text, volume=1.0, short_text=True)
-                )
-                record_queue_success(desired_backend)
-                set_queue_status(
-                    state="ok",
-                    next_retry_at=0.0,
-                    last_success_at=time.time(),
-                    last_error="",
+                save_word_cache_file(
+                    cache_path_local,
+                    wav_path,
+                    text=normalized_text,
+                    source_path=source_path,
+                    backend=desired_backend,
+                    desired_backend=desired_backend,
                 )
+            finally:
+                try:
+                    os.remove(wav_path)
+                except Exception:
+                    pass
+            remove_pending_item(cache_path_local)
+            log_info("tts_queue_item_done", provider=desired_backend, cache_path=cache_path_local)
+        except Exception as exc:
+            log_warning(
+                "tts_queue_item_failed",
+                provider=desired_backend,
+                cache_path=cache_path_local,
+                error=exc,
+            )
+            secondary_backend = secondary_online_provider(desired_backend)
+            primary_rate_limited = is_rate_limited_error(exc)
+            if primary_rate_limited:
+                record_queue_rate_limit(desired_backend)
+            else:
+                record_queue_soft_failure(desired_backend)
+            if secondary_backend:
                 try:
-                    save_word_cache_file(
-                        cache_path_local,
-                        wav_path,
-                        text=normalized_text,
-                        source_path=source_path,
-                        backend=desired_backend,
-                        desired_backend=desired_backend,
+                    fallback_key = get_fallback_key(secondary_backend)
+                    wav_path, _label, _can_cache = synthesize_with_online_provider(
+                        normalized_text,
+                        volume=1.0,
+                        short_text=True,
+                        provider=secondary_backend,
+                        api_key=fallback_key,
                     )
-                finally:
                     try:
-                        os.remove(wav_path)
-                    except Exception:
-                        pass
-                remove_pending_item(cache_path_local)
-                log_info("tts_queue_item_done", provider=desired_backend, cache_path=cache_path_local)
-            except Exception as exc:
-                log_warning(
-                    "tts_queue_item_failed",
-                    provider=desired_backend,
-                    cache_path=cache_path_local,
-                    error=exc,
+                        save_word_cache_file(
+                            cache_path_local,
+                            wav_path,
+                            text=normalized_text,
+                            source_path=source_path,
+                            backend=secondary_backend,
+                            desired_backend=desired_backend,
+                        )
+                    finally:
+                        try:
+                            os.remove(wav_path)
+                        except Exception:
+                            pass
+                    record_queue_success(secondary_backend)
+                    log_info(
+                        "tts_queue_item_fallback_success",
+                        provider=desired_backend,
+                        fallback_provider=secondary_backend,
+                        cache_path=cache_path_local,
+                    )
+                    if primary_rate_limited:
+                        cooldown_seconds = rate_limit_cooldown_for_provider(desired_backend)
+                        defer_queue(
+                            cooldown_seconds,
+                            state="rate_limited",
+                            provider=desired_backend,
+                        )
+                        set_queue_status(
+                            last_error=str(exc),
+                            next_retry_at=time.time() + cooldown_seconds,
+                        )
+                    else:
+                        set_queue_status(
+                            state="ok",
+                            next_retry_at=time.time() + queue_interval_for_provider(desired_backend),
+                            last_success_at=time.time(),
+                            last_error="",
+                        )
+                    return
+                except Exception as fallback_exc:
+                    record_queue_soft_failure(secondary_backend)
+                    log_error(
+                        "tts_queue_item_fallback_failed",
+                        provider=desired_backend,
+                        fallback_provider=secondary_backend,
+                        cache_path=cache_path_local,
+                        error=fallback_exc,
+                    )
+            if primary_rate_limited:
+                cooldown_seconds = rate_limit_cooldown_for_provider(desired_backend)
+                set_queue_status(
+                    state="rate_limited",
+                    next_retry_at=time.time() + cooldown_seconds,
+                    last_error=str(exc),
                 )
-                secondary_backend = secondary_online_provider(desired_backend)
-                primary_rate_limited = is_rate_limited_error(exc)
-                if primary_rate_limited:
-                    record_queue_rate_limit(desired_backend)
-                else:
-                    record_queue_soft_failure(desired_backend)
-                if secondary_backend:
+                if not resolve_cache_audio_path(cache_path_local):
                     try:
-                        fallback_key = get_fallback_key(secondary_backend)
-                        wav_path, _label, _can_cache = synthesize_with_online_provider(
+                        (wav_path, _label, _can_cache), placeholder_backend = synthesize_local_placeholder(
                             normalized_text,
                             volume=1.0,
-                            short_text=True,
-                            provider=secondary_backend,
-                            api_key=fallback_key,
+                            rate_ratio=1.0,
                         )
                         try:
                             save_word_cache_file(
@@ -115,104 +169,85 @@ def run_pending_online_worker(
                                 wav_path,
                                 text=normalized_text,
                                 source_path=source_path,
-                                backend=secondary_backend,
+                                backend=placeholder_backend,
                                 desired_backend=desired_backend,
                             )
                         finally:
                             try:
                                 os.remove(wav_path)
-                            except Exception:
-                                pass
-                        record_queue_success(secondary_backend)
-                        log_info(
-                            "tts_queue_item_fallback_success",
+                            except Exception as cleanup_exc:
+                                log_warning("tts_queue_placeholder_cleanup_failed", path=wav_path, error=cleanup_exc)
+                    except Exception as placeholder_exc:
+                        log_warning(
+                            "tts_queue_placeholder_fallback_failed",
                             provider=desired_backend,
-                            fallback_provider=secondary_backend,
                             cache_path=cache_path_local,
+                            error=placeholder_exc,
                         )
-                        if primary_rate_limited:
-                            cooldown_seconds = rate_limit_cooldown_for_provider(desired_backend)
-                            defer_queue(
-                                cooldown_seconds,
-                                state="rate_limited",
-                                provider=desired_backend,
-                            )
-                            set_queue_status(
-                                last_error=str(exc),
-                                next_retry_at=time.time() + cooldown_seconds,
-                            )
-                        else:
-                            set_queue_status(
-                                state="ok",
-                                next_retry_at=time.time() + queue_interval_for_provider(desired_backend),
-                                last_success_at=time.time(),
-                                last_error="",
-                            )
-                        continue
-                    except Exception as fallback_exc:
-                        record_queue_soft_failure(secondary_backend)
-                        log_error(
-                            "tts_queue_item_fallback_failed",
-                            provider=desired_backend,
-                            fallback_provider=secondary_backend,
-                            cache_path=cache_path_local,
-                            error=fallback_exc,
-                        )
-                if primary_rate_limited:
-                    cooldown_seconds = rate_limit_cooldown_for_provider(desired_backend)
-                    set_queue_status(
-                        state="rate_limited",
-                        next_retry_at=time.time() + cooldown_seconds,
-                        last_error=str(exc),
-                    )
-                    if not os.path.exists(cache_path_local):
-                        try:
-                            (wav_path, _label, _can_cache), placeholder_backend = synthesize_local_placeholder(
-                                normalized_text,
-                                volume=1.0,
-                                rate_ratio=1.0,
-                            )
-                            try:
-                                save_word_cache_file(
-                                    cache_path_local,
-                                    wav_path,
-                                    text=normalized_text,
-                                    source_path=source_path,
-                                    backend=placeholder_backend,
-                                    desired_backend=desired_backend,
-                                )
-                            finally:
-                                try:
-                                    os.remove(wav_path)
-                                except Exception as cleanup_exc:
-                                    log_warning("tts_queue_placeholder_cleanup_failed", path=wav_path, error=cleanup_exc)
-                        except Exception as placeholder_exc:
-                            log_warning(
-                                "tts_queue_placeholder_fallback_failed",
-                                provider=desired_backend,
-                                cache_path=cache_path_local,
-                                error=placeholder_exc,
-                            )
-                    log_warning(
-                        "tts_queue_item_rate_limited",
-                        provider=desired_backend,
-                        cache_path=cache_path_local,
-                        cooldown_seconds=cooldown_seconds,
-                    )
-                    threading.Event().wait(cooldown_seconds)
-                    continue
-                set_queue_status(
-                    state="error",
-                    next_retry_at=0.0,
-                    last_error=str(exc),
-                )
-                log_error(
-                    "tts_queue_item_abandoned",
+                log_warning(
+                    "tts_queue_item_rate_limited",
                     provider=desired_backend,
                     cache_path=cache_path_local,
-                    error=exc,
+                    cooldown_seconds=cooldown_seconds,
+                )
+                defer_queue(cooldown_seconds, state="rate_limited", provider=desired_backend)
+                return
+            set_queue_status(
+                state="error",
+                next_retry_at=0.0,
+                last_error=str(exc),
+            )
+            log_error(
+                "tts_queue_item_abandoned",
+                provider=desired_backend,
+                cache_path=cache_path_local,
+                error=exc,
+            )
+            remove_pending_item(cache_path_local)
+        finally:
+            release_queue_slot(provider=desired_backend)
+            with claimed_lock:
+                claimed.discard(cache_path_local)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, int(max_workers or 1)), thread_name_prefix="tts-queue") as pool:
+            running = set()
+            provider_waits = {}
+            while True:
+                running = {future for future in running if not future.done()}
+                with claimed_lock:
+                    exclude = set(claimed)
+                next_item = next_pending_item(exclude=exclude, exclude_providers=set(provider_waits))
+                if not next_item:
+                    if not running and (not provider_waits or not next_pending_item(exclude=exclude)):
+                        return
+                    timed_waits = [value for value in provider_waits.values() if not math.isinf(value)]
+                    timeout = min(timed_waits) if timed_waits else None
+                    if running:
+                        wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    else:
+                        time.sleep(timeout if timeout is not None else 1.0)
+                    provider_waits.clear()
+                    continue
+                cache_path_local, item = next_item
+                if not isinstance(item, dict):
+                    remove_pending_item(cache_path_local)
+                    continue
+                normalized_text = normalize_text(item.get("text"), ensure_sentence_end=False)
+                source_path = str(item.get("source_path") or "").strip() or None
+                if not normalized_text:
+                    remove_pending_item(cache_path_local)
+                    continue
+                desired_backend = pending_item_provider(cache_path_local, item)
+                wait_seconds = try_acquire_queue_slot(provider=desired_backend)
+                if wait_seconds > 0:
+                    provider_waits[desired_backend] = wait_seconds
+                    continue
+                with claimed_lock:
+                    claimed.add(cache_path_local)
+                running.add(
+                    pool.submit(_process_item, cache_path_local, normalized_text, source_path, desired_backend)
                 )
-                remove_pending_item(cache_path_local)
     finally:
         runtime_state.pending_gemini_worker_running = False
         refresh_queue_status_counts()
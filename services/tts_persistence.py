@@ -2,6 +2,7 @@
 import json
 import os
 import shutil
+import sqlite3
 import threading
 
 
@@ -18,6 +19,18 @@ def load_json_file(path, default):
     return default
 
 
+def load_json_text(text, default):
+    try:
+        data = json.loads(text)
+        if isinstance(default, dict) and isinstance(data, dict):
+            return data
+        if isinstance(default, list) and isinstance(data, list):
+            return data
+    except Exception:
+        pass
+    return default
+
+
 def write_json_file(path, payload):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w", encoding="utf-8") as fp:
@@ -75,12 +88,240 @@ def migrate_pending_queue_path(new_path, legacy_path):
             pass
 
 
+class PendingQueueJournal:
+    def __init__(self, snapshot_path, journal_path, *, legacy_path="", compact_min_ops=256):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.legacy_path = legacy_path
+        self.compact_min_ops = int(compact_min_ops)
+        self._journal_ops = 0
+
+    def load(self):
+        entries = {}
+        for entry in load_pending_queue_disk_payload(self.snapshot_path, self.legacy_path):
+            if isinstance(entry, dict):
+                entries[str(entry.get("cache_path") or "").strip()] = entry
+        self._journal_ops = 0
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as fp:
+                lines = fp.readlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            record = load_json_text(line, {})
+            op = record.pop("op", "")
+            if op == "put":
+                entries[str(record.get("cache_path") or "").strip()] = record
+            elif op == "del":
+                entries.pop(str(record.get("cache_path") or "").strip(), None)
+            elif op == "clear":
+                entries.clear()
+            else:
+                continue
+            self._journal_ops += 1
+        entries.pop("", None)
+        return list(entries.values())
+
+    def append(self, records, *, live_count, snapshot_entries):
+        if not records:
+            return
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as fp:
+            fp.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+        self._journal_ops += len(records)
+        if self._journal_ops >= max(self.compact_min_ops, 2 * int(live_count or 0)):
+            self.compact(snapshot_entries())
+
+    def compact(self, entries):
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as fp:
+            json.dump(list(entries or []), fp, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.snapshot_path)
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self._journal_ops = 0
+        if self.legacy_path:
+            try:
+                if os.path.exists(self.legacy_path):
+                    os.remove(self.legacy_path)
+            except Exception:
+                pass
+
+
+CACHE_METADATA_SIDECAR_IMPORT_KEY = "sidecars_imported"
+
+
 class CacheMetadataStore:
-    def __init__(self, *, canonicalize, normalize_source_path):
+    def __init__(
+        self,
+        *,
+        canonicalize,
+        normalize_source_path,
+        db_path=None,
+        shared_root_dir="",
+        source_root_dir="",
+    ):
         self._canonicalize = canonicalize
         self._normalize_source_path = normalize_source_path
+        self._db_path = str(db_path or "").strip()
+        self._shared_root_dir = os.path.abspath(shared_root_dir) if shared_root_dir else ""
+        self._source_root_dir = os.path.abspath(source_root_dir) if source_root_dir else ""
         self._memory = {}
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is not None:
+            return self._conn
+        if not self._db_path:
+            return None
+        os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_metadata (
+                cache_path TEXT PRIMARY KEY,
+                root_kind TEXT NOT NULL DEFAULT '',
+                source_bucket TEXT NOT NULL DEFAULT '',
+                text_key TEXT NOT NULL DEFAULT '',
+                backend TEXT NOT NULL DEFAULT '',
+                desired_backend TEXT NOT NULL DEFAULT '',
+                linked_shared_path TEXT NOT NULL DEFAULT '',
+                updated_at INTEGER,
+                payload TEXT NOT NULL,
+                blob_sha1 TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(cache_metadata)")}
+        if "blob_sha1" not in columns:
+            conn.execute("ALTER TABLE cache_metadata ADD COLUMN blob_sha1 TEXT NOT NULL DEFAULT ''")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_metadata_text ON cache_metadata(text_key)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_metadata_bucket ON cache_metadata(root_kind, source_bucket)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_metadata_backend ON cache_metadata(backend)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_metadata_linked ON cache_metadata(linked_shared_path)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_metadata_blob ON cache_metadata(blob_sha1)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_metadata_state (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS audio_blobs (
+                sha1 TEXT PRIMARY KEY,
+                refcount INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+            """
+        )
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    def _bucket_for(self, cache_path):
+        path = os.path.abspath(str(cache_path or "").strip())
+        folded_path = os.path.normcase(path)
+        if self._shared_root_dir and folded_path.startswith(os.path.normcase(self._shared_root_dir + os.sep)):
+            return ("shared", "")
+        if self._source_root_dir and folded_path.startswith(os.path.normcase(self._source_root_dir + os.sep)):
+            rel_path = os.path.relpath(path, self._source_root_dir)
+            return ("source", rel_path.split(os.sep)[0])
+        return ("", "")
+
+    def _row_values(self, cache_path, payload):
+        root_kind, source_bucket = self._bucket_for(cache_path)
+        try:
+            updated_at = int(payload.get("updated_at") or 0) or None
+        except (TypeError, ValueError):
+            updated_at = None
+        return (
+            cache_path,
+            root_kind,
+            source_bucket,
+            str(payload.get("text") or "").strip().casefold(),
+            str(payload.get("backend") or "").strip().lower(),
+            str(payload.get("desired_backend") or "").strip().lower(),
+            str(payload.get("linked_shared_path") or "").strip(),
+            updated_at,
+            json.dumps(payload, ensure_ascii=False),
+            str(payload.get("blob_sha1") or "").strip().lower(),
+        )
+
+    def _normalize_payload(self, canonical_path, data):
+        payload = dict(data) if isinstance(data, dict) else {}
+        if not payload:
+            return payload
+        source_value = self._normalize_source_path(payload.get("source_path"))
+        if source_value != payload.get("source_path"):
+            payload["source_path"] = source_value
+        linked_shared = str(payload.get("linked_shared_path") or "").strip()
+        if linked_shared:
+            payload["linked_shared_path"] = self._canonicalize(linked_shared, metadata=payload)
+        default_online_backup = str(payload.get("default_online_backup_path") or "").strip()
+        if default_online_backup:
+            payload["default_online_backup_path"] = self._canonicalize(
+                default_online_backup,
+                metadata=payload,
+            )
+        payload["cache_path"] = canonical_path
+        return payload
+
+    def _adjust_blob_refs(self, conn, deltas):
+        changes = [(sha1, delta) for sha1, delta in deltas.items() if sha1 and delta]
+        if not changes:
+            return
+        conn.executemany(
+            """
+            INSERT INTO audio_blobs(sha1, refcount) VALUES (?, ?)
+            ON CONFLICT(sha1) DO UPDATE SET refcount = MAX(0, refcount + excluded.refcount)
+            """,
+            changes,
+        )
+
+    def _upsert(self, conn, rows):
+        rows = list({row[0]: row for row in rows}.values())
+        deltas = {}
+        for row in rows:
+            previous = conn.execute(
+                "SELECT blob_sha1 FROM cache_metadata WHERE cache_path = ?",
+                (row[0],),
+            ).fetchone()
+            old_blob = previous[0] if previous else ""
+            if old_blob != row[9]:
+                deltas[old_blob] = deltas.get(old_blob, 0) - 1
+                deltas[row[9]] = deltas.get(row[9], 0) + 1
+        conn.executemany(
+            """
+            INSERT INTO cache_metadata(
+                cache_path, root_kind, source_bucket, text_key, backend,
+                desired_backend, linked_shared_path, updated_at, payload, blob_sha1
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(cache_path) DO UPDATE SET
+                root_kind = excluded.root_kind,
+                source_bucket = excluded.source_bucket,
+                text_key = excluded.text_key,
+                backend = excluded.backend,
+                desired_backend = excluded.desired_backend,
+                linked_shared_path = excluded.linked_shared_path,
+                updated_at = excluded.updated_at,
+                payload = excluded.payload,
+                blob_sha1 = excluded.blob_sha1
+            """,
+            rows,
+        )
+        self._adjust_blob_refs(conn, deltas)
+
+    def _load_sidecar(self, canonical_path):
+        meta_path = cache_meta_path(canonical_path)
+        if not os.path.exists(meta_path):
+            return {}
+        return self._normalize_payload(canonical_path, load_json_file(meta_path, {}))
 
     def load(self, cache_path):
         canonical_path = self._canonicalize(cache_path)
@@ -91,41 +332,35 @@ class CacheMetadataStore:
             cached = self._memory.get(key)
             if isinstance(cached, dict):
                 return dict(cached)
-        data = load_json_file(cache_meta_path(canonical_path), {})
-        payload = data if isinstance(data, dict) else {}
-        if payload:
-            original_cache_path = str(payload.get("cache_path") or "").strip()
-            source_value = self._normalize_source_path(payload.get("source_path"))
-            if source_value != payload.get("source_path"):
-                payload["source_path"] = source_value
-            linked_shared = str(payload.get("linked_shared_path") or "").strip()
-            if linked_shared:
-                payload["linked_shared_path"] = self._canonicalize(linked_shared, metadata=payload)
-            default_online_backup = str(payload.get("default_online_backup_path") or "").strip()
-            if default_online_backup:
-                payload["default_online_backup_path"] = self._canonicalize(
-                    default_online_backup,
-                    metadata=payload,
-                )
-            payload["cache_path"] = canonical_path
-            if (
-                original_cache_path != canonical_path
-                or payload.get("source_path") != data.get("source_path")
-                or payload.get("linked_shared_path") != data.get("linked_shared_path")
-                or payload.get("default_online_backup_path") != data.get("default_online_backup_path")
-            ):
-                write_json_file(cache_meta_path(canonical_path), payload)
-        with self._lock:
+            conn = self._connection()
+            row = None
+            if conn is not None:
+                row = conn.execute(
+                    "SELECT payload FROM cache_metadata WHERE cache_path = ?",
+                    (key,),
+                ).fetchone()
+            if row:
+                payload = load_json_text(row[0], {})
+            elif conn is None:
+                payload = self._load_sidecar(key)
+            else:
+                payload = {}
             self._memory[key] = dict(payload)
         return payload
 
     def save(self, cache_path, metadata):
         cache_path = self._canonicalize(cache_path)
+        key = str(cache_path or "").strip()
         payload = dict(metadata or {})
         payload["cache_path"] = cache_path
-        write_json_file(cache_meta_path(cache_path), payload)
         with self._lock:
-            self._memory[str(cache_path or "").strip()] = dict(payload)
+            conn = self._connection()
+            if conn is None:
+                write_json_file(cache_meta_path(cache_path), payload)
+            else:
+                self._upsert(conn, [self._row_values(key, payload)])
+                conn.commit()
+            self._memory[key] = dict(payload)
 
     def remove(self, cache_path):
         cache_path = self._canonicalize(cache_path)
@@ -137,4 +372,255 @@ class CacheMetadataStore:
         except Exception:
             pass
         with self._lock:
+            conn = self._connection()
+            if conn is not None:
+                with conn:
+                    previous = conn.execute(
+                        "SELECT blob_sha1 FROM cache_metadata WHERE cache_path = ?",
+                        (key,),
+                    ).fetchone()
+                    conn.execute("DELETE FROM cache_metadata WHERE cache_path = ?", (key,))
+                    if previous:
+                        self._adjust_blob_refs(conn, {previous[0]: -1})
             self._memory.pop(key, None)
+
+    def import_sidecars(self, roots):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return 0
+            done = conn.execute(
+                "SELECT value FROM cache_metadata_state WHERE key = ?",
+                (CACHE_METADATA_SIDECAR_IMPORT_KEY,),
+            ).fetchone()
+            if done:
+                return 0
+            rows = []
+            for root_dir in roots or ():
+                if not root_dir or not os.path.isdir(root_dir):
+                    continue
+                for root, _, names in os.walk(root_dir):
+                    for name in names:
+                        if not name.lower().endswith(".wav.json"):
+                            continue
+                        meta_path = os.path.join(root, name)
+                        canonical_path = str(self._canonicalize(meta_path[:-5]) or "").strip()
+                        payload = self._normalize_payload(canonical_path, load_json_file(meta_path, {}))
+                        if canonical_path and payload:
+                            rows.append(self._row_values(canonical_path, payload))
+            rows = [
+                row
+                for row in rows
+                if not conn.execute("SELECT 1 FROM cache_metadata WHERE cache_path = ?", (row[0],)).fetchone()
+            ]
+            with conn:
+                self._upsert(conn, rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_metadata_state(key, value) VALUES (?, ?)",
+                    (CACHE_METADATA_SIDECAR_IMPORT_KEY, str(len(rows))),
+                )
+            self._memory.clear()
+        return len(rows)
+
+    def _query(self, where, params=()):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return []
+            rows = conn.execute(
+                f"SELECT cache_path, payload FROM cache_metadata WHERE {where} ORDER BY cache_path",
+                params,
+            ).fetchall()
+        return [(cache_path, load_json_text(payload, {})) for cache_path, payload in rows]
+
+    def entries(self, root_kind, source_bucket=None):
+        if source_bucket is None:
+            return self._query("root_kind = ?", (root_kind,))
+        return self._query("root_kind = ? AND source_bucket = ?", (root_kind, source_bucket))
+
+    def entries_linked_to(self, linked_shared_path):
+        key = str(linked_shared_path or "").strip()
+        if not key:
+            return []
+        return self._query("linked_shared_path = ?", (key,))
+
+    def entries_for_text(self, text, root_kind=None):
+        text_key = str(text or "").strip().casefold()
+        if root_kind is None:
+            return self._query("text_key = ?", (text_key,))
+        return self._query("text_key = ? AND root_kind = ?", (text_key, root_kind))
+
+    def remove_source_bucket(self, source_bucket):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return 0
+            with conn:
+                released = conn.execute(
+                    """
+                    SELECT blob_sha1, COUNT(*)
+                    FROM cache_metadata
+                    WHERE root_kind = 'source' AND source_bucket = ?
+                    GROUP BY blob_sha1
+                    """,
+                    (source_bucket,),
+                ).fetchall()
+                cursor = conn.execute(
+                    "DELETE FROM cache_metadata WHERE root_kind = 'source' AND source_bucket = ?",
+                    (source_bucket,),
+                )
+                self._adjust_blob_refs(conn, {sha1: -count for sha1, count in released})
+            for key in list(self._memory):
+                if self._bucket_for(key) == ("source", source_bucket):
+                    self._memory.pop(key, None)
+        return int(cursor.rowcount or 0)
+
+    def get_state(self, key):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            row = conn.execute("SELECT value FROM cache_metadata_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key, value):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_metadata_state(key, value) VALUES (?, ?)",
+                    (key, str(value)),
+                )
+
+    def blob_refcount(self, sha1):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return 0
+            row = conn.execute("SELECT refcount FROM audio_blobs WHERE sha1 = ?", (sha1,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def register_blob(self, sha1):
+        with self._lock:
+            conn = self._connection()
+            if conn is None or not sha1:
+                return
+            with conn:
+                conn.execute("INSERT OR IGNORE INTO audio_blobs(sha1, refcount) VALUES (?, 0)", (sha1,))
+
+    def take_unreferenced_blobs(self):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return []
+            with conn:
+                rows = conn.execute("SELECT sha1 FROM audio_blobs WHERE refcount <= 0").fetchall()
+                conn.execute("DELETE FROM audio_blobs WHERE refcount <= 0")
+        return [row[0] for row in rows]
+
+
+class AudioBlobStore:
+    BLOB_EXTENSIONS = (".wav", ".flac", ".opus")
+
+    def __init__(self, root_dir, *, sha1_file, encode_audio=None, decode_audio=None, register_blob=None):
+        self._root_dir = os.path.abspath(root_dir)
+        self._sha1_file = sha1_file
+        self._encode_audio = encode_audio
+        self._decode_audio = decode_audio
+        self._register_blob = register_blob
+        self._extensions = {}
+
+    def _existing_blob_path(self, sha1):
+        blob_dir = os.path.join(self._root_dir, sha1[:2])
+        ext = self._extensions.get(sha1)
+        if ext and os.path.exists(os.path.join(blob_dir, f"{sha1}{ext}")):
+            return os.path.join(blob_dir, f"{sha1}{ext}")
+        for ext in self.BLOB_EXTENSIONS:
+            candidate = os.path.join(blob_dir, f"{sha1}{ext}")
+            if os.path.exists(candidate):
+                self._extensions[sha1] = ext
+                return candidate
+        return ""
+
+    def blob_path(self, sha1):
+        sha1 = str(sha1 or "").strip().lower()
+        if not sha1:
+            return ""
+        return self._existing_blob_path(sha1) or os.path.join(self._root_dir, sha1[:2], f"{sha1}.wav")
+
+    def content_sha1(self, path):
+        if os.path.splitext(str(path))[1].lower() not in (".flac", ".opus") or not callable(self._decode_audio):
+            return self._sha1_file(path)
+        decoded_path = self._decode_audio(path)
+        try:
+            return self._sha1_file(decoded_path)
+        finally:
+            try:
+                os.remove(decoded_path)
+            except Exception:
+                pass
+
+    def sha1_for_path(self, path):
+        path = os.path.abspath(str(path or "").strip())
+        if not path.startswith(self._root_dir + os.sep):
+            return ""
+        stem, ext = os.path.splitext(os.path.basename(path))
+        if ext.lower() in self.BLOB_EXTENSIONS and len(stem) == 40 and all(ch in "0123456789abcdef" for ch in stem):
+            return stem
+        return ""
+
+    def owns(self, path):
+        return bool(self.sha1_for_path(path))
+
+    def put_file(self, path, *, move=False, audio_format="wav"):
+        sha1 = self.sha1_for_path(path)
+        if sha1 and os.path.exists(path):
+            return sha1
+        sha1 = self.content_sha1(path)
+        if callable(self._register_blob):
+            self._register_blob(sha1)
+        if self._existing_blob_path(sha1):
+            if move and os.path.exists(path):
+                os.remove(path)
+            return sha1
+        staged_path = path
+        encoded = False
+        ext = os.path.splitext(str(path))[1].lower()
+        if ext == ".wav" and audio_format != "wav" and callable(self._encode_audio):
+            encoded_path = self._encode_audio(path, audio_format)
+            if encoded_path:
+                staged_path = encoded_path
+                encoded = True
+                ext = os.path.splitext(encoded_path)[1].lower()
+        if ext not in self.BLOB_EXTENSIONS:
+            ext = ".wav"
+        try:
+            target_path = os.path.join(self._root_dir, sha1[:2], f"{sha1}{ext}")
+            if not os.path.exists(target_path):
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                temp_path = f"{target_path}.{threading.get_ident()}.tmp"
+                if move or encoded:
+                    shutil.move(staged_path, temp_path)
+                else:
+                    shutil.copyfile(staged_path, temp_path)
+                os.replace(temp_path, target_path)
+            self._extensions[sha1] = ext
+        finally:
+            if encoded and os.path.exists(staged_path):
+                os.remove(staged_path)
+        if move and os.path.exists(path):
+            os.remove(path)
+        return sha1
+
+    def delete(self, sha1):
+        target_path = self.blob_path(sha1)
+        self._extensions.pop(str(sha1 or "").strip().lower(), None)
+        try:
+            if target_path and os.path.exists(target_path):
+                os.remove(target_path)
+                return True
+        except Exception:
+            pass
+        return False
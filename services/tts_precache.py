@@ -0,0 +1,100 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+LOCAL_PRECACHE_BACKENDS = ("kokoro", "piper")
+
+
+def local_precache_worker_count(backend, *, max_workers, cpu_count=None):
+    cores = int(cpu_count or os.cpu_count() or 2)
+    if backend == "piper":
+        wanted = max(1, cores // 2)
+    else:
+        wanted = max(1, cores // 4)
+    return max(1, min(int(max_workers or 1), wanted))
+
+
+def run_local_precache(
+    items,
+    *,
+    worker_count,
+    batch_size=1,
+    is_cancelled,
+    has_local_cache,
+    synthesize_batch,
+    save_item,
+    discard_temp,
+    on_item_done,
+    log_warning,
+):
+    counts = {"success": 0, "skipped": 0, "error": 0}
+    pending_items = list(items or [])
+
+    def _failed(item, error):
+        log_warning(
+            "tts_local_precache_item_failed",
+            backend=item["backend"],
+            cache_path=item["cache_path"],
+            text=item["text"][:120],
+            error=error,
+        )
+        return item, "error"
+
+    def _work(batch):
+        outcomes = []
+        todo = []
+        for item in batch:
+            if is_cancelled():
+                return outcomes
+            try:
+                if has_local_cache(item["cache_path"], item["backend"]):
+                    outcomes.append((item, "skipped"))
+                else:
+                    todo.append(item)
+            except Exception as exc:
+                outcomes.append(_failed(item, exc))
+        if not todo or is_cancelled():
+            return outcomes
+        try:
+            results = list(synthesize_batch([item["text"] for item in todo], todo[0]["backend"]))
+        except Exception as exc:
+            results = [("", exc)] * len(todo)
+        results.extend([("", RuntimeError("No audio was returned."))] * max(0, len(todo) - len(results)))
+        for item, (wav_path, error) in zip(todo, results):
+            try:
+                if error is not None or not wav_path:
+                    outcomes.append(_failed(item, error))
+                    continue
+                if is_cancelled():
+                    continue
+                save_item(item["cache_path"], wav_path, text=item["text"], backend=item["backend"])
+                outcomes.append((item, "success"))
+            except Exception as exc:
+                outcomes.append(_failed(item, exc))
+            finally:
+                if wav_path:
+                    discard_temp(wav_path)
+        return outcomes
+
+    if not pending_items:
+        return counts
+    size = max(1, int(batch_size or 1))
+    batches = [pending_items[start : start + size] for start in range(0, len(pending_items), size)]
+    workers = max(1, min(int(worker_count or 1), len(batches)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-precache") as pool:
+        iterator = iter(batches)
+        running = set()
+        while True:
+            while len(running) < workers * 2 and not is_cancelled():
+                batch = next(iterator, None)
+                if batch is None:
+                    break
+                running.add(pool.submit(_work, batch))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for item, outcome in future.result():
+                    counts[outcome] += 1
+                    on_item_done(item["text"])
+    return counts
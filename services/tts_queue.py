@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import heapq
+import math
 import threading
 import time
 
@@ -15,18 +17,36 @@ class OnlineTtsQueueManager:
             "worker_running": False,
             "queue_count": 0,
         }
-        self._attempt_lock = threading.Lock()
-        self._last_attempt_at = 0.0
         self._throttle_state_lock = threading.Lock()
         self._throttle_state = {
-            provider: {
-                "current_interval": float(config["base_interval"]),
-                "success_streak": 0,
-                "last_event": "idle",
-            }
-            for provider, config in self._throttle_config.items()
+            provider: self._initial_throttle_state(config) for provider, config in self._throttle_config.items()
         }
 
+    def _initial_throttle_state(self, config):
+        return {
+            "current_interval": float(config["base_interval"]),
+            "success_streak": 0,
+            "last_event": "idle",
+            "max_in_flight": max(1, int(config.get("base_concurrency") or 1)),
+            "in_flight": 0,
+            "tokens": 1.0,
+            "refilled_at": time.time(),
+            "blocked_until": 0.0,
+        }
+
+    def _state_for(self, key):
+        return self._throttle_state.setdefault(key, self._initial_throttle_state(self.throttle_config(key)))
+
+    def _refill_locked(self, key, now):
+        config = self.throttle_config(key)
+        state = self._state_for(key)
+        interval = max(0.001, float(state.get("current_interval") or config["base_interval"]))
+        burst = max(1.0, float(config.get("burst") or 1))
+        elapsed = max(0.0, now - float(state.get("refilled_at") or now))
+        state["tokens"] = min(burst, float(state.get("tokens") or 0.0) + elapsed / interval)
+        state["refilled_at"] = now
+        return state, interval
+
     def provider_key(self, provider):
         return "elevenlabs" if str(provider or "").strip().lower() == "elevenlabs" else "gemini"
 
@@ -43,16 +63,9 @@ class OnlineTtsQueueManager:
 
     def get_queue_throttle_snapshot(self, provider):
         key = self.provider_key(provider)
-        config = self.throttle_config(key)
         with self._throttle_state_lock:
-            state = dict(self._throttle_state.get(key) or {})
-        if not state:
-            state = {
-                "current_interval": float(config["base_interval"]),
-                "success_streak": 0,
-                "last_event": "idle",
-            }
-        return state
+            state, _interval = self._refill_locked(key, time.time())
+            return dict(state)
 
     def queue_interval_for_provider(self, provider):
         state = self.get_queue_throttle_snapshot(provider)
@@ -62,20 +75,17 @@ class OnlineTtsQueueManager:
         key = self.provider_key(provider)
         config = self.throttle_config(key)
         with self._throttle_state_lock:
-            state = self._throttle_state.setdefault(
-                key,
-                {
-                    "current_interval": float(config["base_interval"]),
-                    "success_streak": 0,
-                    "last_event": "idle",
-                },
-            )
+            state = self._state_for(key)
             state["success_streak"] = int(state.get("success_streak") or 0) + 1
             if state["success_streak"] >= int(config["success_streak"]):
                 state["current_interval"] = max(
                     float(config["min_interval"]),
                     float(state.get("current_interval") or config["base_interval"]) - float(config["success_step"]),
                 )
+                state["max_in_flight"] = min(
+                    max(1, int(config.get("max_concurrency") or 1)),
+                    int(state.get("max_in_flight") or 1) + 1,
+                )
                 state["success_streak"] = 0
             state["last_event"] = "success"
         self.set_status(last_success_at=time.time())
@@ -84,14 +94,7 @@ class OnlineTtsQueueManager:
         key = self.provider_key(provider)
         config = self.throttle_config(key)
         with self._throttle_state_lock:
-            state = self._throttle_state.setdefault(
-                key,
-                {
-                    "current_interval": float(config["base_interval"]),
-                    "success_streak": 0,
-                    "last_event": "idle",
-                },
-            )
+            state = self._state_for(key)
             state["success_streak"] = 0
             state["current_interval"] = min(
                 float(config["max_interval"]),
@@ -106,14 +109,7 @@ class OnlineTtsQueueManager:
         key = self.provider_key(provider)
         config = self.throttle_config(key)
         with self._throttle_state_lock:
-            state = self._throttle_state.setdefault(
-                key,
-                {
-                    "current_interval": float(config["base_interval"]),
-                    "success_streak": 0,
-                    "last_event": "idle",
-                },
-            )
+            state = self._state_for(key)
             state["success_streak"] = 0
             state["current_interval"] = min(
                 float(config["max_interval"]),
@@ -122,6 +118,8 @@ class OnlineTtsQueueManager:
                     float(state.get("current_interval") or config["base_interval"]) + float(config["rate_limit_step"]),
                 ),
             )
+            state["max_in_flight"] = max(1, int(state.get("max_in_flight") or 1) // 2)
+            state["tokens"] = min(0.0, float(state.get("tokens") or 0.0))
             state["last_event"] = "rate_limited"
 
     def refresh_counts(self, *, queue_count, worker_running):
@@ -129,26 +127,229 @@ class OnlineTtsQueueManager:
 
     def defer(self, wait_seconds, *, state=None, provider=None):
         wait_seconds = max(0.0, float(wait_seconds or 0.0))
-        interval_seconds = self.queue_interval_for_provider(provider)
-        with self._attempt_lock:
+        key = self.provider_key(provider)
+        with self._throttle_state_lock:
             now = time.time()
-            current_next = self._last_attempt_at + interval_seconds
-            target_next = max(current_next, now + wait_seconds)
-            self._last_attempt_at = target_next - interval_seconds
+            throttle_state, interval_seconds = self._refill_locked(key, now)
+            next_token_at = now + max(0.0, 1.0 - throttle_state["tokens"]) * interval_seconds
+            target_next = max(next_token_at, float(throttle_state.get("blocked_until") or 0.0), now + wait_seconds)
+            throttle_state["blocked_until"] = target_next
         updates = {"next_retry_at": target_next}
         if state:
             updates["state"] = state
         self.set_status(**updates)
 
-    def wait_for_slot(self, provider=None):
-        interval_seconds = self.queue_interval_for_provider(provider)
-        while True:
-            with self._attempt_lock:
-                now = time.time()
-                wait_seconds = interval_seconds - (now - self._last_attempt_at)
-                if wait_seconds <= 0:
-                    self._last_attempt_at = now
-                    return
-                next_retry_at = now + wait_seconds
-            self.set_status(state="ok", next_retry_at=next_retry_at)
-            threading.Event().wait(wait_seconds)
+    def try_acquire_slot(self, provider=None):
+        key = self.provider_key(provider)
+        with self._throttle_state_lock:
+            now = time.time()
+            state, interval_seconds = self._refill_locked(key, now)
+            blocked_until = float(state.get("blocked_until") or 0.0)
+            if blocked_until > now:
+                return blocked_until - now
+            if int(state.get("in_flight") or 0) >= int(state.get("max_in_flight") or 1):
+                return math.inf
+            if state["tokens"] < 1.0:
+                wait_seconds = (1.0 - state["tokens"]) * interval_seconds
+                self.set_status(state="ok", next_retry_at=now + wait_seconds)
+                return wait_seconds
+            state["tokens"] -= 1.0
+            state["in_flight"] = int(state.get("in_flight") or 0) + 1
+            return 0.0
+
+    def release_slot(self, provider=None):
+        key = self.provider_key(provider)
+        with self._throttle_state_lock:
+            state = self._state_for(key)
+            state["in_flight"] = max(0, int(state.get("in_flight") or 0) - 1)
+
+    def max_workers(self):
+        return sum(max(1, int(config.get("max_concurrency") or 1)) for config in self._throttle_config.values())
+
+
+class PendingOnlineQueue:
+    def __init__(self, *, entry_key, source_key, provider_key=None):
+        self._entry_key = entry_key
+        self._source_key = source_key
+        self._provider_key = provider_key or (lambda item: "")
+        self._items = {}
+        self._versions = {}
+        self._keys = {}
+        self._by_key = {}
+        self._by_source = {}
+        self._heap = []
+        self._source_heaps = {}
+        self._provider_heaps = {}
+        self._sequence = 0
+        self._stale = 0
+        self._ops = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, cache_path):
+        return cache_path in self._items
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __getitem__(self, cache_path):
+        return self._items[cache_path]
+
+    def __setitem__(self, cache_path, item):
+        self.put(cache_path, item)
+
+    def get(self, cache_path, default=None):
+        return self._items.get(cache_path, default)
+
+    def items(self):
+        return list(self._items.items())
+
+    def provider_of(self, cache_path, default=""):
+        keys = self._keys.get(cache_path)
+        return keys[2] if keys else default
+
+    def paths_for_source(self, source_key):
+        return sorted(self._by_source.get(source_key) or ())
+
+    def put(self, cache_path, item, *, prefer=None):
+        key, source, provider = self._entry_key(item), self._source_key(item), self._provider_key(item)
+        existing_path = self._by_key.get(key) if key[1] else None
+        if existing_path is not None and existing_path != cache_path:
+            if prefer is not None and not prefer(item, self._items[existing_path]):
+                return False
+            self._discard(existing_path)
+            self._ops.append(("del", existing_path))
+        if cache_path in self._items:
+            self._discard(cache_path)
+        self._sequence += 1
+        version = self._sequence
+        self._items[cache_path] = item
+        self._versions[cache_path] = version
+        self._keys[cache_path] = (key, source, provider)
+        if key[1]:
+            self._by_key[key] = cache_path
+        self._by_source.setdefault(source, set()).add(cache_path)
+        entry = (int(item.get("created_at") or 0), str(cache_path or ""), version)
+        heapq.heappush(self._heap, entry)
+        heapq.heappush(self._source_heaps.setdefault(source, []), entry)
+        heapq.heappush(self._provider_heaps.setdefault(provider, []), entry)
+        self._ops.append(("put", cache_path, item))
+        return True
+
+    def pop(self, cache_path, default=None):
+        if cache_path not in self._items:
+            return default
+        item = self._items[cache_path]
+        self._discard(cache_path)
+        self._ops.append(("del", cache_path))
+        return item
+
+    def clear(self):
+        self._items.clear()
+        self._versions.clear()
+        self._keys.clear()
+        self._by_key.clear()
+        self._by_source.clear()
+        self._heap = []
+        self._source_heaps = {}
+        self._provider_heaps = {}
+        self._stale = 0
+        self._ops.append(("clear",))
+
+    def drain_ops(self):
+        ops, self._ops = self._ops, []
+        return ops
+
+    def next_item(self, *, preferred_source=None, exclude=(), exclude_providers=()):
+        blocked = set(exclude_providers or ())
+        if preferred_source:
+            found = self._peek(self._source_heaps.get(preferred_source), exclude, blocked)
+            if found is not None:
+                return self._entry_item(found)
+        if not blocked:
+            return self._entry_item(self._peek(self._heap, exclude, blocked))
+        candidates = [
+            self._peek(heap, exclude, blocked)
+            for provider, heap in self._provider_heaps.items()
+            if provider not in blocked
+        ]
+        candidates = [entry for entry in candidates if entry is not None]
+        return self._entry_item(min(candidates)) if candidates else None
+
+    def _entry_item(self, entry):
+        if entry is None:
+            return None
+        cache_path = entry[1]
+        return (cache_path, self._items[cache_path])
+
+    def dedupe(self, *, prefer):
+        best = {}
+        for cache_path, item in self._items.items():
+            key = self._keys[cache_path][0]
+            if not key[1]:
+                continue
+            existing = best.get(key)
+            if existing is None or prefer(item, self._items[existing]):
+                best[key] = cache_path
+        keep = set(best.values())
+        dropped = [
+            cache_path
+            for cache_path in self._items
+            if self._keys[cache_path][0][1] and cache_path not in keep
+        ]
+        for cache_path in dropped:
+            self.pop(cache_path)
+        for key, cache_path in best.items():
+            self._by_key[key] = cache_path
+        return bool(dropped)
+
+    def _discard(self, cache_path):
+        self._items.pop(cache_path, None)
+        self._versions.pop(cache_path, None)
+        key, source, _provider = self._keys.pop(cache_path, (("", ""), "", ""))
+        if self._by_key.get(key) == cache_path:
+            self._by_key.pop(key, None)
+        paths = self._by_source.get(source)
+        if paths is not None:
+            paths.discard(cache_path)
+            if not paths:
+                self._by_source.pop(source, None)
+                self._source_heaps.pop(source, None)
+        self._stale += 1
+        if self._stale > 64 and self._stale > len(self._items):
+            self._rebuild_heaps()
+
+    def _rebuild_heaps(self):
+        self._heap = []
+        self._source_heaps = {}
+        self._provider_heaps = {}
+        for cache_path, item in self._items.items():
+            entry = (int(item.get("created_at") or 0), str(cache_path or ""), self._versions[cache_path])
+            _key, source, provider = self._keys[cache_path]
+            self._heap.append(entry)
+            self._source_heaps.setdefault(source, []).append(entry)
+            self._provider_heaps.setdefault(provider, []).append(entry)
+        heapq.heapify(self._heap)
+        for heap in (*self._source_heaps.values(), *self._provider_heaps.values()):
+            heapq.heapify(heap)
+        self._stale = 0
+
+    def _peek(self, heap, exclude, blocked_providers=()):
+        if not heap:
+            return None
+        skipped = []
+        found = None
+        while heap:
+            _created_at, cache_path, version = heap[0]
+            if self._versions.get(cache_path) != version:
+                heapq.heappop(heap)
+                continue
+            if cache_path in exclude or self._keys[cache_path][2] in blocked_providers:
+                skipped.append(heapq.heappop(heap))
+                continue
+            found = heap[0]
+            break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return found
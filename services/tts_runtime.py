@@ -23,15 +23,20 @@ class TtsRuntimeConfig:
     elevenlabs_rate_limit_cooldown_seconds: int = 45
     elevenlabs_manual_request_cooldown_seconds: int = 3
     kokoro_sample_rate: int = 24000
-    shared_cache_package_version: int = 2
+    shared_cache_package_version: int = 3
     shared_cache_package_manifest: str = "manifest.json"
     shared_cache_metadata_file: str = "global/metadata.json"
+    decoded_audio_cache_max_bytes: int = 64 * 1024 * 1024
+    local_precache_max_workers: int = 4
+    kokoro_batch_size: int = 16
+    stream_lookahead_chunks: int = 2
 
 
 @dataclass
 class TtsRuntimeState:
     lock: threading.Lock = field(default_factory=threading.Lock)
     token: int = 0
+    precache_token: int = 0
     shown_errors: set = field(default_factory=set)
     current_wav: str | None = None
     kokoro: object | None = None
@@ -40,7 +45,8 @@ class TtsRuntimeState:
     piper_lock: threading.Lock = field(default_factory=threading.Lock)
     backend_lock: threading.Lock = field(default_factory=threading.Lock)
     backend_status: dict = field(default_factory=dict)
-    pending_gemini_replacements: dict = field(default_factory=dict)
+    pending_gemini_replacements: object | None = None
+    pending_queue_journal: object | None = None
     pending_gemini_lock: threading.Lock = field(default_factory=threading.Lock)
     pending_gemini_worker_running: bool = False
     preferred_pending_source: str | None = None
@@ -50,6 +56,8 @@ class TtsRuntimeState:
     word_audio_override_memory: dict | None = None
     online_queue_manager: object | None = None
     cache_metadata_store: object | None = None
+    audio_blob_store: object | None = None
+    decoded_audio_cache: object | None = None
     error_notifier: object | None = None
     runtime_initialized: bool = False
     runtime_init_lock: threading.Lock = field(default_factory=threading.Lock)
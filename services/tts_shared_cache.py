@@ -6,6 +6,8 @@ import tempfile
 import time
 import zipfile
 
+from services.tts_audio import COMPRESSED_AUDIO_EXTENSIONS
+
 
 def export_shared_audio_cache_package(
     package_path,
@@ -44,22 +46,30 @@ def export_shared_audio_cache_package(
             meta_payload = dict(item["metadata"] or {})
             relative_path = item["relative_path"]
             meta_relative_path = item["meta_relative_path"]
-            arc_audio_path = zip_entry_path("global", relative_path)
+            audio_ext = os.path.splitext(audio_path)[1].lower()
+            audio_relative_path = relative_path
+            if audio_ext in COMPRESSED_AUDIO_EXTENSIONS:
+                audio_relative_path = f"{os.path.splitext(relative_path)[0]}{audio_ext}"
+            arc_audio_path = zip_entry_path("global", audio_relative_path)
             arc_meta_path = zip_entry_path("global", meta_relative_path)
-            zf.write(audio_path, arc_audio_path)
+            if audio_ext in COMPRESSED_AUDIO_EXTENSIONS:
+                zf.write(audio_path, arc_audio_path, compress_type=zipfile.ZIP_STORED)
+            else:
+                zf.write(audio_path, arc_audio_path)
             zf.writestr(arc_meta_path, json.dumps(meta_payload, ensure_ascii=False, indent=2))
             audio_size = int(os.path.getsize(audio_path)) if os.path.exists(audio_path) else 0
             total_bytes += audio_size
             manifest_entries.append(
                 {
                     "relative_path": relative_path,
+                    "audio_relative_path": audio_relative_path,
                     "meta_relative_path": meta_relative_path,
                     "text": str(meta_payload.get("text") or ""),
                     "backend": str(meta_payload.get("backend") or ""),
                     "desired_backend": str(meta_payload.get("desired_backend") or ""),
                     "updated_at": int(meta_payload.get("updated_at") or 0),
                     "audio_size": audio_size,
-                    "audio_sha1": sha1_file(audio_path),
+                    "audio_sha1": item.get("audio_sha1") or sha1_file(audio_path),
                 }
             )
 
@@ -99,6 +109,9 @@ def import_shared_audio_cache_package(
     sha1_file,
     load_cache_metadata,
     save_cache_metadata,
+    store_audio_blob,
+    discard_physical_cache_file,
+    audio_format_supported,
     import_shared_metadata_payload,
     cleanup_duplicate_source_cache_entries,
     collapse_existing_lightweight_source_caches,
@@ -149,7 +162,12 @@ def import_shared_audio_cache_package(
                 summary["errors"].append("Skipped one malformed cache entry.")
                 continue
 
-            arc_audio_path = zip_entry_path("global", relative_path)
+            audio_relative_path = safe_rel_path(entry.get("audio_relative_path")) or relative_path
+            audio_ext = os.path.splitext(audio_relative_path)[1].lower()
+            if audio_ext in COMPRESSED_AUDIO_EXTENSIONS and not audio_format_supported(audio_ext.lstrip(".")):
+                summary["errors"].append(f"Unsupported audio format for cache entry: {relative_path}")
+                continue
+            arc_audio_path = zip_entry_path("global", audio_relative_path)
             arc_meta_path = zip_entry_path("global", meta_relative_path)
             if arc_audio_path not in zf.namelist() or arc_meta_path not in zf.namelist():
                 summary["errors"].append(f"Missing files for cache entry: {relative_path}")
@@ -171,14 +189,14 @@ def import_shared_audio_cache_package(
 
             incoming_sha1 = str(entry.get("audio_sha1") or "").strip().lower()
             incoming_updated_at = int(entry.get("updated_at") or metadata.get("updated_at") or 0)
-            existing_sha1 = ""
+            existing_meta = load_cache_metadata(cache_path)
+            existing_sha1 = str((existing_meta or {}).get("blob_sha1") or "").strip().lower()
             existing_updated_at = 0
-            if os.path.exists(cache_path):
+            if not existing_sha1 and os.path.exists(cache_path):
                 try:
                     existing_sha1 = sha1_file(cache_path)
                 except Exception:
                     existing_sha1 = ""
-            existing_meta = load_cache_metadata(cache_path)
             if isinstance(existing_meta, dict):
                 try:
                     existing_updated_at = int(existing_meta.get("updated_at") or 0)
@@ -194,32 +212,29 @@ def import_shared_audio_cache_package(
                 if not isinstance(existing_meta, dict) or not existing_meta:
                     payload = dict(metadata)
                     payload["source_path"] = "shared"
-                    try:
-                        payload["updated_at"] = int(incoming_updated_at or os.path.getmtime(cache_path))
-                    except Exception:
-                        payload["updated_at"] = incoming_updated_at
+                    payload["blob_sha1"] = store_audio_blob(cache_path)
+                    payload["updated_at"] = int(incoming_updated_at or time.time())
                     save_cache_metadata(cache_path, payload)
                 summary["skipped_same"] += 1
                 continue
-            if os.path.exists(cache_path) and incoming_updated_at and existing_updated_at and incoming_updated_at < existing_updated_at:
+            if existing_sha1 and incoming_updated_at and existing_updated_at and incoming_updated_at < existing_updated_at:
                 summary["skipped_older"] += 1
                 continue
 
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            fd, temp_audio_path = tempfile.mkstemp(prefix="wordspeaker_import_", suffix=".wav")
+            fd, temp_audio_path = tempfile.mkstemp(
+                prefix="wordspeaker_import_",
+                suffix=audio_ext if audio_ext in COMPRESSED_AUDIO_EXTENSIONS else ".wav",
+            )
             os.close(fd)
             try:
                 with zf.open(arc_audio_path, "r") as src, open(temp_audio_path, "wb") as dst:
                     shutil.copyfileobj(src, dst)
-                shutil.copyfile(temp_audio_path, cache_path)
-                if incoming_updated_at > 0:
-                    try:
-                        os.utime(cache_path, (incoming_updated_at, incoming_updated_at))
-                    except Exception:
-                        pass
                 payload = dict(metadata)
+                payload.pop("linked_shared_path", None)
                 payload["source_path"] = "shared"
-                payload["updated_at"] = int(incoming_updated_at or os.path.getmtime(cache_path))
+                payload["blob_sha1"] = store_audio_blob(temp_audio_path)
+                payload["updated_at"] = int(incoming_updated_at or time.time())
+                discard_physical_cache_file(cache_path)
                 save_cache_metadata(cache_path, payload)
                 if existing_sha1:
                     summary["replaced"] += 1
@@ -70,7 +70,7 @@ def resolve_short_text_cache(
             "wav_path": clone_to_temp(playable_cache, volume=volume),
         }
 
-    if is_online_backend(selected_backend) and os.path.exists(cache_path):
+    if is_online_backend(selected_backend) and resolve_cache_audio_path(cache_path):
         metadata = load_cache_metadata(cache_path)
         backend_key = str(metadata.get("backend") or "").strip().lower()
         desired_backend = str(metadata.get("desired_backend") or current_online_provider()).strip().lower()
@@ -107,7 +107,7 @@ def resolve_short_text_cache(
             }
 
     legacy_cache = legacy_word_cache_path(text, source_path=source_path)
-    if legacy_cache and os.path.exists(legacy_cache) and not os.path.exists(cache_path):
+    if legacy_cache and os.path.exists(legacy_cache) and not resolve_cache_audio_path(cache_path):
         try:
             os.makedirs(os.path.dirname(cache_path), exist_ok=True)
             shutil.move(legacy_cache, cache_path)
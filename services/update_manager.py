@@ -29,6 +29,7 @@ PROTECTED_UPDATE_FILES = [
     "data/corpus_index.db",
     "data/dictation_stats.json",
     "data/history.json",
+    "data/metadata.db",
     "data/pos_cache.json",
     "data/phonetics_cache.json",
     "data/synonyms_cache.json",
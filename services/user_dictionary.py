@@ -3,10 +3,13 @@ import json
 import threading
 from pathlib import Path
 
+from services.metadata_store import get_metadata_store
+
 
 _DICT_PATH = Path(__file__).resolve().parent.parent / "data" / "user_dictionary.json"
+_KIND = "user_dictionary"
 _lock = threading.Lock()
-_dict_cache = None
+_store = None
 
 
 def _normalize_key(text):
@@ -17,49 +20,52 @@ def _clean_text(value):
     return str(value or "").strip()
 
 
-def _load_dict_locked():
-    global _dict_cache
-    if _dict_cache is not None:
-        return _dict_cache
-    if not _DICT_PATH.exists():
-        _dict_cache = {}
-        return _dict_cache
+def _clean_payload(raw_value):
+    payload = raw_value if isinstance(raw_value, dict) else {}
+    cleaned = {}
+    translation = _clean_text(payload.get("translation"))
+    pos = _clean_text(payload.get("pos"))
+    if translation:
+        cleaned["translation"] = translation
+    if pos:
+        cleaned["pos"] = pos
+    return cleaned
+
+
+def _encode(payload):
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True)
+
+
+def _decode(value):
     try:
-        with open(_DICT_PATH, "r", encoding="utf-8") as fp:
-            data = json.load(fp)
-        _dict_cache = data if isinstance(data, dict) else {}
+        data = json.loads(value)
     except Exception:
-        _dict_cache = {}
-    cleaned = {}
-    changed = False
-    for raw_key, raw_value in list((_dict_cache or {}).items()):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _normalize_legacy_payload(data):
+    rows = {}
+    for raw_key, raw_value in dict(data or {}).items():
         key = _normalize_key(raw_key)
-        if not key:
-            changed = True
-            continue
-        payload = raw_value if isinstance(raw_value, dict) else {}
-        translation = _clean_text(payload.get("translation"))
-        pos = _clean_text(payload.get("pos"))
-        if not translation and not pos:
-            changed = True
-            continue
-        cleaned[key] = {}
-        if translation:
-            cleaned[key]["translation"] = translation
-        if pos:
-            cleaned[key]["pos"] = pos
-        if raw_key != key or payload != cleaned[key]:
-            changed = True
-    _dict_cache = cleaned
-    if changed:
-        _save_dict_locked()
-    return _dict_cache
+        payload = _clean_payload(raw_value)
+        if key and payload:
+            rows[key] = _encode(payload)
+    return rows
+
 
+def _get_store_locked():
+    global _store
+    if _store is None:
+        store = get_metadata_store()
+        store.import_json_once(_KIND, _DICT_PATH, _normalize_legacy_payload)
+        _store = store
+    return _store
 
-def _save_dict_locked():
-    _DICT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(_DICT_PATH, "w", encoding="utf-8") as fp:
-        json.dump(_dict_cache or {}, fp, ensure_ascii=False, indent=2)
+
+def _load_entries_locked(keys):
+    found = _get_store_locked().get_many(_KIND, keys)
+    return {key: _decode(value) for key, value in found.items()}
 
 
 def get_entry(word):
@@ -67,19 +73,24 @@ def get_entry(word):
     if not key:
         return {}
     with _lock:
-        data = _load_dict_locked().get(key)
-        return dict(data) if isinstance(data, dict) else {}
+        return dict(_load_entries_locked([key]).get(key) or {})
 
 
 def get_entries(words):
-    result = {}
+    keys = {}
+    for word in words or []:
+        key = _normalize_key(word)
+        if key:
+            keys[word] = key
+    if not keys:
+        return {}
     with _lock:
-        cache = _load_dict_locked()
-        for word in words or []:
-            key = _normalize_key(word)
-            payload = cache.get(key)
-            if key and isinstance(payload, dict):
-                result[word] = dict(payload)
+        cache = _load_entries_locked(keys.values())
+    result = {}
+    for word, key in keys.items():
+        payload = cache.get(key)
+        if payload:
+            result[word] = dict(payload)
     return result
 
 
@@ -90,58 +101,47 @@ def set_entry(word, *, translation=None, pos=None):
     translation_value = _clean_text(translation)
     pos_value = _clean_text(pos)
     with _lock:
-        cache = _load_dict_locked()
-        existing = dict(cache.get(key) or {})
-        changed = False
+        current = _load_entries_locked([key]).get(key)
+        existing = dict(current or {})
         if translation is not None:
             if translation_value:
-                if existing.get("translation") != translation_value:
-                    existing["translation"] = translation_value
-                    changed = True
-            elif "translation" in existing:
+                existing["translation"] = translation_value
+            else:
                 existing.pop("translation", None)
-                changed = True
         if pos is not None:
             if pos_value:
-                if existing.get("pos") != pos_value:
-                    existing["pos"] = pos_value
-                    changed = True
-            elif "pos" in existing:
+                existing["pos"] = pos_value
+            else:
                 existing.pop("pos", None)
-                changed = True
+        if existing == current:
+            return True
+        store = _get_store_locked()
         if existing:
-            cache[key] = existing
-        elif key in cache:
-            cache.pop(key, None)
-            changed = True
-        if changed:
-            _save_dict_locked()
+            store.stage_many(_KIND, upserts={key: _encode(existing)})
+        elif current is not None:
+            store.stage_many(_KIND, deletes=[key])
     return True
 
 
 def apply_entries(entries):
-    changed = False
+    incoming = {}
+    for item in entries or []:
+        if not isinstance(item, dict):
+            continue
+        key = _normalize_key(item.get("word"))
+        payload = _clean_payload(item)
+        if key and payload:
+            incoming.setdefault(key, {}).update(payload)
+    if not incoming:
+        return False
     with _lock:
-        cache = _load_dict_locked()
-        for item in entries or []:
-            if not isinstance(item, dict):
-                continue
-            key = _normalize_key(item.get("word"))
-            if not key:
-                continue
-            translation = _clean_text(item.get("translation"))
-            pos = _clean_text(item.get("pos"))
-            payload = dict(cache.get(key) or {})
-            if translation:
-                payload["translation"] = translation
-            if pos:
-                payload["pos"] = pos
-            if not payload:
-                continue
-            if cache.get(key) == payload:
-                continue
-            cache[key] = payload
-            changed = True
-        if changed:
-            _save_dict_locked()
-    return changed
+        cache = _load_entries_locked(incoming.keys())
+        updates = {}
+        for key, payload in incoming.items():
+            merged = dict(cache.get(key) or {})
+            merged.update(payload)
+            if cache.get(key) != merged:
+                updates[key] = _encode(merged)
+        if updates:
+            _get_store_locked().stage_many(_KIND, upserts=updates)
+    return bool(updates)
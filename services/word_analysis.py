@@ -4,7 +4,7 @@ import threading
 from pathlib import Path
 
 from services.corpus_search import get_nlp
-from services.metadata_repository import JsonMetadataRepository
+from services.metadata_repository import SqliteMetadataRepository
 from services.user_dictionary import get_entries as get_user_dictionary_entries, set_entry as set_user_dictionary_entry
 
 
@@ -53,8 +53,9 @@ def _normalize_value(text):
 def _get_repo():
     global _repo
     if _repo is None:
-        _repo = JsonMetadataRepository(
-            _CACHE_PATH,
+        _repo = SqliteMetadataRepository(
+            "pos",
+            legacy_path=_CACHE_PATH,
             key_normalizer=_normalize_key,
             value_normalizer=_normalize_value,
         )
@@ -136,3 +137,7 @@ def set_cached_pos(word, pos_label):
 
 def apply_cached_pos(pairs):
     return _get_repo().apply_many(pairs)
+
+
+def export_cached_pos():
+    return _get_repo().export_payload()
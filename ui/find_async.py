@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 import threading
 
-from services.corpus_search import import_corpus_files, search_corpus
+from services.corpus_search import default_import_workers, import_corpus_files, search_corpus
 
 
 def start_find_import_task(*, paths, token, emit_event):
     def _run():
         try:
-            result = import_corpus_files(paths)
+            result = import_corpus_files(
+                paths,
+                workers=default_import_workers(len(paths)),
+                incremental=True,
+                on_progress=lambda progress: emit_event("import_progress", token, progress),
+            )
             emit_event("import_done", token, result)
         except Exception as exc:
             emit_event("error", token, str(exc))
@@ -16,15 +21,16 @@ def start_find_import_task(*, paths, token, emit_event):
     threading.Thread(target=_run, daemon=True).start()
 
 
-def start_find_search_task(*, query, limit, document_path, token, emit_event):
+def start_find_search_task(*, query, limit, document_path, token, emit_event, after=None):
     def _run():
         try:
             result = search_corpus(
                 query,
                 limit=limit,
                 document_path=document_path,
+                after=after,
             )
-            emit_event("search_done", token, result)
+            emit_event("search_more_done" if after else "search_done", token, result)
         except Exception as exc:
             emit_event("error", token, str(exc))
         emit_event("done", token, None)
@@ -2,6 +2,9 @@
 from dataclasses import dataclass
 
 
+FIND_SCROLL_FETCH_THRESHOLD = 0.9
+
+
 @dataclass(frozen=True)
 class FindImportStartState:
     paths: tuple[str, ...]
@@ -18,6 +21,14 @@ class FindSearchStartState:
     status_text: str
 
 
+@dataclass(frozen=True)
+class FindSearchMoreState:
+    query: str
+    limit: int
+    document_path: str | None
+    after: dict
+
+
 def build_find_import_start_state(paths):
     import os
 
@@ -58,5 +69,21 @@ def build_find_search_start_state(*, query_text, limit_text, selected_doc, statu
     )
 
 
+def build_find_search_more_state(*, last_search, next_cursor, loading, scroll_last):
+    if loading or not next_cursor or last_search is None:
+        return None
+    try:
+        if float(scroll_last) < FIND_SCROLL_FETCH_THRESHOLD:
+            return None
+    except Exception:
+        return None
+    return FindSearchMoreState(
+        query=last_search.query,
+        limit=last_search.limit,
+        document_path=last_search.document_path,
+        after=dict(next_cursor),
+    )
+
+
 def build_find_clear_filter_status():
     return "Document filter cleared. Search will use all indexed documents."
@@ -70,7 +70,12 @@ def build_find_window(host):
     host.find_results_table.column("sentence", width=600, anchor="w")
     host.find_results_table.column("source", width=260, anchor="w")
     find_scroll = ttk.Scrollbar(top, orient="vertical", command=host.find_results_table.yview)
-    host.find_results_table.configure(yscrollcommand=find_scroll.set)
+
+    def _on_results_yview(first, last):
+        find_scroll.set(first, last)
+        host._on_find_results_scroll(first, last)
+
+    host.find_results_table.configure(yscrollcommand=_on_results_yview)
     host.find_results_table.grid(row=2, column=0, sticky="nsew")
     find_scroll.grid(row=2, column=1, sticky="ns")
     host.find_results_table.bind("<<TreeviewSelect>>", host._on_find_result_select)
@@ -128,5 +133,8 @@ def build_find_window(host):
         host.find_import_btn = None
         host.find_doc_items = []
         host.find_result_items = {}
+        host.find_last_search = None
+        host.find_result_cursor = None
+        host.find_loading_more = False
 
     host.find_window.protocol("WM_DELETE_WINDOW", _on_close)
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import os
 from dataclasses import dataclass
 
 
@@ -34,7 +35,8 @@ def build_find_corpus_summary_state(stats, docs):
         f"Indexed {stats.get('documents', 0)} documents / "
         f"{stats.get('chunks', 0)} chunks / "
         f"{stats.get('sentences', 0)} sentences. "
-        f"NLP: {stats.get('nlp_mode')}"
+        f"NLP: {stats.get('nlp_mode')}. "
+        f"Search cache: {stats.get('cache_hits', 0)} hits / {stats.get('cache_misses', 0)} misses"
     )
     return FindCorpusSummaryState(doc_labels=doc_labels, status_text=status_text)
 
@@ -54,32 +56,55 @@ def build_find_import_status(payload):
     sent_count = int(payload.get("sentences") or 0)
     errors = list(payload.get("errors") or [])
     status = f"Imported {files_count} files and indexed {chunk_count} chunks / {sent_count} sentences."
+    status += (
+        f" New: {int(payload.get('new') or 0)}, updated: {int(payload.get('updated') or 0)}, "
+        f"unchanged: {int(payload.get('skipped') or 0)}."
+    )
     if errors:
         status += f" Errors: {len(errors)}"
     return status, errors
 
 
+def build_find_import_progress_status(payload):
+    done = int(payload.get("done") or 0)
+    total = int(payload.get("total") or 0)
+    name = os.path.basename(str(payload.get("path") or "").strip())
+    return f"Importing {done}/{total}: {name}" if name else f"Importing {done}/{total}..."
+
+
 def build_find_import_completion_message(payload):
     files_count = int(payload.get("files") or 0)
     chunk_count = int(payload.get("chunks") or 0)
     sent_count = int(payload.get("sentences") or 0)
+    skipped_count = int(payload.get("skipped") or 0)
     errors = list(payload.get("errors") or [])
-    if files_count <= 0:
+    if files_count <= 0 and skipped_count <= 0:
         message = "没有成功导入任何文档。"
+    elif files_count <= 0:
+        message = f"{skipped_count} 个文档没有变化，已跳过。"
     else:
-        message = f"已导入 {files_count} 个文件，{sent_count} 句，{chunk_count} 个片段。"
+        message = (
+            f"已导入 {files_count} 个文件（新增 {int(payload.get('new') or 0)}，"
+            f"更新 {int(payload.get('updated') or 0)}），{sent_count} 句，{chunk_count} 个片段。"
+        )
+        if skipped_count:
+            message += f"\n{skipped_count} 个文档没有变化，已跳过。"
     if errors:
         message += f"\n\n另有 {len(errors)} 个错误。"
     return message
 
 
+def build_find_nlp_loading_status():
+    return "Loading the English language model... Find will continue when it is ready."
+
+
 def build_find_search_status(*, query, limit, selected_doc_name):
     if selected_doc_name:
         return f"Searching '{query}' in {selected_doc_name} (up to {limit} results)..."
     return f"Searching corpus for '{query}' (up to {limit} results)..."
 
 
-def build_find_search_result_state(*, payload, doc_items):
+def build_find_search_result_state(*, payload, doc_items, start_index=0):
     results = list(payload.get("results") or [])
     query = str(payload.get("query") or "").strip()
     lemmas = list(payload.get("lemmas") or [])
@@ -103,17 +128,20 @@ def build_find_search_result_state(*, payload, doc_items):
         source = " · ".join(bit for bit in source_bits if bit)
         row_item = dict(item)
         row_item["source_text"] = source
-        row_id = f"find_{idx}"
+        row_id = f"find_{start_index + idx}"
         result_items[row_id] = row_item
         result_rows.append((row_id, (row_item.get("sentence_text") or "", source)))
 
+    shown_count = start_index + len(results)
     if filtered_name:
         status_text = (
-            f"Found {len(results)} results for '{query}' in {filtered_name}. "
+            f"Found {shown_count} results for '{query}' in {filtered_name}. "
             f"Lemmas: {', '.join(lemmas) if lemmas else 'n/a'}"
         )
     else:
-        status_text = f"Found {len(results)} results for '{query}'. Lemmas: {', '.join(lemmas) if lemmas else 'n/a'}"
+        status_text = f"Found {shown_count} results for '{query}'. Lemmas: {', '.join(lemmas) if lemmas else 'n/a'}"
+    if payload.get("next_cursor"):
+        status_text += " Scroll down for more."
 
     return FindSearchResultState(
         result_items=result_items,
@@ -9,18 +9,22 @@ from services.corpus_search import (
     list_documents as list_corpus_documents,
     remove_document as remove_corpus_document,
 )
+from services.model_warmup import STATE_LOADING, get_model_readiness
 from ui.async_event_helper import clear_event_queue, drain_event_queue, emit_event
 from ui.find_async import start_find_import_task, start_find_search_task
 from ui.find_controller import (
     build_find_clear_filter_status,
     build_find_import_start_state,
+    build_find_search_more_state,
     build_find_search_start_state,
 )
 from ui.find_panel import build_find_window
 from ui.find_presenter import (
     build_find_corpus_summary_state,
     build_find_import_completion_message,
+    build_find_import_progress_status,
     build_find_import_status,
+    build_find_nlp_loading_status,
     build_find_preview_state,
     build_find_search_result_state,
     build_find_search_status,
@@ -28,6 +32,9 @@ from ui.find_presenter import (
 )
 
 
+NLP_WARMUP_POLL_MS = 300
+
+
 def open_window(host):
     if host.find_window and host.find_window.winfo_exists():
         host.find_window.lift()
@@ -45,7 +52,26 @@ def set_query_from_selection(host):
     host.find_search_var.set(word)
 
 
+def wait_for_nlp_warmup(host, kind, retry):
+    if get_model_readiness("nlp").get("state") != STATE_LOADING:
+        return False
+    host.find_status_var.set(build_find_nlp_loading_status())
+    previous_id = host.find_nlp_wait_after_ids.pop(kind, None)
+    if previous_id:
+        host.after_cancel(previous_id)
+
+    def _retry():
+        host.find_nlp_wait_after_ids.pop(kind, None)
+        if host.find_window and host.find_window.winfo_exists():
+            retry()
+
+    host.find_nlp_wait_after_ids[kind] = host.after(NLP_WARMUP_POLL_MS, _retry)
+    return True
+
+
 def refresh_corpus_summary(host):
+    if wait_for_nlp_warmup(host, "summary", lambda: refresh_corpus_summary(host)):
+        return
     try:
         stats = corpus_stats()
         docs = list_corpus_documents(limit=200)
@@ -120,8 +146,12 @@ def poll_task_events(host, token):
         token=token,
         active_token=host.find_active_token,
         handlers={
+            "import_progress": lambda payload: host.find_status_var.set(
+                build_find_import_progress_status(payload or {})
+            ),
             "import_done": lambda payload: apply_import_result(host, payload or {}),
             "search_done": lambda payload: apply_search_result(host, payload or {}),
+            "search_more_done": lambda payload: apply_search_more_result(host, payload or {}),
             "error": lambda payload: handle_task_error(host, str(payload or "Unknown error")),
         },
     )
@@ -130,6 +160,8 @@ def poll_task_events(host, token):
 
 
 def handle_task_error(host, message):
+    host.find_loading_more = False
+    host.find_task_busy = False
     if host.find_import_btn:
         host.find_import_btn.state(["!disabled"])
     host.find_status_var.set(message)
@@ -139,6 +171,8 @@ def handle_task_error(host, message):
 def import_documents(host):
     if not host.find_window:
         open_window(host)
+    if wait_for_nlp_warmup(host, "import", lambda: import_documents(host)):
+        return
     try:
         get_nlp_status()
     except Exception as e:
@@ -155,6 +189,7 @@ def import_documents(host):
     host.find_task_token += 1
     token = host.find_task_token
     host.find_active_token = token
+    host.find_task_busy = True
     clear_task_queue(host)
     if host.find_import_btn:
         host.find_import_btn.state(["disabled"])
@@ -164,6 +199,7 @@ def import_documents(host):
 
 
 def apply_import_result(host, payload):
+    host.find_task_busy = False
     refresh_corpus_summary(host)
     status, errors = build_find_import_status(payload)
     host.find_status_var.set(status)
@@ -187,6 +223,8 @@ def run_search(host):
         messagebox.showinfo("Info", "Enter a word or phrase first.")
         return
     host.find_limit_var.set(state.limit_text)
+    if wait_for_nlp_warmup(host, "search", lambda: run_search(host)):
+        return
     try:
         get_nlp_status()
     except Exception as e:
@@ -196,7 +234,11 @@ def run_search(host):
     host.find_task_token += 1
     token = host.find_task_token
     host.find_active_token = token
+    host.find_task_busy = True
     clear_task_queue(host)
+    host.find_last_search = state
+    host.find_result_cursor = None
+    host.find_loading_more = False
     host.find_status_var.set(state.status_text)
     start_find_search_task(
         query=state.query,
@@ -228,7 +270,9 @@ def clear_document_filter(host):
 
 
 def apply_search_result(host, payload):
+    host.find_task_busy = False
     state = build_find_search_result_state(payload=payload, doc_items=host.find_doc_items)
+    host.find_result_cursor = payload.get("next_cursor")
     host.find_result_items = state.result_items
     if host.find_results_table:
         host.find_results_table.delete(*host.find_results_table.get_children())
@@ -245,6 +289,48 @@ def apply_search_result(host, payload):
     host.find_status_var.set(state.status_text)
 
 
+def on_results_scroll(host, _first, last):
+    if host.find_task_busy:
+        return
+    state = build_find_search_more_state(
+        last_search=host.find_last_search,
+        next_cursor=host.find_result_cursor,
+        loading=host.find_loading_more,
+        scroll_last=last,
+    )
+    if not state:
+        return
+    host.find_loading_more = True
+    host.find_task_token += 1
+    token = host.find_task_token
+    host.find_active_token = token
+    clear_task_queue(host)
+    start_find_search_task(
+        query=state.query,
+        limit=state.limit,
+        document_path=state.document_path,
+        after=state.after,
+        token=token,
+        emit_event=lambda et, tk, payload=None: emit_task_event(host, et, tk, payload),
+    )
+    host.after(80, lambda t=token: poll_task_events(host, t))
+
+
+def apply_search_more_result(host, payload):
+    host.find_loading_more = False
+    state = build_find_search_result_state(
+        payload=payload,
+        doc_items=host.find_doc_items,
+        start_index=len(host.find_result_items),
+    )
+    host.find_result_cursor = payload.get("next_cursor")
+    host.find_result_items.update(state.result_items)
+    if host.find_results_table:
+        for row_id, values in state.result_rows:
+            host.find_results_table.insert("", tk.END, iid=row_id, values=values)
+    host.find_status_var.set(state.status_text)
+
+
 def clear_preview(host):
     if not host.find_preview_text:
         return
@@ -15,6 +15,7 @@ from data.store import WordStore
 from services.tts import (
     speak_async,
     cancel_all as tts_cancel_all,
+    cancel_precache_word_audio as tts_cancel_precache_word_audio,
     clear_word_backend_override as tts_clear_word_backend_override,
     get_recent_wrong_cache_source as tts_get_recent_wrong_cache_source,
     get_word_audio_cache_info as tts_get_word_audio_cache_info,
@@ -32,7 +33,6 @@ from services.tts import (
 )
 from services.translation import (
     get_cached_translations,
-    prepare_async as translation_prepare_async,
     set_cached_translation,
 )
 from services.phonetics import get_cached_phonetics, set_cached_phonetic
@@ -45,6 +45,8 @@ from services.resource_pack import (
     import_word_resource_pack,
 )
 from services.bundled_corpus import prepare_async as bundled_corpus_prepare_async
+from services.metadata_store import flush_metadata_store
+from services.model_warmup import start_model_warmup
 from services.official_library_sync import resolve_official_library_urls, sync_official_library
 from services.app_config import (
     get_llm_api_key,
@@ -169,6 +171,7 @@ from ui.find_window_coordinator import (
     import_documents as import_find_documents_flow,
     on_docs_right_click as on_find_docs_right_click_flow,
     on_result_select as on_find_result_select_flow,
+    on_results_scroll as on_find_results_scroll_flow,
     open_window as open_find_window_flow,
     poll_task_events as poll_find_task_events_flow,
     refresh_corpus_summary as refresh_find_corpus_summary_flow,
@@ -1112,8 +1115,8 @@ class MainView(ttk.Frame):
         self.update_right_visibility()
         tts_set_error_notifier(lambda message: messagebox.showerror("Speech Error", f"Error: {message}"))
         tts_prepare_async()
-        translation_prepare_async()
         bundled_corpus_prepare_async()
+        start_model_warmup()
         self.refresh_gemini_models()
         self.after(150, self.ensure_api_credentials)
 
@@ -1326,6 +1329,11 @@ class MainView(ttk.Frame):
         if not self._prompt_save_unsaved_manual_words():
             return
         tts_set_preferred_pending_source(None)
+        tts_cancel_precache_word_audio()
+        try:
+            flush_metadata_store()
+        except Exception:
+            pass
         self._discard_temporary_session_artifacts()
         try:
             self.winfo_toplevel().destroy()
@@ -3589,6 +3597,9 @@ class MainView(ttk.Frame):
     def _on_find_result_select(self, _event=None):
         on_find_result_select_flow(self, _event=_event)
 
+    def _on_find_results_scroll(self, first, last):
+        on_find_results_scroll_flow(self, first, last)
+
     def _show_find_result_preview(self, row_id):
         show_find_result_preview_flow(self, row_id)
 
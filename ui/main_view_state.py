@@ -154,6 +154,11 @@ class MainViewState:
     find_docs_context_menu: Any = None
     find_doc_items: list = field(default_factory=list)
     find_result_items: dict = field(default_factory=dict)
+    find_last_search: Any = None
+    find_result_cursor: Any = None
+    find_loading_more: bool = False
+    find_task_busy: bool = False
+    find_nlp_wait_after_ids: dict = field(default_factory=dict)
     find_task_queue: Any = field(default_factory=_queue.Queue)
     find_task_token: int = 0
     find_active_token: int = 0